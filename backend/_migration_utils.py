@@ -0,0 +1,74 @@
+"""
+Schema introspection helpers shared by the migration scripts.
+
+Migrations check the catalog once and only issue the ALTERs that are needed, instead of
+attempting each ALTER and matching "duplicate column" errors (which on PostgreSQL also
+aborts the surrounding transaction).
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import bindparam, inspect, text
+
+
+def columns_by_table(conn, tables: Iterable[str]) -> Dict[str, Set[str]]:
+    """Column names for each of tables (empty if missing), read with one catalog query."""
+    tables = list(tables)
+    schema: Dict[str, Set[str]] = {table: set() for table in tables}
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        # pragma_table_info() as a table-valued function covers all tables in one statement
+        rows = conn.execute(
+            text(
+                "SELECT m.name, p.name FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+                "WHERE m.type = 'table' AND m.name IN :tables"
+            ).bindparams(bindparam("tables", expanding=True)),
+            {"tables": tables},
+        )
+    elif dialect == "postgresql":
+        rows = conn.execute(
+            text(
+                "SELECT table_name, column_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND table_name IN :tables"
+            ).bindparams(bindparam("tables", expanding=True)),
+            {"tables": tables},
+        )
+    else:
+        inspector = inspect(conn)
+        rows = [(t, c["name"]) for t in tables if inspector.has_table(t) for c in inspector.get_columns(t)]
+    for table, column in rows:
+        schema[table].add(column)
+    return schema
+
+
+def columns_of(conn, table: str) -> Set[str]:
+    """Names of the columns table currently has, read with one catalog query."""
+    return columns_by_table(conn, [table])[table]
+
+
+def column_exists(conn, table: str, column: str) -> bool:
+    """Whether table has column."""
+    return column in columns_of(conn, table)
+
+
+def add_columns_if_missing(
+    conn, table: str, columns: List[Tuple[str, str]], existing: Optional[Set[str]] = None
+) -> List[str]:
+    """
+    Add the (name, type DDL) columns that table does not have yet. Returns the names added.
+    
+    Existing columns are read once up front, unless the caller passes them from columns_by_table. PostgreSQL gets a single ALTER TABLE (one lock and
+    one rewrite for all columns); SQLite only accepts one ADD COLUMN per ALTER, so it gets one each.
+    """
+    if existing is None:
+        existing = columns_of(conn, table)
+    missing = [(name, ddl) for name, ddl in columns if name not in existing]
+    if not missing:
+        return []
+    clauses = [f"ADD COLUMN {name} {ddl}" for name, ddl in missing]
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"ALTER TABLE {table} " + ", ".join(clauses)))
+    else:
+        for clause in clauses:
+            conn.execute(text(f"ALTER TABLE {table} {clause}"))
+    added = [name for name, _ in missing]
+    print(f"Added {', '.join(added)} to {table}")
+    return added
@@ -3,19 +3,40 @@ Engineer/Team Member API endpoints for viewing assignments.
 """
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import select, lambda_stmt, union_all, func, nullslast
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone
 
 from database import get_db
-from models import Episode, User, EpisodeStatus, Task
+from api.loaders import EPISODE_SELECT
+from models import Episode, Podcast, User, EpisodeStatus, Task, TaskStatus
 from schemas import EpisodeWithPodcast
 
 router = APIRouter()
 
+# Episode-level assignment roles, matching the <role>_engineer_id columns
+_ENGINEER_ROLES = ("recording", "editing", "reels")
+
+# Batch size for streaming large result sets
+_YIELD_PER = 200
+
+
+def _engineer_episode_ids(engineer_id):
+    """
+    Ids of episodes where the engineer holds any role.
+    
+    UNION ALL of three equality selects lets each branch use its own engineer-column index,
+    where an OR across the three columns tends to fall back to a sequential scan.
+    """
+    return union_all(
+        select(Episode.id).where(Episode.recording_engineer_id == engineer_id),
+        select(Episode.id).where(Episode.editing_engineer_id == engineer_id),
+        select(Episode.id).where(Episode.reels_engineer_id == engineer_id),
+    )
+
 
 @router.get("/{engineer_id}/episodes", response_model=List[EpisodeWithPodcast])
-async def get_engineer_episodes(
+def get_engineer_episodes(
     engineer_id: str,
     role: Optional[str] = Query(None, description="Filter by role: recording, editing, or reels"),
     status: Optional[EpisodeStatus] = None,
@@ -27,157 +48,141 @@ async def get_engineer_episodes(
     Get all episodes assigned to a specific engineer.
     Can filter by role (recording, editing, reels) and status.
     """
-    from sqlalchemy.orm import joinedload
+    now = datetime.now(timezone.utc)
     
-    query = db.query(Episode).options(
-        joinedload(Episode.podcast),
-        joinedload(Episode.recording_engineer),
-        joinedload(Episode.editing_engineer),
-        joinedload(Episode.reels_engineer)
-    )
+    # lambda_stmt caches the compiled SQL per query shape; filter values are bound parameters
+    stmt = lambda_stmt(lambda: EPISODE_SELECT)
     
     # Filter by engineer role
     if role == "recording":
-        query = query.filter(Episode.recording_engineer_id == engineer_id)
+        stmt += lambda s: s.where(Episode.recording_engineer_id == engineer_id)
     elif role == "editing":
-        query = query.filter(Episode.editing_engineer_id == engineer_id)
+        stmt += lambda s: s.where(Episode.editing_engineer_id == engineer_id)
     elif role == "reels":
-        query = query.filter(Episode.reels_engineer_id == engineer_id)
+        stmt += lambda s: s.where(Episode.reels_engineer_id == engineer_id)
     else:
         # Show all roles
-        query = query.filter(
-            or_(
-                Episode.recording_engineer_id == engineer_id,
-                Episode.editing_engineer_id == engineer_id,
-                Episode.reels_engineer_id == engineer_id
-            )
-        )
+        stmt += lambda s: s.where(Episode.id.in_(_engineer_episode_ids(engineer_id)))
     
     # Filter by status
     if status:
-        query = query.filter(Episode.status == status)
+        stmt += lambda s: s.where(Episode.status == status)
     
     # Filter upcoming recordings
     if upcoming_only:
-        now = datetime.now(timezone.utc)
         future_date = now + timedelta(days=days_ahead)
-        query = query.filter(
+        stmt += lambda s: s.where(
             Episode.recording_date >= now,
             Episode.recording_date <= future_date
         )
     
-    episodes = query.order_by(Episode.recording_date.desc()).all()
+    stmt += lambda s: s.order_by(Episode.recording_date.desc())
+    episodes = db.execute(stmt).unique().scalars().all()
     return episodes
 
 
 @router.get("/{engineer_id}/upcoming", response_model=List[EpisodeWithPodcast])
-async def get_engineer_upcoming(
+def get_engineer_upcoming(
     engineer_id: str,
     days_ahead: int = Query(7, description="Number of days ahead to look"),
     db: Session = Depends(get_db)
 ):
     """Get upcoming recording sessions for a specific engineer."""
-    from sqlalchemy.orm import joinedload
-    from datetime import timedelta, timezone
-    
     now = datetime.now(timezone.utc)
     future_date = now + timedelta(days=days_ahead)
     
-    episodes = db.query(Episode).options(
-        joinedload(Episode.podcast),
-        joinedload(Episode.recording_engineer),
-        joinedload(Episode.editing_engineer),
-        joinedload(Episode.reels_engineer)
-    ).filter(
+    episodes = db.execute(EPISODE_SELECT.where(
         Episode.recording_engineer_id == engineer_id,
         Episode.recording_date >= now,
         Episode.recording_date <= future_date
-    ).order_by(Episode.recording_date.asc()).all()
+    ).order_by(Episode.recording_date.asc())).unique().scalars().all()
     
     return episodes
 
 
 @router.get("/{engineer_id}/tasks")
-async def get_engineer_tasks(
+def get_engineer_tasks(
     engineer_id: str,
     status: Optional[str] = None,
+    skip: int = Query(0, ge=0, description="Number of tasks and of episodes to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of tasks and of episodes to include"),
     db: Session = Depends(get_db)
 ):
     """
     Get all tasks assigned to an engineer.
     Includes both episode-level assignments and additional tasks.
+    skip/limit page the tasks and the assigned episodes separately; rows are streamed in batches.
     """
-    from models import Task, TaskStatus
-    from sqlalchemy.orm import joinedload
-    
-    # Get tasks from Task table
-    task_query = db.query(Task).options(
-        joinedload(Task.episode).joinedload(Episode.podcast),
-        joinedload(Task.assigned_user)
-    ).filter(Task.assigned_to == engineer_id)
-    
-    if status:
-        task_query = task_query.filter(Task.status == TaskStatus[status.upper()])
-    
-    tasks = task_query.all()
-    
-    # Also get episodes where engineer is assigned (as episode-level assignments)
-    episodes = db.query(Episode).options(
-        joinedload(Episode.podcast),
-        joinedload(Episode.recording_engineer),
-        joinedload(Episode.editing_engineer),
-        joinedload(Episode.reels_engineer)
-    ).filter(
-        or_(
-            Episode.recording_engineer_id == engineer_id,
-            Episode.editing_engineer_id == engineer_id,
-            Episode.reels_engineer_id == engineer_id
+    # Select only the columns the response needs, with episode/podcast flattened in via outer
+    # joins, so rows map straight to dicts without building ORM objects.
+    task_stmt = (
+        select(
+            Task.id, Task.episode_id, Task.type, Task.status, Task.due_date, Task.notes,
+            Episode.id.label("joined_episode_id"), Episode.episode_number, Podcast.name.label("podcast_name"),
         )
-    ).all()
+        .outerjoin(Episode, Task.episode_id == Episode.id)
+        .outerjoin(Podcast, Episode.podcast_id == Podcast.id)
+        .where(Task.assigned_to == engineer_id)
+    )
+    if status:
+        task_stmt = task_stmt.where(Task.status == TaskStatus[status.upper()])
+    tasks = db.execute(
+        task_stmt.order_by(nullslast(Task.due_date.asc()), Task.id)
+        .offset(skip).limit(limit)
+        .execution_options(yield_per=_YIELD_PER)
+    ).mappings()
     
     # Format response
-    result = []
-    
-    # Add tasks
-    for task in tasks:
-        result.append({
+    result = [
+        {
             "type": "task",
-            "id": task.id,
-            "episode_id": task.episode_id,
-            "task_type": task.type,
-            "status": task.status,
-            "due_date": task.due_date,
-            "notes": task.notes,
+            "id": task["id"],
+            "episode_id": task["episode_id"],
+            "task_type": task["type"],
+            "status": task["status"],
+            "due_date": task["due_date"],
+            "notes": task["notes"],
             "episode": {
-                "id": task.episode.id if task.episode else None,
-                "podcast": task.episode.podcast.name if task.episode and task.episode.podcast else None,
-                "episode_number": task.episode.episode_number if task.episode else None,
+                "id": task["joined_episode_id"],
+                "podcast": task["podcast_name"],
+                "episode_number": task["episode_number"],
             }
-        })
+        }
+        for task in tasks
+    ]
+    
+    # Also get episodes where engineer is assigned (as episode-level assignments)
+    episodes = db.execute(
+        select(
+            Episode.id, Episode.episode_number, Episode.status, Episode.recording_date,
+            Episode.episode_notes, Episode.reels_notes,
+            Episode.recording_engineer_id, Episode.editing_engineer_id, Episode.reels_engineer_id,
+            Podcast.name.label("podcast_name"),
+        )
+        .outerjoin(Podcast, Episode.podcast_id == Podcast.id)
+        .where(Episode.id.in_(_engineer_episode_ids(engineer_id)))
+        .order_by(nullslast(Episode.recording_date.desc()), Episode.id)
+        .offset(skip).limit(limit)
+        .execution_options(yield_per=_YIELD_PER)
+    ).mappings()
     
     # Add episode assignments
     for episode in episodes:
-        roles = []
-        if episode.recording_engineer_id == engineer_id:
-            roles.append("recording")
-        if episode.editing_engineer_id == engineer_id:
-            roles.append("editing")
-        if episode.reels_engineer_id == engineer_id:
-            roles.append("reels")
-        
-        for role in roles:
+        for role in _ENGINEER_ROLES:
+            if episode[f"{role}_engineer_id"] != engineer_id:
+                continue
             result.append({
                 "type": "episode_assignment",
-                "id": f"{episode.id}_{role}",
-                "episode_id": episode.id,
+                "id": f"{episode['id']}_{role}",
+                "episode_id": episode["id"],
                 "task_type": role,
-                "status": episode.status,
-                "recording_date": episode.recording_date,
-                "notes": episode.reels_notes if role == "reels" else episode.episode_notes,
+                "status": episode["status"],
+                "recording_date": episode["recording_date"],
+                "notes": episode["reels_notes"] if role == "reels" else episode["episode_notes"],
                 "episode": {
-                    "id": episode.id,
-                    "podcast": episode.podcast.name if episode.podcast else None,
-                    "episode_number": episode.episode_number,
+                    "id": episode["id"],
+                    "podcast": episode["podcast_name"],
+                    "episode_number": episode["episode_number"],
                 }
             })
     
@@ -185,30 +190,35 @@ async def get_engineer_tasks(
 
 
 @router.get("/")
-async def get_all_engineers_summary(db: Session = Depends(get_db)):
+def get_all_engineers_summary(
+    skip: int = Query(0, ge=0, description="Number of engineers to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of engineers to return"),
+    db: Session = Depends(get_db)
+):
     """Get summary of all engineers with their assignment counts."""
-    from sqlalchemy import func
+    users = db.query(User).order_by(User.name).offset(skip).limit(limit).all()
+    user_ids = [user.id for user in users]
+    if not user_ids:
+        return []
+    
+    # One GROUP BY per assignment column (for this page's users) instead of 4 COUNT queries per user
+    def count_by(column, id_column):
+        rows = db.query(column, func.count(id_column)).filter(
+            column.in_(user_ids)
+        ).group_by(column).all()
+        return dict(rows)
+    
+    recording_counts = count_by(Episode.recording_engineer_id, Episode.id)
+    editing_counts = count_by(Episode.editing_engineer_id, Episode.id)
+    reels_counts = count_by(Episode.reels_engineer_id, Episode.id)
+    task_counts = count_by(Task.assigned_to, Task.id)
     
-    users = db.query(User).all()
     result = []
-    
     for user in users:
-        recording_count = db.query(func.count(Episode.id)).filter(
-            Episode.recording_engineer_id == user.id
-        ).scalar() or 0
-        
-        editing_count = db.query(func.count(Episode.id)).filter(
-            Episode.editing_engineer_id == user.id
-        ).scalar() or 0
-        
-        reels_count = db.query(func.count(Episode.id)).filter(
-            Episode.reels_engineer_id == user.id
-        ).scalar() or 0
-        
-        from models import Task
-        task_count = db.query(func.count(Task.id)).filter(
-            Task.assigned_to == user.id
-        ).scalar() or 0
+        recording_count = recording_counts.get(user.id, 0)
+        editing_count = editing_counts.get(user.id, 0)
+        reels_count = reels_counts.get(user.id, 0)
+        task_count = task_counts.get(user.id, 0)
         
         result.append({
             "id": user.id,
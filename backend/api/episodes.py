@@ -1,131 +1,231 @@
 """
 Episode API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import nullslast, func
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import nullslast, func, select, lambda_stmt
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
+from cache import invalidate
 from database import get_db
-from models import Episode, EpisodeStatus
+from api.loaders import EPISODE_SELECT
+from models import Episode, EpisodeStatus, Podcast, PodcastAlias, User
 from schemas import Episode as EpisodeSchema, EpisodeCreate, EpisodeUpdate, EpisodeWithPodcast
 from constants import DEFAULT_NOTIFICATION_DAYS
+from services.workflow_automation import process_episode_status_change_in_background
 
 router = APIRouter()
 
+# Flat column list for the read-only episode listing: episode columns plus the podcast
+# and each engineer prefixed ("podcast__name", "recording_engineer__name", ...).
+_EPISODE_FIELDS = [c.key for c in Episode.__table__.columns]
+_PODCAST_FIELDS = ["id", "name", "host", "default_studio_settings", "tasks_time_allowance_days", "created_at", "updated_at"]
+_USER_FIELDS = ["id", "name", "email", "role", "created_at", "updated_at"]
+_ENGINEER_ALIASES = {
+    "recording_engineer": aliased(User, name="recording_engineer"),
+    "editing_engineer": aliased(User, name="editing_engineer"),
+    "reels_engineer": aliased(User, name="reels_engineer"),
+}
 
-@router.get("/", response_model=List[EpisodeWithPodcast])
-async def get_episodes(
+_EPISODE_LIST_SELECT = select(
+    *[getattr(Episode, f) for f in _EPISODE_FIELDS],
+    *[getattr(Podcast, f).label(f"podcast__{f}") for f in _PODCAST_FIELDS],
+    *[
+        getattr(engineer, f).label(f"{prefix}__{f}")
+        for prefix, engineer in _ENGINEER_ALIASES.items()
+        for f in _USER_FIELDS
+    ],
+).select_from(Episode).outerjoin(Podcast, Episode.podcast_id == Podcast.id).outerjoin(
+    _ENGINEER_ALIASES["recording_engineer"], Episode.recording_engineer_id == _ENGINEER_ALIASES["recording_engineer"].id
+).outerjoin(
+    _ENGINEER_ALIASES["editing_engineer"], Episode.editing_engineer_id == _ENGINEER_ALIASES["editing_engineer"].id
+).outerjoin(
+    _ENGINEER_ALIASES["reels_engineer"], Episode.reels_engineer_id == _ENGINEER_ALIASES["reels_engineer"].id
+)
+
+
+def _nested(row, prefix: str, fields: List[str]) -> Optional[dict]:
+    """Pick a prefixed related object out of a flat row; None when the outer join found nothing."""
+    if row[f"{prefix}__id"] is None:
+        return None
+    return {f: row[f"{prefix}__{f}"] for f in fields}
+
+
+def _serialize_episode_rows(db: Session, rows) -> List[dict]:
+    """Shape flat episode rows like EpisodeWithPodcast without building ORM objects."""
+    podcast_ids = {row["podcast__id"] for row in rows if row["podcast__id"] is not None}
+    aliases: dict = {}
+    if podcast_ids:
+        for podcast_id, alias in db.execute(
+            select(PodcastAlias.podcast_id, PodcastAlias.alias).where(PodcastAlias.podcast_id.in_(podcast_ids))
+        ):
+            aliases.setdefault(podcast_id, []).append(alias)
+    
+    result = []
+    for row in rows:
+        item = {f: row[f] for f in _EPISODE_FIELDS}
+        podcast = _nested(row, "podcast", _PODCAST_FIELDS)
+        if podcast is not None:
+            podcast["aliases"] = aliases.get(podcast["id"], [])
+        item["podcast"] = podcast
+        for prefix in _ENGINEER_ALIASES:
+            item[prefix] = _nested(row, prefix, _USER_FIELDS)
+        result.append(item)
+    return result
+
+
+def _filter_episodes(
+    stmt,
+    podcast_id: Optional[str],
+    status: Optional[EpisodeStatus],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+):
+    """Append the shared episode list filters to a lambda statement."""
+    if podcast_id:
+        stmt += lambda s: s.where(Episode.podcast_id == podcast_id)
+    if status:
+        stmt += lambda s: s.where(Episode.status == status)
+    if date_from:
+        stmt += lambda s: s.where(Episode.recording_date >= date_from)
+    if date_to:
+        stmt += lambda s: s.where(Episode.recording_date <= date_to)
+    return stmt
+
+
+def _count_episodes(
+    db: Session,
+    podcast_id: Optional[str],
+    status: Optional[EpisodeStatus],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+) -> int:
+    """Count episodes matching the list filters."""
+    stmt = _filter_episodes(
+        lambda_stmt(lambda: select(func.count(Episode.id))), podcast_id, status, date_from, date_to
+    )
+    return db.execute(stmt).scalar() or 0
+
+
+@router.get("/", response_model=None, responses={200: {"model": List[EpisodeWithPodcast]}})
+def get_episodes(
     skip: int = Query(0, ge=0, description="Number of episodes to skip"),
     limit: int = Query(50, ge=1, le=1000, description="Maximum number of episodes to return"),
     podcast_id: Optional[str] = None,
     status: Optional[EpisodeStatus] = None,
     date_from: Optional[datetime] = Query(None, description="Filter episodes from this date (inclusive)"),
     date_to: Optional[datetime] = Query(None, description="Filter episodes to this date (inclusive)"),
+    include_total: bool = Query(False, description="Return {items, total} with the filtered count instead of a plain list"),
     db: Session = Depends(get_db)
-):
-    """Get all episodes with optional filtering and pagination."""
-    # Use eager loading to load podcast and engineer relationships
-    query = db.query(Episode).options(
-        joinedload(Episode.podcast),
-        joinedload(Episode.recording_engineer),
-        joinedload(Episode.editing_engineer),
-        joinedload(Episode.reels_engineer)
-    )
+) -> ORJSONResponse:
+    """
+    Get all episodes with optional filtering and pagination.
     
-    if podcast_id:
-        query = query.filter(Episode.podcast_id == podcast_id)
-    if status:
-        query = query.filter(Episode.status == status)
-    if date_from:
-        query = query.filter(Episode.recording_date >= date_from)
-    if date_to:
-        query = query.filter(Episode.recording_date <= date_to)
+    Read-only listing: selects flat columns with Core and builds the EpisodeWithPodcast
+    shape directly, skipping ORM hydration and response-model validation; the dicts are
+    encoded straight to JSON by orjson.
+    With include_total, the filtered count comes from a COUNT(*) OVER () window on the same scan.
+    """
+    # lambda_stmt caches the compiled SQL per query shape; filter values are bound parameters.
+    if include_total:
+        stmt = lambda_stmt(lambda: _EPISODE_LIST_SELECT.add_columns(func.count().over().label("total")))
+    else:
+        stmt = lambda_stmt(lambda: _EPISODE_LIST_SELECT)
+    stmt = _filter_episodes(stmt, podcast_id, status, date_from, date_to)
     
     # Handle null recording_date by putting nulls last
-    episodes = query.order_by(nullslast(Episode.recording_date.desc())).offset(skip).limit(limit).all()
-    return episodes
+    stmt += lambda s: s.order_by(nullslast(Episode.recording_date.desc())).offset(skip).limit(limit)
+    rows = db.execute(stmt).mappings().all()
+    items = _serialize_episode_rows(db, rows)
+    if not include_total:
+        return ORJSONResponse(items)
+    
+    if rows:
+        total = rows[0]["total"]
+    elif skip:
+        # Page past the end: the window has no row to report on, so count separately
+        total = _count_episodes(db, podcast_id, status, date_from, date_to)
+    else:
+        total = 0
+    return ORJSONResponse({"items": items, "total": total})
 
 
 @router.get("/count", response_model=dict)
-async def get_episodes_count(
+def get_episodes_count(
     podcast_id: Optional[str] = None,
     status: Optional[EpisodeStatus] = None,
     date_from: Optional[datetime] = Query(None, description="Filter episodes from this date (inclusive)"),
     date_to: Optional[datetime] = Query(None, description="Filter episodes to this date (inclusive)"),
     db: Session = Depends(get_db)
 ):
-    """Get total count of episodes matching the filters."""
-    from sqlalchemy import func
-    
-    query = db.query(func.count(Episode.id))
-    
-    if podcast_id:
-        query = query.filter(Episode.podcast_id == podcast_id)
-    if status:
-        query = query.filter(Episode.status == status)
-    if date_from:
-        query = query.filter(Episode.recording_date >= date_from)
-    if date_to:
-        query = query.filter(Episode.recording_date <= date_to)
+    """
+    Get total count of episodes matching the filters.
     
-    total = query.scalar() or 0
-    return {"total": total}
+    Prefer GET /episodes?include_total=true, which returns the page and the count in one query.
+    """
+    return {"total": _count_episodes(db, podcast_id, status, date_from, date_to)}
 
 
 @router.get("/{episode_id}", response_model=EpisodeWithPodcast)
-async def get_episode(episode_id: str, db: Session = Depends(get_db)):
+def get_episode(episode_id: str, db: Session = Depends(get_db)):
     """Get a specific episode."""
-    episode = db.query(Episode).options(
-        joinedload(Episode.podcast),
-        joinedload(Episode.recording_engineer),
-        joinedload(Episode.editing_engineer),
-        joinedload(Episode.reels_engineer)
-    ).filter(Episode.id == episode_id).first()
+    episode = db.execute(EPISODE_SELECT.where(Episode.id == episode_id)).unique().scalar_one_or_none()
     if not episode:
         raise HTTPException(status_code=404, detail="Episode not found")
     return episode
 
 
+_ENGINEER_ROLE_LABELS = {
+    "recording_engineer_id": "Recording",
+    "editing_engineer_id": "Editing",
+    "reels_engineer_id": "Reels",
+}
+
+
+def _validate_engineers(db: Session, values: dict):
+    """Check all engineer ids in values exist with one IN query; raise 400 naming the missing ones."""
+    requested = {field: values[field] for field in _ENGINEER_ROLE_LABELS if values.get(field)}
+    if not requested:
+        return
+    found = {user_id for (user_id,) in db.query(User.id).filter(User.id.in_(set(requested.values())))}
+    missing = [
+        f"{_ENGINEER_ROLE_LABELS[field]} engineer with id {user_id} not found"
+        for field, user_id in requested.items() if user_id not in found
+    ]
+    if missing:
+        raise HTTPException(status_code=400, detail="; ".join(missing))
+
+
 @router.post("/", response_model=EpisodeSchema)
-async def create_episode(episode: EpisodeCreate, db: Session = Depends(get_db)):
+def create_episode(episode: EpisodeCreate, db: Session = Depends(get_db)):
     """Create a new episode."""
     # Validate podcast exists
-    from models import Podcast, User
     podcast = db.query(Podcast).filter(Podcast.id == episode.podcast_id).first()
     if not podcast:
         raise HTTPException(status_code=400, detail=f"Podcast with id {episode.podcast_id} not found")
     
     # Validate engineers exist if provided
-    if episode.recording_engineer_id:
-        user = db.query(User).filter(User.id == episode.recording_engineer_id).first()
-        if not user:
-            raise HTTPException(status_code=400, detail=f"Recording engineer with id {episode.recording_engineer_id} not found")
-    
-    if episode.editing_engineer_id:
-        user = db.query(User).filter(User.id == episode.editing_engineer_id).first()
-        if not user:
-            raise HTTPException(status_code=400, detail=f"Editing engineer with id {episode.editing_engineer_id} not found")
-    
-    if episode.reels_engineer_id:
-        user = db.query(User).filter(User.id == episode.reels_engineer_id).first()
-        if not user:
-            raise HTTPException(status_code=400, detail=f"Reels engineer with id {episode.reels_engineer_id} not found")
+    _validate_engineers(db, episode.model_dump())
     
     db_episode = Episode(**episode.model_dump())
     db.add(db_episode)
     db.commit()
+    invalidate("notifications")
     db.refresh(db_episode)
     return db_episode
 
 
 @router.put("/{episode_id}", response_model=EpisodeSchema)
-async def update_episode(
-    episode_id: str, episode_update: EpisodeUpdate, db: Session = Depends(get_db)
+def update_episode(
+    episode_id: str,
+    episode_update: EpisodeUpdate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
 ):
-    """Update an episode."""
-    db_episode = db.query(Episode).filter(Episode.id == episode_id).first()
+    """Update an episode. Workflow automation for status/approval changes runs after the response."""
+    db_episode = db.get(Episode, episode_id)
     if not db_episode:
         raise HTTPException(status_code=404, detail="Episode not found")
     
@@ -133,56 +233,54 @@ async def update_episode(
     old_status = db_episode.status
     
     update_data = episode_update.model_dump(exclude_unset=True)
+    _validate_engineers(db, update_data)
     for field, value in update_data.items():
         setattr(db_episode, field, value)
     
     db.commit()
+    invalidate("notifications")
     db.refresh(db_episode)
     
     # Trigger workflow automation if status or client approvals changed
     if old_status != db_episode.status or 'client_approved_editing' in update_data or 'client_approved_reels' in update_data:
-        from services.workflow_automation import process_episode_status_change
-        try:
-            process_episode_status_change(db, db_episode, old_status)
-        except Exception as e:
-            # Log error but don't fail the update
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error in workflow automation: {e}", exc_info=True)
+        # Errors are logged by the background runner and don't fail the update
+        background_tasks.add_task(
+            process_episode_status_change_in_background, db.get_bind(), db_episode.id, old_status
+        )
     
     return db_episode
 
 
 @router.delete("/{episode_id}")
-async def delete_episode(episode_id: str, db: Session = Depends(get_db)):
+def delete_episode(episode_id: str, db: Session = Depends(get_db)):
     """Delete an episode."""
-    db_episode = db.query(Episode).filter(Episode.id == episode_id).first()
+    # Full ORM delete so the episode's tasks are removed by the relationship cascade
+    db_episode = db.get(Episode, episode_id)
     if not db_episode:
         raise HTTPException(status_code=404, detail="Episode not found")
     
     db.delete(db_episode)
     db.commit()
+    invalidate("notifications")
     return {"message": "Episode deleted successfully"}
 
 
-@router.get("/upcoming/recordings", response_model=List[EpisodeWithPodcast])
-async def get_upcoming_recordings(
+@router.get("/upcoming/recordings", response_model=None, responses={200: {"model": List[EpisodeWithPodcast]}})
+def get_upcoming_recordings(
     days_ahead: int = Query(DEFAULT_NOTIFICATION_DAYS, description="Number of days ahead to look"),
     db: Session = Depends(get_db)
-):
-    """Get upcoming recording sessions."""
-    from datetime import timedelta, timezone
+) -> ORJSONResponse:
+    """
+    Get upcoming recording sessions.
+    
+    Read-only, so it shares the episode list's flat Core rows instead of ORM objects.
+    """
     now = datetime.now(timezone.utc)
     future_date = now + timedelta(days=days_ahead)
     
-    episodes = db.query(Episode).options(
-        joinedload(Episode.podcast),
-        joinedload(Episode.recording_engineer),
-        joinedload(Episode.editing_engineer),
-        joinedload(Episode.reels_engineer)
-    ).filter(
+    stmt = lambda_stmt(lambda: _EPISODE_LIST_SELECT.where(
         Episode.recording_date >= now,
         Episode.recording_date <= future_date
-    ).order_by(Episode.recording_date.asc()).all()
-    
-    return episodes
+    ).order_by(Episode.recording_date.asc()))
+    rows = db.execute(stmt).mappings().all()
+    return ORJSONResponse(_serialize_episode_rows(db, rows))
@@ -2,14 +2,16 @@
 CSV import API endpoint.
 """
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 import csv
 import io
 from datetime import datetime
 import logging
 
 from database import get_db
+from cache import invalidate
 from models import Podcast, Episode, Task, User, EpisodeStatus, TaskType, TaskStatus
 from utils import parse_date
 from constants import MAX_CSV_FILE_SIZE
@@ -17,99 +19,169 @@ from constants import MAX_CSV_FILE_SIZE
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Hebrew CSV status -> EpisodeStatus
+_STATUS_MAP = {
+    "הוקלט": EpisodeStatus.RECORDED,
+    "בעריכה": EpisodeStatus.IN_EDITING,
+    "הופץ": EpisodeStatus.PUBLISHED,
+    "נשלח ללקוח": EpisodeStatus.SENT_TO_CLIENT,
+    "לא התחילה": EpisodeStatus.NOT_STARTED,
+}
 
-def get_or_create_user(db: Session, name: str) -> Optional[User]:
-    """Get existing user or create new one."""
-    if not name or name.strip() == "":
-        return None
+
+def preload_users(db: Session, names: Set[str]) -> Dict[str, User]:
+    """
+    Resolve user names to User rows with one IN query, creating any missing users.
     
-    name = name.strip()
-    user = db.query(User).filter(User.name == name).first()
-    if not user:
-        user = User(name=name)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    return user
+    Returns:
+        Dictionary mapping stripped name to User
+    """
+    names = {n.strip() for n in names if n and n.strip()}
+    if not names:
+        return {}
+    users = {u.name: u for u in db.query(User).filter(User.name.in_(names)).all()}
+    missing = [User(name=name) for name in sorted(names - users.keys())]
+    if missing:
+        db.add_all(missing)
+        db.flush()
+        users.update((u.name, u) for u in missing)
+    return users
 
 
-def get_csv_value(row: dict, *keys) -> str:
-    """Get value from CSV row, trying multiple key variations (with/without trailing spaces)."""
-    for key in keys:
-        # Try exact key
-        value = row.get(key, "")
-        if value:
-            return value
-        # Try with trailing space
-        value = row.get(key + " ", "")
-        if value:
-            return value
-        # Try without trailing space (if key had one)
-        if key.endswith(" "):
-            value = row.get(key.rstrip(), "")
-            if value:
-                return value
-    return ""
+def preload_podcasts(db: Session, hosts_by_name: Dict[str, str]) -> Dict[str, Podcast]:
+    """
+    Resolve podcast names to Podcast rows with one IN query, creating any missing podcasts.
+    
+    Args:
+        hosts_by_name: Podcast name -> host name (used only when the podcast is created)
+        
+    Returns:
+        Dictionary mapping stripped name to Podcast
+    """
+    names = {n.strip() for n in hosts_by_name if n and n.strip()}
+    if not names:
+        return {}
+    podcasts = {p.name: p for p in db.query(Podcast).filter(Podcast.name.in_(names)).all()}
+    missing = [
+        Podcast(name=name, host=hosts_by_name.get(name) or None)
+        for name in sorted(names - podcasts.keys())
+    ]
+    if missing:
+        db.add_all(missing)
+        db.flush()
+        podcasts.update((p.name, p) for p in missing)
+    return podcasts
 
 
-def get_or_create_podcast(db: Session, name: str, host: Optional[str] = None) -> Optional[Podcast]:
-    """Get existing podcast or create new one."""
-    if not name or name.strip() == "":
-        return None
+class EpisodeMatcher:
+    """
+    In-memory replacement for per-row episode lookups during a CSV import.
+    
+    Indexes episodes (ORM objects, or dicts pending a bulk insert) by (podcast_id, episode_number)
+    and (podcast_id, recording_date). Keys are kept in sync as rows update episodes, so later rows
+    match exactly what a database query after a flush would have returned.
+    """
 
-    name = name.strip()
-    podcast = db.query(Podcast).filter(Podcast.name == name).first()
-    if not podcast:
-        podcast = Podcast(name=name, host=host)
-        db.add(podcast)
-        db.commit()
-        db.refresh(podcast)
-    return podcast
+    def __init__(self):
+        self._by_key: Dict[tuple, List[Any]] = {}
+        self._keys: Dict[int, List[tuple]] = {}
 
+    @staticmethod
+    def _field(episode, name: str):
+        return episode.get(name) if isinstance(episode, dict) else getattr(episode, name)
 
-def find_episode(
-    db: Session,
-    podcast_id: str,
-    episode_number: Optional[str],
-    recording_date: Optional[datetime],
-) -> Optional[Episode]:
-    """Find an existing episode by podcast + episode_number, or podcast + recording_date if no number."""
-    if episode_number and episode_number.strip():
-        ep = db.query(Episode).filter(
-            Episode.podcast_id == podcast_id,
-            Episode.episode_number == episode_number.strip(),
-        ).first()
-        if ep:
-            return ep
-    if recording_date is not None:
-        ep = db.query(Episode).filter(
-            Episode.podcast_id == podcast_id,
-            Episode.recording_date == recording_date,
-        ).first()
-        if ep:
-            return ep
-    return None
+    def add(self, episode) -> None:
+        """Index an episode under its current podcast/number/date."""
+        podcast_id = self._field(episode, "podcast_id")
+        keys = []
+        episode_number = self._field(episode, "episode_number")
+        if episode_number:
+            keys.append(("number", podcast_id, episode_number))
+        recording_date = self._field(episode, "recording_date")
+        if recording_date is not None:
+            keys.append(("date", podcast_id, recording_date))
+        for key in keys:
+            self._by_key.setdefault(key, []).append(episode)
+        self._keys[id(episode)] = keys
+
+    def reindex(self, episode) -> None:
+        """Move an episode to the keys matching its updated fields."""
+        for key in self._keys.pop(id(episode), []):
+            self._by_key[key] = [e for e in self._by_key[key] if e is not episode]
+        self.add(episode)
+
+    def find(self, podcast_id: str, episode_number: Optional[str], recording_date: Optional[datetime]):
+        """Find an existing episode by podcast + episode_number, or podcast + recording_date if no number."""
+        if episode_number and episode_number.strip():
+            matches = self._by_key.get(("number", podcast_id, episode_number.strip()))
+            if matches:
+                return matches[0]
+        if recording_date is not None:
+            matches = self._by_key.get(("date", podcast_id, recording_date))
+            if matches:
+                return matches[0]
+        return None
+
+
+def preload_episodes(db: Session, podcast_ids: Set[str]) -> EpisodeMatcher:
+    """Load existing episodes of the given podcasts with one IN query and index them for matching."""
+    matcher = EpisodeMatcher()
+    if podcast_ids:
+        for ep in db.query(Episode).filter(Episode.podcast_id.in_(podcast_ids)).all():
+            matcher.add(ep)
+    return matcher
 
 
 def parse_episode_status(status_str: str) -> EpisodeStatus:
     """Parse Hebrew status to EpisodeStatus enum."""
     if not status_str:
         return EpisodeStatus.NOT_STARTED
-    
-    status_str = status_str.strip()
-    status_map = {
-        "הוקלט": EpisodeStatus.RECORDED,
-        "בעריכה": EpisodeStatus.IN_EDITING,
-        "הופץ": EpisodeStatus.PUBLISHED,
-        "נשלח ללקוח": EpisodeStatus.SENT_TO_CLIENT,
-        "לא התחילה": EpisodeStatus.NOT_STARTED,
+    return _STATUS_MAP.get(status_str.strip(), EpisodeStatus.NOT_STARTED)
+
+
+def get_upload_size(file: UploadFile) -> int:
+    """Size of an uploaded file in bytes, without reading its contents."""
+    if file.size is not None:
+        return file.size
+    file.file.seek(0, io.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+def extract_row_fields(row: dict) -> dict:
+    """Extract the stripped episode fields from one CSV row."""
+    # Header names are stripped when the file is opened, so every lookup is an exact match.
+    # Note: First column (empty key) contains host name in some rows
+    podcast_name = row.get("שם הפודקאסט", "").strip()
+    host_name = row.get("", "").strip()
+    if not host_name and "" not in row:
+        # Try getting by index if DictReader preserves order
+        values = list(row.values())
+        if values and not values[0].startswith("שם הפודקאסט"):
+            host_name = values[0].strip() if values[0] else ""
+    return {
+        "podcast_name": podcast_name,
+        "host_name": host_name,
+        "recording_date_str": row.get("תאריך הקלטה", "").strip(),
+        "studio": row.get("אולפן", "").strip(),
+        "episode_number": row.get("פרק מספר", "").strip(),
+        "guest_names": row.get("שם אורחים", "").strip(),
+        "status_str": row.get("סטטוס", "").strip(),
+        "episode_notes": row.get("הערות לפרק", "").strip(),
+        "card_name": row.get("על איזה כרטיס", "").strip(),
+        "memory_card": (row.get("Memory Card") or row.get("כרטיס זיכרון") or row.get("memory_card") or "").strip(),
+        "recording_person": row.get("הקלטה", "").strip(),
+        "editing_person": row.get("עריכה", "").strip(),
+        "reels_person": row.get("reels", "").strip(),
+        "reels_notes": row.get("הערות לרילס", "").strip(),
+        "drive_link": row.get("לינק לדרייב", "").strip(),
+        "backup_deletion_date_str": row.get("ת. מחיקה מגיבוי", "").strip(),
     }
-    
-    return status_map.get(status_str, EpisodeStatus.NOT_STARTED)
 
 
 @router.post("/csv")
-async def import_csv_file(
+def import_csv_file(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
@@ -122,135 +194,123 @@ async def import_csv_file(
         raise HTTPException(status_code=400, detail="File must be a CSV file")
     
     # Check file size
-    contents = await file.read()
-    if len(contents) > MAX_CSV_FILE_SIZE:
+    if get_upload_size(file) > MAX_CSV_FILE_SIZE:
         raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
     
     try:
-        text = contents.decode('utf-8-sig')  # Handle BOM
-        csv_reader = csv.DictReader(io.StringIO(text))
-        
         imported_count = 0
         errors = []
         
-        # Use transaction for atomicity
+        # Parse all rows first so podcasts/users can be resolved in bulk.
+        # Decode while streaming from the spooled upload instead of reading it into memory.
+        rows = []
+        text_stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')  # Handle BOM
         try:
+            # Short rows get "" rather than None so field lookups can strip() directly
+            csv_reader = csv.DictReader(text_stream, restval="")
+            # Normalize header names once (e.g. "הקלטה " -> "הקלטה") instead of trying variants per cell
+            csv_reader.fieldnames = [f.strip() if f else f for f in (csv_reader.fieldnames or [])]
+            logger.debug(f"CSV columns: {csv_reader.fieldnames}")
             for row_num, row in enumerate(csv_reader, start=2):
+                fields = extract_row_fields(row)
+                # Skip empty rows
+                if not fields["podcast_name"]:
+                    continue
+                rows.append((row_num, fields))
+        finally:
+            # Leave the underlying upload open; Starlette closes it
+            text_stream.detach()
+        
+        # Use transaction for atomicity
+        try:
+            # Resolve podcasts and engineers with one IN query per entity type
+            hosts_by_name: Dict[str, str] = {}
+            user_names: Set[str] = set()
+            for _, fields in rows:
+                hosts_by_name.setdefault(fields["podcast_name"], fields["host_name"])
+                user_names.update(
+                    fields[key] for key in ("recording_person", "editing_person", "reels_person") if fields[key]
+                )
+            podcasts = preload_podcasts(db, hosts_by_name)
+            users = preload_users(db, user_names)
+            matcher = preload_episodes(db, {p.id for p in podcasts.values()})
+            new_episodes: List[dict] = []
+            
+            for row_num, fields in rows:
                 try:
-                    # Extract data from CSV row
-                    # Note: First column (empty key) contains host name in some rows
-                    podcast_name = row.get("שם הפודקאסט", "").strip()
-                    # Get first column value (host name) - check all possible keys
-                    host_name = ""
-                    for key in row.keys():
-                        if not key or key.strip() == "":
-                            host_name = row.get(key, "").strip()
-                            break
-                    if not host_name:
-                        # Try getting by index if DictReader preserves order
-                        values = list(row.values())
-                        if values and not values[0].startswith("שם הפודקאסט"):
-                            host_name = values[0].strip() if values[0] else ""
-                    recording_date_str = row.get("תאריך הקלטה", "").strip()
-                    studio = row.get("אולפן", "").strip()
-                    episode_number = row.get("פרק מספר", "").strip()
-                    guest_names = row.get("שם אורחים", "").strip()
-                    status_str = row.get("סטטוס", "").strip()
-                    episode_notes = get_csv_value(row, "הערות לפרק").strip()
-                    card_name = get_csv_value(row, "על איזה כרטיס").strip()
-                    memory_card = get_csv_value(row, "Memory Card", "כרטיס זיכרון", "memory_card").strip()
-                    # Handle trailing spaces in CSV headers
-                    recording_person = get_csv_value(row, "הקלטה").strip()
-                    editing_person = get_csv_value(row, "עריכה").strip()
-                    reels_person = get_csv_value(row, "reels").strip()
-                    reels_notes = get_csv_value(row, "הערות לרילס").strip()
-                    drive_link = get_csv_value(row, "לינק לדרייב").strip()
-                    backup_deletion_date_str = get_csv_value(row, "ת. מחיקה מגיבוי").strip()
-                    
-                    # Skip empty rows
-                    if not podcast_name:
-                        continue
+                    podcast_name = fields["podcast_name"]
+                    recording_date_str = fields["recording_date_str"]
+                    studio = fields["studio"]
+                    episode_number = fields["episode_number"]
+                    guest_names = fields["guest_names"]
+                    episode_notes = fields["episode_notes"]
+                    card_name = fields["card_name"]
+                    memory_card = fields["memory_card"]
+                    reels_notes = fields["reels_notes"]
+                    drive_link = fields["drive_link"]
                     
-                    # Get or create podcast
-                    podcast = get_or_create_podcast(db, podcast_name, host_name)
+                    podcast = podcasts.get(podcast_name)
                     if not podcast:
                         errors.append(f"Row {row_num}: Could not create podcast")
                         continue
                     
                     # Parse dates
                     recording_date = parse_date(recording_date_str)
-                    backup_deletion_date = parse_date(backup_deletion_date_str)
+                    backup_deletion_date = parse_date(fields["backup_deletion_date_str"])
                     
                     # Debug: Log date parsing for first few rows
                     if row_num <= 5 and recording_date:
                         logger.info(f"Row {row_num}: Parsed '{recording_date_str}' as {recording_date} (year: {recording_date.year})")
                     
                     # Parse status
-                    status = parse_episode_status(status_str)
+                    status = parse_episode_status(fields["status_str"])
                     
-                    # Get or create engineers and assign to episode
-                    recording_engineer_id = None
-                    editing_engineer_id = None
-                    reels_engineer_id = None
-                    
-                    if recording_person:
-                        recording_user = get_or_create_user(db, recording_person)
-                        if recording_user:
-                            recording_engineer_id = recording_user.id
-                    
-                    if editing_person:
-                        editing_user = get_or_create_user(db, editing_person)
-                        if editing_user:
-                            editing_engineer_id = editing_user.id
-                    
-                    if reels_person:
-                        reels_user = get_or_create_user(db, reels_person)
-                        if reels_user:
-                            reels_engineer_id = reels_user.id
+                    # Resolve engineers from the preloaded users
+                    recording_user = users.get(fields["recording_person"])
+                    editing_user = users.get(fields["editing_person"])
+                    reels_user = users.get(fields["reels_person"])
+                    recording_engineer_id = recording_user.id if recording_user else None
+                    editing_engineer_id = editing_user.id if editing_user else None
+                    reels_engineer_id = reels_user.id if reels_user else None
+
+                    values = {
+                        "podcast_id": podcast.id,
+                        "episode_number": episode_number if episode_number else None,
+                        "recording_date": recording_date,
+                        "studio": studio if studio else None,
+                        "guest_names": guest_names if guest_names else None,
+                        "status": status,
+                        "episode_notes": episode_notes if episode_notes else None,
+                        "drive_link": drive_link if drive_link else None,
+                        "backup_deletion_date": backup_deletion_date,
+                        "card_name": card_name if card_name else None,
+                        "memory_card": memory_card if memory_card else None,
+                        "recording_engineer_id": recording_engineer_id,
+                        "editing_engineer_id": editing_engineer_id,
+                        "reels_engineer_id": reels_engineer_id,
+                        "reels_notes": reels_notes if reels_notes else None,
+                    }
 
-                    # Find existing episode (same podcast + episode_number or same podcast + recording_date)
-                    episode = find_episode(db, podcast.id, episode_number, recording_date)
-                    if episode:
-                        # Update existing episode
-                        episode.episode_number = episode_number if episode_number else episode.episode_number
-                        episode.recording_date = recording_date
-                        episode.studio = studio if studio else None
-                        episode.guest_names = guest_names if guest_names else None
-                        episode.status = status
-                        episode.episode_notes = episode_notes if episode_notes else None
-                        episode.drive_link = drive_link if drive_link else None
-                        episode.backup_deletion_date = backup_deletion_date
-                        episode.card_name = card_name if card_name else None
-                        episode.memory_card = memory_card if memory_card else None
-                        episode.recording_engineer_id = recording_engineer_id
-                        episode.editing_engineer_id = editing_engineer_id
-                        episode.reels_engineer_id = reels_engineer_id
-                        episode.reels_notes = reels_notes if reels_notes else None
-                        db.flush()
+                    # Find existing episode (same podcast + episode_number or same podcast + recording_date),
+                    # including episodes created by earlier rows of this file
+                    episode = matcher.find(podcast.id, episode_number, recording_date)
+                    if episode is None:
+                        # Create new episode; inserted in one batch after the loop
+                        new_episodes.append(values)
+                        matcher.add(values)
                     else:
-                        # Create new episode
-                        episode = Episode(
-                            podcast_id=podcast.id,
-                            episode_number=episode_number if episode_number else None,
-                            recording_date=recording_date,
-                            studio=studio if studio else None,
-                            guest_names=guest_names if guest_names else None,
-                            status=status,
-                            episode_notes=episode_notes if episode_notes else None,
-                            drive_link=drive_link if drive_link else None,
-                            backup_deletion_date=backup_deletion_date,
-                            card_name=card_name if card_name else None,
-                            memory_card=memory_card if memory_card else None,
-                            recording_engineer_id=recording_engineer_id,
-                            editing_engineer_id=editing_engineer_id,
-                            reels_engineer_id=reels_engineer_id,
-                            reels_notes=reels_notes if reels_notes else None,
-                        )
-                        db.add(episode)
-                        db.flush()
+                        # Update existing episode (keep its number if the row has none)
+                        if not episode_number:
+                            del values["episode_number"]
+                        if isinstance(episode, dict):
+                            episode.update(values)
+                        else:
+                            for field, value in values.items():
+                                setattr(episode, field, value)
+                        matcher.reindex(episode)
 
                     if row_num <= 5 and recording_date:
-                        logger.info(f"Row {row_num}: Stored recording_date as {episode.recording_date} (year: {episode.recording_date.year if episode.recording_date else None})")
+                        logger.info(f"Row {row_num}: Stored recording_date as {recording_date} (year: {recording_date.year})")
 
                     imported_count += 1
                     
@@ -258,14 +318,17 @@ async def import_csv_file(
                     error_msg = f"Row {row_num}: {str(e)}"
                     errors.append(error_msg)
                     logger.error(error_msg, exc_info=True)
-                    # Rollback this row's transaction to allow processing to continue
-                    try:
-                        db.rollback()
-                    except:
-                        pass  # Ignore rollback errors
+                    # Rows only touch the session once their values are fully built, so skipping
+                    # the row is enough; rolling back would discard earlier rows' updates too
                     continue
             
+            # Single multi-row INSERT for new episodes; updates to existing ones flush with the commit.
+            # Lookups, inserts and updates are committed together as one transaction.
+            if new_episodes:
+                db.execute(insert(Episode), new_episodes)
             db.commit()
+            # Podcasts and episodes changed; drop cached lists and notifications
+            invalidate()
             
             return {
                 "message": f"Successfully imported {imported_count} episodes",
@@ -0,0 +1,49 @@
+"""
+Shared eager-load options for episode and task queries.
+
+Option objects are built once at import, so every endpoint passes the same objects and
+SQLAlchemy's compiled-statement cache sees identical cache keys across endpoints.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from models import Episode, Podcast, Task
+
+# Episode with its podcast and the three engineers
+EPISODE_LOAD_OPTS = (
+    joinedload(Episode.podcast).selectinload(Podcast.aliases),
+    joinedload(Episode.recording_engineer),
+    joinedload(Episode.editing_engineer),
+    joinedload(Episode.reels_engineer),
+    # Anything not listed above raises instead of silently lazy-loading per row
+    raiseload("*"),
+)
+
+# Task with its episode (podcast and engineers, as in TaskWithEpisode) and the assigned user.
+# selectinload issues one IN query per relationship level instead of one wide joined row per task.
+TASK_LOAD_OPTS = (
+    selectinload(Task.episode).options(
+        selectinload(Episode.podcast).selectinload(Podcast.aliases),
+        selectinload(Episode.recording_engineer),
+        selectinload(Episode.editing_engineer),
+        selectinload(Episode.reels_engineer),
+    ),
+    selectinload(Task.assigned_user),
+    raiseload("*"),
+)
+
+# Reused base statement for episode-with-engineers queries
+EPISODE_SELECT = select(Episode).options(*EPISODE_LOAD_OPTS)
+
+# Reused base statement for task-with-episode queries
+TASK_SELECT = select(Task).options(*TASK_LOAD_OPTS)
+
+
+def with_episode_relations(query):
+    """Apply the shared episode eager loads to an ORM query or select."""
+    return query.options(*EPISODE_LOAD_OPTS)
+
+
+def with_task_relations(query):
+    """Apply the shared task eager loads to an ORM query or select."""
+    return query.options(*TASK_LOAD_OPTS)
@@ -1,144 +1,133 @@
 """
 Notifications API endpoints.
 """
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, case, func, literal, null, select, union_all
 from typing import List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from database import get_db
-from models import Episode, Task, TaskStatus
+from cache import cached
+from models import Episode, Podcast, Task, OPEN_TASK_FILTER
 from schemas import NotificationItem
 from constants import DEFAULT_NOTIFICATION_DAYS, FAR_FUTURE_DAYS, TASK_TYPE_LABELS
 
 router = APIRouter()
 
+UTC = timezone.utc
 
-@router.get("/", response_model=List[NotificationItem])
-async def get_notifications(
+
+def _priority(days_until: int) -> str:
+    """Priority for an item due in days_until days."""
+    return "urgent" if days_until <= 1 else ("high" if days_until <= 3 else "normal")
+
+
+_now = bindparam("now")
+_future_date = bindparam("future_date")
+
+# Open tasks due within the window or already overdue. The task branch goes first so
+# the union's column types (TaskType for task_type) come from real columns.
+_task_rows = (
+    select(
+        case((Task.due_date < _now, "overdue_task"), else_="task").label("kind"),
+        Task.id.label("id"),
+        Task.due_date.label("due_date"),
+        Task.episode_id.label("episode_id"),
+        Task.type.label("task_type"),
+        Episode.episode_number.label("episode_number"),
+        func.coalesce(func.nullif(Podcast.name, ""), "Unknown").label("podcast_name"),
+    )
+    .outerjoin(Episode, Task.episode_id == Episode.id)
+    .outerjoin(Podcast, Episode.podcast_id == Podcast.id)
+    .where(
+        Task.due_date <= _future_date,
+        OPEN_TASK_FILTER
+    )
+)
+# Upcoming recording sessions (empty or missing labels fall back in SQL, as in the task branch)
+_recording_rows = (
+    select(
+        literal("recording"),
+        Episode.id,
+        Episode.recording_date,
+        Episode.id,
+        null(),
+        func.coalesce(func.nullif(Episode.episode_number, ""), "N/A"),
+        func.coalesce(func.nullif(Podcast.name, ""), "Unknown Podcast"),
+    )
+    .outerjoin(Podcast, Episode.podcast_id == Podcast.id)
+    .where(
+        Episode.recording_date >= _now,
+        Episode.recording_date <= _future_date
+    )
+)
+_combined = union_all(_task_rows, _recording_rows)
+_columns = _combined.selected_columns
+# Built once at import with named parameters: each request only binds now/future_date and
+# reuses the compiled SQL. Ordered in SQL (no Python sort); recordings sort before tasks due
+# at the same moment, and id keeps the order stable between polls.
+_NOTIFICATION_ROWS = _combined.order_by(_columns.due_date, _columns.kind, _columns.id)
+
+
+# The cache already validates and dumps items through NotificationItem, so skip FastAPI's
+# second response-model pass; it also answers polls with an ETag (304 when unchanged)
+@router.get("/", response_model=None, responses={200: {"model": List[NotificationItem]}})
+@cached("notifications", List[NotificationItem])
+def get_notifications(
     days_ahead: int = Query(DEFAULT_NOTIFICATION_DAYS, description="Number of days ahead to look"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    request: Request = None
 ):
-    """Get all notifications for upcoming recordings and due tasks."""
-    from datetime import timezone
-    notifications = []
-    now = datetime.now(timezone.utc)
-    # Make now naive for comparison with naive episode dates
-    now_naive = now.replace(tzinfo=None)
+    """
+    Get all notifications for upcoming recordings and due tasks.
+    
+    Upcoming recordings, due tasks and overdue tasks come back from one UNION ALL,
+    already ordered by due date in the database.
+    """
+    # Dates are stored as naive UTC, so compare against naive UTC now
+    now_naive = datetime.now(UTC).replace(tzinfo=None)
     future_date = now_naive + timedelta(days=days_ahead)
     
-    # Get upcoming recording sessions with eager loading
-    upcoming_episodes = db.query(Episode).options(
-        joinedload(Episode.podcast),
-        joinedload(Episode.recording_engineer),
-        joinedload(Episode.editing_engineer),
-        joinedload(Episode.reels_engineer)
-    ).filter(
-        Episode.recording_date >= now_naive,
-        Episode.recording_date <= future_date
-    ).order_by(Episode.recording_date.asc()).all()
+    rows = db.execute(_NOTIFICATION_ROWS, {"now": now_naive, "future_date": future_date}).mappings()
     
-    for episode in upcoming_episodes:
-        if not episode.recording_date:
-            continue  # Skip episodes without recording dates
-            
-        days_until = (episode.recording_date - now_naive).days
-        priority = "urgent" if days_until <= 1 else ("high" if days_until <= 3 else "normal")
+    notifications = []
+    for row in rows:
+        due_date = row["due_date"]
+        # Assume UTC for naive datetimes
+        due_date_aware = due_date.replace(tzinfo=UTC) if due_date.tzinfo is None else due_date
         
-        # Convert naive datetime to aware for NotificationItem
-        recording_date_aware = episode.recording_date
-        if recording_date_aware and recording_date_aware.tzinfo is None:
-            # Assume UTC for naive datetimes
-            from datetime import timezone
-            recording_date_aware = recording_date_aware.replace(tzinfo=timezone.utc)
+        if row["kind"] == "recording":
+            days_until = (due_date - now_naive).days
+            notifications.append(NotificationItem(
+                id=f"recording_{row['id']}",
+                type="recording_session",
+                title=f"Recording Session: {row['podcast_name']}",
+                message=f"Episode {row['episode_number']} scheduled for {due_date.strftime('%Y-%m-%d %H:%M')}",
+                due_date=due_date_aware,
+                episode_id=row["episode_id"],
+                priority=_priority(days_until)
+            ))
+            continue
         
-        notifications.append(NotificationItem(
-            id=f"recording_{episode.id}",
-            type="recording_session",
-            title=f"Recording Session: {episode.podcast.name if episode.podcast else 'Unknown Podcast'}",
-            message=f"Episode {episode.episode_number or 'N/A'} scheduled for {episode.recording_date.strftime('%Y-%m-%d %H:%M')}",
-            due_date=recording_date_aware,
-            episode_id=episode.id,
-            priority=priority
-        ))
-    
-    # Get due tasks with eager loading
-    # Tasks may have timezone-aware dates, so use the timezone-aware now
-    due_tasks = db.query(Task).options(
-        joinedload(Task.episode).joinedload(Episode.podcast),
-        joinedload(Task.assigned_user)
-    ).filter(
-        Task.due_date >= now,
-        Task.due_date <= now + timedelta(days=days_ahead),
-        Task.status != TaskStatus.DONE,
-        Task.status != TaskStatus.SKIPPED
-    ).order_by(Task.due_date.asc()).all()
-    
-    for task in due_tasks:
-        if not task.due_date:
-            continue  # Skip tasks without due dates
-        
-        # Handle both naive and aware datetimes
-        if task.due_date.tzinfo is None:
-            days_until = (task.due_date - now_naive).days
+        # .title() only runs for types without a label
+        task_label = TASK_TYPE_LABELS.get(row["task_type"]) or row["task_type"].title()
+        message = f"{task_label} for {row['podcast_name']} - Episode {row['episode_number'] if row['episode_id'] else 'N/A'}"
+        if row["kind"] == "overdue_task":
+            title = f"OVERDUE: {task_label} Task"
+            priority = "urgent"
         else:
-            days_until = (task.due_date - now).days
-        priority = "urgent" if days_until <= 1 else ("high" if days_until <= 3 else "normal")
-        
-        episode_name = task.episode.podcast.name if task.episode and task.episode.podcast else "Unknown"
-        
-        # Ensure due_date is timezone-aware
-        due_date_aware = task.due_date
-        if due_date_aware and due_date_aware.tzinfo is None:
-            from datetime import timezone
-            due_date_aware = due_date_aware.replace(tzinfo=timezone.utc)
-        
+            title = f"{task_label} Task Due"
+            priority = _priority((due_date - now_naive).days)
         notifications.append(NotificationItem(
-            id=f"task_{task.id}",
+            id=f"{row['kind']}_{row['id']}",
             type="due_task",
-            title=f"{TASK_TYPE_LABELS.get(task.type, task.type.title())} Task Due",
-            message=f"{TASK_TYPE_LABELS.get(task.type, task.type.title())} for {episode_name} - Episode {task.episode.episode_number if task.episode else 'N/A'}",
+            title=title,
+            message=message,
             due_date=due_date_aware,
-            episode_id=task.episode_id,
-            task_id=task.id,
+            episode_id=row["episode_id"],
+            task_id=row["id"],
             priority=priority
         ))
     
-    # Get overdue tasks with eager loading
-    # Tasks may have timezone-aware dates, so use the timezone-aware now
-    overdue_tasks = db.query(Task).options(
-        joinedload(Task.episode).joinedload(Episode.podcast),
-        joinedload(Task.assigned_user)
-    ).filter(
-        Task.due_date < now,
-        Task.status != TaskStatus.DONE,
-        Task.status != TaskStatus.SKIPPED
-    ).order_by(Task.due_date.asc()).all()
-    
-    for task in overdue_tasks:
-        if not task.due_date:
-            continue  # Skip tasks without due dates
-            
-        episode_name = task.episode.podcast.name if task.episode and task.episode.podcast else "Unknown"
-        
-        # Ensure due_date is timezone-aware
-        due_date_aware = task.due_date
-        if due_date_aware and due_date_aware.tzinfo is None:
-            from datetime import timezone
-            due_date_aware = due_date_aware.replace(tzinfo=timezone.utc)
-        
-        notifications.append(NotificationItem(
-            id=f"overdue_task_{task.id}",
-            type="due_task",
-            title=f"OVERDUE: {TASK_TYPE_LABELS.get(task.type, task.type.title())} Task",
-            message=f"{TASK_TYPE_LABELS.get(task.type, task.type.title())} for {episode_name} - Episode {task.episode.episode_number if task.episode else 'N/A'}",
-            due_date=due_date_aware,
-            episode_id=task.episode_id,
-            task_id=task.id,
-            priority="urgent"
-        ))
-    
-    # Sort by due date
-    notifications.sort(key=lambda x: x.due_date)
-    
     return notifications
@@ -1,64 +1,81 @@
 """
 Podcast API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+from sqlalchemy import exists, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import List
+import uuid
 
 from database import get_db
+from cache import cached, invalidate
 from models import Podcast, PodcastAlias
 from schemas import Podcast as PodcastSchema, PodcastCreate, PodcastUpdate, PodcastAliasCreate, PodcastAliasOut
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[PodcastSchema])
-async def get_podcasts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all podcasts with aliases."""
-    podcasts = db.query(Podcast).options(joinedload(Podcast.aliases)).offset(skip).limit(limit).all()
+def _insert_ignoring_duplicates(db: Session, model, index_elements):
+    """INSERT ... ON CONFLICT DO NOTHING for the session's dialect (plain INSERT elsewhere)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return pg_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    if dialect == "sqlite":
+        return sqlite_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    return insert(model)
+
+
+# The catalog rarely changes and every write invalidates it, so a longer TTL is safe.
+# Cached values are already JSON-ready, so FastAPI's response-model pass is skipped;
+# polls get an ETag and a 304 when the catalog is unchanged.
+@router.get("/", response_model=None, responses={200: {"model": List[PodcastSchema]}})
+@cached("podcasts", List[PodcastSchema], policy="normal")
+def get_podcasts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), request: Request = None):
+    """Get all podcasts with aliases (selectin-loaded by the relationship default)."""
+    podcasts = db.query(Podcast).offset(skip).limit(limit).all()
     return podcasts
 
 
 @router.get("/{podcast_id}", response_model=PodcastSchema)
-async def get_podcast(podcast_id: str, db: Session = Depends(get_db)):
+def get_podcast(podcast_id: str, db: Session = Depends(get_db)):
     """Get a specific podcast with aliases."""
-    podcast = db.query(Podcast).options(joinedload(Podcast.aliases)).filter(Podcast.id == podcast_id).first()
+    podcast = db.get(Podcast, podcast_id)
     if not podcast:
         raise HTTPException(status_code=404, detail="Podcast not found")
     return podcast
 
 
 @router.post("/", response_model=PodcastSchema)
-async def create_podcast(podcast: PodcastCreate, db: Session = Depends(get_db)):
+def create_podcast(podcast: PodcastCreate, db: Session = Depends(get_db)):
     """Create a new podcast, optionally with aliases."""
     data = podcast.model_dump(exclude={"aliases"})
     db_podcast = Podcast(**data)
     db.add(db_podcast)
+    db.flush()
+    # Create alias records if provided: one SELECT for taken aliases, one multi-row INSERT
+    stripped = ((raw or "").strip() for raw in podcast.aliases or [])
+    wanted = list(dict.fromkeys(alias for alias in stripped if alias))  # dedupe, keep order
+    if wanted:
+        taken = set(db.scalars(select(PodcastAlias.alias).where(PodcastAlias.alias.in_(wanted))))
+        new_aliases = [{"podcast_id": db_podcast.id, "alias": alias} for alias in wanted if alias not in taken]
+        if new_aliases:
+            # skip aliases already used by another podcast (including ones added concurrently)
+            db.execute(_insert_ignoring_duplicates(db, PodcastAlias, ["alias"]), new_aliases)
     db.commit()
-    db.refresh(db_podcast)
-    # Create alias records if provided
-    aliases = podcast.aliases or []
-    for raw in aliases:
-        alias_str = (raw or "").strip()
-        if not alias_str:
-            continue
-        existing = db.query(PodcastAlias).filter(PodcastAlias.alias == alias_str).first()
-        if existing:
-            continue  # skip if already used by another podcast
-        db.add(PodcastAlias(podcast_id=db_podcast.id, alias=alias_str))
-    db.commit()
+    invalidate("podcasts")
     # Return podcast with aliases loaded
     db.refresh(db_podcast)
-    db_podcast = db.query(Podcast).options(joinedload(Podcast.aliases)).filter(Podcast.id == db_podcast.id).first()
     return db_podcast
 
 
 @router.put("/{podcast_id}", response_model=PodcastSchema)
-async def update_podcast(
+def update_podcast(
     podcast_id: str, podcast_update: PodcastUpdate, db: Session = Depends(get_db)
 ):
     """Update a podcast."""
-    db_podcast = db.query(Podcast).filter(Podcast.id == podcast_id).first()
+    db_podcast = db.get(Podcast, podcast_id)
     if not db_podcast:
         raise HTTPException(status_code=404, detail="Podcast not found")
     
@@ -67,58 +84,73 @@ async def update_podcast(
         setattr(db_podcast, field, value)
     
     db.commit()
+    invalidate("podcasts")
     db.refresh(db_podcast)
     return db_podcast
 
 
 @router.delete("/{podcast_id}")
-async def delete_podcast(podcast_id: str, db: Session = Depends(get_db)):
+def delete_podcast(podcast_id: str, db: Session = Depends(get_db)):
     """Delete a podcast."""
-    db_podcast = db.query(Podcast).filter(Podcast.id == podcast_id).first()
+    # Full ORM delete so episodes and aliases are removed by the relationship cascades
+    db_podcast = db.get(Podcast, podcast_id)
     if not db_podcast:
         raise HTTPException(status_code=404, detail="Podcast not found")
 
     db.delete(db_podcast)
     db.commit()
+    # The cascade also removed the podcast's episodes and tasks
+    invalidate("podcasts")
+    invalidate("notifications")
     return {"message": "Podcast deleted successfully"}
 
 
 # --- Aliases ---
 
 @router.get("/{podcast_id}/aliases", response_model=List[PodcastAliasOut])
-async def get_podcast_aliases(podcast_id: str, db: Session = Depends(get_db)):
+@cached("podcasts", List[PodcastAliasOut])
+def get_podcast_aliases(podcast_id: str, db: Session = Depends(get_db)):
     """List aliases for a podcast."""
-    podcast = db.query(Podcast).filter(Podcast.id == podcast_id).first()
-    if not podcast:
+    aliases = db.query(PodcastAlias).filter(PodcastAlias.podcast_id == podcast_id).all()
+    # Only an empty result needs the podcast existence check
+    if not aliases and not db.query(exists().where(Podcast.id == podcast_id)).scalar():
         raise HTTPException(status_code=404, detail="Podcast not found")
-    return db.query(PodcastAlias).filter(PodcastAlias.podcast_id == podcast_id).all()
+    return aliases
 
 
 @router.post("/{podcast_id}/aliases", response_model=PodcastAliasOut)
-async def add_podcast_alias(
+def add_podcast_alias(
     podcast_id: str, body: PodcastAliasCreate, db: Session = Depends(get_db)
 ):
     """Add an alias for a podcast (e.g. for matching Google Calendar event titles)."""
-    podcast = db.query(Podcast).filter(Podcast.id == podcast_id).first()
-    if not podcast:
-        raise HTTPException(status_code=404, detail="Podcast not found")
     alias_str = (body.alias or "").strip()
     if not alias_str:
         raise HTTPException(status_code=400, detail="Alias cannot be empty")
+    # One round trip on the common path: insert only if the podcast exists and the alias is free
+    podcast_exists = exists().where(Podcast.id == podcast_id)
+    new_row = select(literal(str(uuid.uuid4())), literal(podcast_id), literal(alias_str)).where(podcast_exists)
+    stmt = _insert_ignoring_duplicates(db, PodcastAlias, ["alias"]).from_select(
+        ["id", "podcast_id", "alias"], new_row
+    ).returning(PodcastAlias.id, PodcastAlias.podcast_id, PodcastAlias.alias)
+    inserted = db.execute(stmt).mappings().first()
+    if inserted is not None:
+        db.commit()
+        invalidate("podcasts")
+        return dict(inserted)
+    
+    # Nothing inserted: the alias is taken or the podcast does not exist
     existing = db.query(PodcastAlias).filter(PodcastAlias.alias == alias_str).first()
-    if existing:
-        if existing.podcast_id == podcast_id:
-            return existing
-        raise HTTPException(status_code=400, detail="This alias is already used by another podcast")
-    alias_row = PodcastAlias(podcast_id=podcast_id, alias=alias_str)
-    db.add(alias_row)
-    db.commit()
-    db.refresh(alias_row)
-    return alias_row
+    if existing is None:
+        raise HTTPException(status_code=404, detail="Podcast not found")
+    if existing.podcast_id == podcast_id:
+        return existing
+    if not db.query(exists().where(Podcast.id == podcast_id)).scalar():
+        raise HTTPException(status_code=404, detail="Podcast not found")
+    raise HTTPException(status_code=400, detail="This alias is already used by another podcast")
 
 
 @router.delete("/{podcast_id}/aliases/{alias_id}")
-async def delete_podcast_alias(
+def delete_podcast_alias(
     podcast_id: str, alias_id: str, db: Session = Depends(get_db)
 ):
     """Remove an alias from a podcast."""
@@ -130,4 +162,5 @@ async def delete_podcast_alias(
         raise HTTPException(status_code=404, detail="Alias not found")
     db.delete(alias_row)
     db.commit()
+    invalidate("podcasts")
     return {"message": "Alias deleted"}
@@ -2,22 +2,24 @@
 Task API endpoints.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import nullslast, or_
-from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, delete, lambda_stmt, nullslast, or_
+from typing import List, Optional, Union
 from datetime import datetime, timedelta, timezone
 
+from cache import invalidate
 from database import get_db
-from models import Task, TaskStatus, TaskType, Episode
-from schemas import Task as TaskSchema, TaskCreate, TaskUpdate, TaskWithEpisode
+from api.loaders import TASK_LOAD_OPTS, TASK_SELECT
+from models import Task, TaskStatus, TaskType, Episode, OPEN_TASK_FILTER
+from schemas import Task as TaskSchema, TaskCreate, TaskUpdate, TaskWithEpisode, TaskCursor, TaskPage
 from constants import DEFAULT_NOTIFICATION_DAYS
+from utils import request_now
 
 router = APIRouter()
 
 # Studio preparation tasks more than 1 day overdue are excluded from lists and cleaned up daily
-def _exclude_stale_studio_prep_filter():
-    now = datetime.now(timezone.utc)
-    cutoff = (now - timedelta(days=1)).replace(tzinfo=None)  # naive UTC for DB comparison
+def _exclude_stale_studio_prep_filter(now_naive: datetime):
+    cutoff = now_naive - timedelta(days=1)
     return or_(
         Task.type != TaskType.STUDIO_PREPARATION,
         Task.due_date.is_(None),
@@ -25,51 +27,87 @@ def _exclude_stale_studio_prep_filter():
     )
 
 
-@router.get("/", response_model=List[TaskWithEpisode])
-async def get_tasks(
+def _live_tasks_stmt(now_naive: datetime):
+    """
+    Task list statement with eager loads and the stale studio prep filter.
+
+    Built as a lambda statement so the select, load options and filters are analyzed once;
+    later calls only re-extract the bound values (the cutoff and any appended filters).
+    """
+    # Built outside the lambda: values computed by calls inside it would be cached as constants
+    stale_filter = _exclude_stale_studio_prep_filter(now_naive)
+    return lambda_stmt(lambda: TASK_SELECT.where(stale_filter))
+
+
+@router.get("/", response_model=Union[List[TaskWithEpisode], TaskPage])
+def get_tasks(
     skip: int = 0,
     limit: int = 100,
     episode_id: Optional[str] = None,
     assigned_to: Optional[str] = None,
     status: Optional[TaskStatus] = None,
     task_type: Optional[TaskType] = None,
-    db: Session = Depends(get_db)
+    after_due_date: Optional[datetime] = Query(None, description="Cursor: due date of the last task already seen"),
+    after_id: Optional[str] = Query(None, description="Cursor: id of the last task already seen"),
+    include_cursor: bool = Query(False, description="Return {items, next_cursor} instead of a plain list"),
+    db: Session = Depends(get_db),
+    now: datetime = Depends(request_now)
 ):
-    """Get all tasks with optional filtering. Studio preparation tasks > 1 day overdue are excluded."""
+    """
+    Get all tasks with optional filtering. Studio preparation tasks > 1 day overdue are excluded.
+    
+    Tasks are ordered by (due_date nulls last, id). Passing the last seen task as
+    after_due_date/after_id continues from it with an index seek instead of an OFFSET scan;
+    skip is kept for existing clients.
+    """
     # Use eager loading to prevent N+1 queries
-    query = db.query(Task).options(
-        joinedload(Task.episode).joinedload(Episode.podcast),
-        joinedload(Task.assigned_user)
-    ).filter(_exclude_stale_studio_prep_filter())
+    stmt = _live_tasks_stmt(now.replace(tzinfo=None))
     
     if episode_id:
-        query = query.filter(Task.episode_id == episode_id)
+        stmt += lambda s: s.where(Task.episode_id == episode_id)
     if assigned_to:
-        query = query.filter(Task.assigned_to == assigned_to)
+        stmt += lambda s: s.where(Task.assigned_to == assigned_to)
     if status:
-        query = query.filter(Task.status == status)
+        stmt += lambda s: s.where(Task.status == status)
     if task_type:
-        query = query.filter(Task.type == task_type)
+        stmt += lambda s: s.where(Task.type == task_type)
+    
+    if after_id and after_due_date:
+        # Dates are stored as naive UTC
+        if after_due_date.tzinfo:
+            after_due_date = after_due_date.astimezone(timezone.utc).replace(tzinfo=None)
+        stmt += lambda s: s.where(or_(
+            Task.due_date > after_due_date,
+            and_(Task.due_date == after_due_date, Task.id > after_id),
+            Task.due_date.is_(None)
+        ))
+    elif after_id:
+        # Cursor is already in the undated tail
+        stmt += lambda s: s.where(Task.due_date.is_(None), Task.id > after_id)
     
-    # Handle null due_date by putting nulls last
-    tasks = query.order_by(nullslast(Task.due_date.asc())).offset(skip).limit(limit).all()
-    return tasks
+    # Handle null due_date by putting nulls last; id keeps pages stable for the cursor
+    stmt += lambda s: s.order_by(nullslast(Task.due_date.asc()), Task.id).offset(skip).limit(limit)
+    tasks = db.execute(stmt).scalars().all()
+    if not include_cursor:
+        return tasks
+    
+    next_cursor = None
+    if tasks and len(tasks) == limit:
+        next_cursor = TaskCursor(after_due_date=tasks[-1].due_date, after_id=tasks[-1].id)
+    return {"items": tasks, "next_cursor": next_cursor}
 
 
 @router.get("/{task_id}", response_model=TaskWithEpisode)
-async def get_task(task_id: str, db: Session = Depends(get_db)):
+def get_task(task_id: str, db: Session = Depends(get_db)):
     """Get a specific task."""
-    task = db.query(Task).options(
-        joinedload(Task.episode).joinedload(Episode.podcast),
-        joinedload(Task.assigned_user)
-    ).filter(Task.id == task_id).first()
+    task = db.get(Task, task_id, options=TASK_LOAD_OPTS)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
 @router.post("/", response_model=TaskSchema)
-async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
+def create_task(task: TaskCreate, db: Session = Depends(get_db)):
     """Create a new task."""
     # Validate episode exists
     from models import Episode
@@ -87,32 +125,31 @@ async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
     db_task = Task(**task.model_dump())
     db.add(db_task)
     db.commit()
+    invalidate("notifications")
     db.refresh(db_task)
     return db_task
 
 
 @router.put("/{task_id}", response_model=TaskSchema)
-async def update_task(
+def update_task(
     task_id: str, task_update: TaskUpdate, db: Session = Depends(get_db)
 ):
     """Update a task. When a studio preparation task is marked done, a recording task is created."""
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+    db_task = db.get(Task, task_id)
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
     
     update_data = task_update.model_dump(exclude_unset=True)
     old_status = db_task.status
     
-    # Auto-set completed_at when status changes to DONE
-    if update_data.get("status") == TaskStatus.DONE and db_task.status != TaskStatus.DONE:
-        update_data["completed_at"] = datetime.now(timezone.utc)
-    elif update_data.get("status") != TaskStatus.DONE and db_task.status == TaskStatus.DONE:
-        update_data["completed_at"] = None
-    
+    # completed_at follows status changes via the Task before_update listener
     for field, value in update_data.items():
         setattr(db_task, field, value)
+    if not db.is_modified(db_task):
+        return db_task
     
     db.commit()
+    invalidate("notifications")
     db.refresh(db_task)
     # When studio preparation is marked done, create a recording task for the episode
     if "status" in update_data:
@@ -122,53 +159,50 @@ async def update_task(
 
 
 @router.delete("/{task_id}")
-async def delete_task(task_id: str, db: Session = Depends(get_db)):
+def delete_task(task_id: str, db: Session = Depends(get_db)):
     """Delete a task."""
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
+    # Tasks have no dependent rows, so a single DELETE both checks existence and removes it
+    deleted = db.execute(delete(Task).where(Task.id == task_id)).rowcount
+    if not deleted:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    db.delete(db_task)
     db.commit()
+    invalidate("notifications")
     return {"message": "Task deleted successfully"}
 
 
 @router.get("/due/upcoming", response_model=List[TaskWithEpisode])
-async def get_due_tasks(
+def get_due_tasks(
     days_ahead: int = Query(DEFAULT_NOTIFICATION_DAYS, description="Number of days ahead to look"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    now: datetime = Depends(request_now)
 ):
-    """Get tasks that are due soon. Studio preparation tasks > 1 day overdue are excluded."""
-    now = datetime.now(timezone.utc)
-    future_date = now + timedelta(days=days_ahead)
+    """Get tasks that are due soon."""
+    # Dates are stored as naive UTC
+    now_naive = now.replace(tzinfo=None)
+    future_date = now_naive + timedelta(days=days_ahead)
     
-    tasks = db.query(Task).options(
-        joinedload(Task.episode).joinedload(Episode.podcast),
-        joinedload(Task.assigned_user)
-    ).filter(
-        _exclude_stale_studio_prep_filter(),
-        Task.due_date >= now,
+    # due_date >= now already excludes stale studio preparation tasks, so no OR filter here
+    stmt = lambda_stmt(lambda: TASK_SELECT.where(
+        Task.due_date >= now_naive,
         Task.due_date <= future_date,
-        Task.status != TaskStatus.DONE,
-        Task.status != TaskStatus.SKIPPED
-    ).order_by(Task.due_date.asc()).all()
+        OPEN_TASK_FILTER
+    ).order_by(Task.due_date.asc()))
     
-    return tasks
+    return db.execute(stmt).scalars().all()
 
 
 @router.get("/overdue", response_model=List[TaskWithEpisode])
-async def get_overdue_tasks(db: Session = Depends(get_db)):
+def get_overdue_tasks(db: Session = Depends(get_db), now: datetime = Depends(request_now)):
     """Get overdue tasks. Studio preparation tasks > 1 day overdue are excluded (and removed from DB by daily workflow)."""
-    now = datetime.now(timezone.utc)
+    # Dates are stored as naive UTC
+    now_naive = now.replace(tzinfo=None)
+    cutoff = now_naive - timedelta(days=1)
     
-    tasks = db.query(Task).options(
-        joinedload(Task.episode).joinedload(Episode.podcast),
-        joinedload(Task.assigned_user)
-    ).filter(
-        _exclude_stale_studio_prep_filter(),
-        Task.due_date < now,
-        Task.status != TaskStatus.DONE,
-        Task.status != TaskStatus.SKIPPED
-    ).order_by(Task.due_date.asc()).all()
+    # Every row here has a due date, so the stale filter reduces to a range on studio prep tasks
+    stmt = lambda_stmt(lambda: TASK_SELECT.where(
+        Task.due_date < now_naive,
+        or_(Task.type != TaskType.STUDIO_PREPARATION, Task.due_date >= cutoff),
+        OPEN_TASK_FILTER
+    ).order_by(Task.due_date.asc()))
     
-    return tasks
+    return db.execute(stmt).scalars().all()
@@ -13,7 +13,7 @@ router = APIRouter()
 
 
 @router.post("/daily")
-async def trigger_daily_workflow(db: Session = Depends(get_db)):
+def trigger_daily_workflow(db: Session = Depends(get_db)):
     """
     Manually trigger the daily workflow process.
     
@@ -32,7 +32,7 @@ async def trigger_daily_workflow(db: Session = Depends(get_db)):
 
 
 @router.post("/sync-calendar")
-async def sync_calendar(
+def sync_calendar(
     days_ahead: Optional[int] = Query(None, description="Number of days ahead to sync"),
     db: Session = Depends(get_db)
 ):
@@ -0,0 +1,163 @@
+"""
+In-process response cache for read-heavy list endpoints polled by the UI.
+
+Entries live for a short freshness window derived from how long the handler took
+(slow responses are kept a little longer), clamped per policy. If the database fails
+while refreshing an entry, the last cached value is served instead. The cache holds at
+most MAX_ENTRIES values and evicts the least recently used one.
+
+Each entry also keeps its encoded JSON body and an ETag computed once per refresh. When
+the endpoint receives the HTTP request, a matching If-None-Match is answered with 304.
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+from sqlalchemy.exc import SQLAlchemyError
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# policy -> (seconds added to generation time, min TTL, max TTL)
+CACHE_POLICIES: Dict[str, Tuple[float, float, float]] = {
+    "short": (2.0, 1.0, 10.0),
+    "normal": (10.0, 5.0, 30.0),
+    "long": (30.0, 10.0, 60.0),
+}
+
+# Bounds memory when clients page through many skip/limit combinations
+MAX_ENTRIES = 256
+
+# Arguments that are never part of the cache key
+_UNKEYED_ARGS = ("db", "request")
+
+# key -> (fresh_until monotonic time, cached value, JSON body, ETag), least recently used first
+_entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any, bytes, str]]" = OrderedDict()
+# namespace (None for all) -> times invalidated; a refresh that saw an older count is not stored
+_generations: Dict[Optional[str], int] = {}
+# Sync write endpoints invalidate from threadpool threads while the wrapper runs on the event loop
+_lock = threading.Lock()
+
+
+def freshness_lifetime(elapsed: float, policy: str) -> float:
+    """TTL in seconds for a value that took elapsed seconds to generate."""
+    extra, low, high = CACHE_POLICIES[policy]
+    return min(max(elapsed + extra, low), high)
+
+
+def invalidate(namespace: Optional[str] = None):
+    """Drop cached entries for one namespace, or all of them."""
+    with _lock:
+        _generations[namespace] = _generations.get(namespace, 0) + 1
+        if namespace is None:
+            _entries.clear()
+            return
+        for key in [k for k in _entries if k[0] == namespace]:
+            del _entries[key]
+
+
+def _generation(namespace: str) -> Tuple[int, int]:
+    """Invalidation counts covering namespace; call with _lock held."""
+    return _generations.get(None, 0), _generations.get(namespace, 0)
+
+
+def etag_for(body: bytes) -> str:
+    """Weak ETag for an encoded response body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value covers etag."""
+    if not if_none_match:
+        return False
+    candidates = {c.strip() for c in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+def _respond(request: Optional[Request], value: Any, body: bytes, etag: str):
+    """Return value for direct calls, or a JSON / 304 response when serving a request."""
+    if request is None:
+        return value
+    # no-cache: clients may keep the body but must revalidate, and every write invalidates the
+    # namespaces it affects, so writes show up on the next request
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def cached(namespace: str, response_type: Any, policy: str = "short"):
+    """
+    Cache an async endpoint's result keyed by its arguments (except db and request).
+
+    The result is converted to JSON-ready data via response_type before caching, so cached
+    values never hold ORM objects bound to a closed session. If the endpoint declares a
+    request parameter, responses carry the entry's ETag. Sync endpoints (blocking database
+    work) run in the threadpool; the returned wrapper is always async.
+    """
+    adapter = TypeAdapter(response_type)
+
+    def encode(result):
+        value = adapter.dump_python(adapter.validate_python(result, from_attributes=True), mode="json")
+        body = orjson.dumps(value)
+        return value, body, etag_for(body)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        if inspect.iscoroutinefunction(func):
+            call = func
+        else:
+            async def call(*args, **kwargs):
+                return await run_in_threadpool(func, *args, **kwargs)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            request = bound.arguments.get("request")
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return _respond(request, *encode(await call(*args, **kwargs)))
+            key = (namespace, (func.__name__,) + tuple(
+                (name, value) for name, value in bound.arguments.items() if name not in _UNKEYED_ARGS
+            ))
+            with _lock:
+                entry = _entries.get(key)
+                generation = _generation(namespace)
+                if entry is not None:
+                    _entries.move_to_end(key)
+            started = time.monotonic()
+            if entry is not None and entry[0] > started:
+                return _respond(request, *entry[1:])
+
+            try:
+                result = await call(*args, **kwargs)
+            except SQLAlchemyError:
+                if entry is None:
+                    raise
+                logger.warning(f"Serving stale {namespace} response after database error", exc_info=True)
+                return _respond(request, *entry[1:])
+
+            value, body, etag = encode(result)
+            elapsed = time.monotonic() - started
+            with _lock:
+                # A write invalidated the namespace mid-refresh; result may predate it
+                if _generation(namespace) == generation:
+                    _entries[key] = (time.monotonic() + freshness_lifetime(elapsed, policy), value, body, etag)
+                    _entries.move_to_end(key)
+                    if len(_entries) > MAX_ENTRIES:
+                        _entries.popitem(last=False)
+            return _respond(request, value, body, etag)
+
+        return wrapper
+
+    return decorator
@@ -10,6 +10,9 @@ import os
 from database import engine
 from sqlalchemy import text
 
+# Child tables first
+TABLES = ("tasks", "episodes", "podcast_aliases", "podcasts", "users")
+
 def clear_database():
     """Clear all data from all tables."""
     db_url = os.environ.get("DATABASE_URL", "")
@@ -21,12 +24,16 @@ def clear_database():
 
     print("Clearing database...")
 
-    with engine.connect() as conn:
-        # Delete all records (order respects foreign keys)
-        for table in ("tasks", "episodes", "podcasts", "users"):
-            print(f"Deleting {table}...")
-            conn.execute(text(f"DELETE FROM {table}"))
-        conn.commit()
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # One statement, no per-row deletes or cascades; also resets sequences
+            print(f"Truncating {', '.join(TABLES)}...")
+            conn.execute(text(f"TRUNCATE TABLE {', '.join(TABLES)} RESTART IDENTITY CASCADE"))
+        else:
+            # Delete all records in one transaction (order respects foreign keys)
+            for table in TABLES:
+                print(f"Deleting {table}...")
+                conn.execute(text(f"DELETE FROM {table}"))
 
     print("\n✅ Database cleared. Tables are empty; you can re-import CSV.")
 
@@ -3,7 +3,7 @@ Configuration management using environment variables.
 """
 import os
 from pathlib import Path
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
@@ -22,13 +22,16 @@ class Settings(BaseSettings):
     GOOGLE_CALENDAR_TIMEZONE: str = "Asia/Jerusalem"
     GOOGLE_CALENDAR_LOOKAHEAD_DAYS: int = 7
     
+    # Short-lived in-process cache for polled list endpoints (notifications, podcasts)
+    RESPONSE_CACHE_ENABLED: bool = True
+    
+    # Apply migrations.py from the startup event (otherwise run it as a deploy step)
+    RUN_MIGRATIONS_ON_STARTUP: bool = False
+    
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=True)
 
 
 # Global settings instance
@@ -1,17 +1,36 @@
 """
 Database configuration and session management.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # SQLite database URL
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./podcast_task_manager.db")
+IS_SQLITE = "sqlite" in SQLALCHEMY_DATABASE_URL
+
+# Sync routes run in FastAPI's threadpool, so a burst of requests needs more than the default
+# 5 + 10 connections. Server databases also get pre-ping (drops connections the server closed)
+# and recycling below typical idle timeouts.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+POOL_OPTIONS = {} if IS_SQLITE else {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": 30,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    # Compiled-statement cache; sized above the number of distinct query shapes the API builds
+    query_cache_size=1200,
+    **POOL_OPTIONS,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -28,6 +47,39 @@ def get_db():
         db.close()
 
 
+# Arbitrary application-wide id for the PostgreSQL advisory lock taken by init_db()
+INIT_DB_LOCK_ID = 4711
+
+
 def init_db():
-    """Initialize database tables."""
-    Base.metadata.create_all(bind=engine)
+    """
+    Create any missing tables.
+    
+    Every worker calls this on boot. One catalog query lists the existing tables and, once the
+    schema is in place, no DDL is issued. On PostgreSQL an advisory lock keeps workers that boot
+    together from racing on CREATE TABLE.
+    """
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": INIT_DB_LOCK_ID})
+        if set(inspect(conn).get_table_names()).issuperset(Base.metadata.tables):
+            return
+        Base.metadata.create_all(bind=conn)
+
+
+def warm_connection_pool():
+    """Open the pool's connections up front so the first requests skip connection setup."""
+    if IS_SQLITE:
+        return
+    connections = []
+    try:
+        # Hold every connection until all are open, otherwise the pool just reuses the first one
+        for _ in range(DB_POOL_SIZE):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning(f"Connection pool warm-up stopped after {len(connections)} connection(s): {e}")
+    finally:
+        for connection in connections:
+            connection.close()
@@ -9,22 +9,31 @@ backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
 
 from api import podcasts, episodes, tasks, users, notifications, import_csv, engineers, workflow
-from database import init_db
+from database import init_db, warm_connection_pool
 
 app = FastAPI(
     title="Podcast Task Manager API",
     description="Task management system for recording studio",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson encodes the datetime-heavy list responses much faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
-    init_db()
+    await run_in_threadpool(init_db)
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        from migrations import run_all
+        await run_in_threadpool(run_all)
+    await run_in_threadpool(warm_connection_pool)
 
 # CORS middleware for frontend
 from config import settings
@@ -32,17 +41,26 @@ from config import settings
 _raw = (settings.CORS_ORIGINS or "").strip()
 if _raw == "*" or not _raw:
     # Allow all origins when unset or explicitly "*" (credentials must be False with "*")
-    CORS_ORIGINS = ["*"]
+    CORS_ORIGINS = frozenset({"*"})
     CORS_CREDENTIALS = False
     CORS_ORIGIN_REGEX = None
 else:
-    CORS_ORIGINS = [o.strip() for o in _raw.split(",") if o.strip()]
+    # frozenset: Starlette checks origins with `in`, so this is a hash lookup, not a list scan
+    CORS_ORIGINS = frozenset(o.strip() for o in _raw.split(",") if o.strip())
     CORS_CREDENTIALS = True
     # Also allow any Render frontend (*.onrender.com) so previews and alternate frontend URLs work
     CORS_ORIGIN_REGEX = r"https://[a-z0-9-]+\.onrender\.com"
 
+
+class AllowListCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that tries the exact allow-list before the origin regex."""
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        return origin in self.allow_origins or super().is_allowed_origin(origin)
+
+
 app.add_middleware(
-    CORSMiddleware,
+    AllowListCORSMiddleware,
     allow_origins=CORS_ORIGINS,
     allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=CORS_CREDENTIALS,
@@ -50,6 +68,10 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],
 )
 
+# JSON lists compress ~10:1; level 5 gets most of that at a fraction of level 9's CPU.
+# Small bodies (health checks, single objects) are sent as-is.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(podcasts.router, prefix="/api/podcasts", tags=["podcasts"])
 app.include_router(episodes.router, prefix="/api/episodes", tags=["episodes"])
@@ -0,0 +1,44 @@
+"""
+Migration script to store episodes.client_approved_editing / client_approved_reels as SMALLINT
+ApprovalStatus codes instead of 'pending' / 'approved' / 'rejected' strings.
+Run once for existing databases: DATABASE_URL="..." .venv/bin/python migrate_approval_status_codes.py
+"""
+from sqlalchemy import inspect, text
+from database import engine
+from models import APPROVAL_STATUS_CODES
+from _migration_utils import add_columns_if_missing
+
+COLUMNS = ("client_approved_editing", "client_approved_reels")
+
+def convert_approval_columns(conn) -> list:
+    """Rewrite the text approval columns as SMALLINT codes. Returns the columns converted."""
+    types = {c["name"]: c["type"] for c in inspect(conn).get_columns("episodes")}
+    pending = [name for name in COLUMNS if name in types and types[name].python_type is str]
+    if not pending:
+        return []
+    
+    add_columns_if_missing(conn, "episodes", [(f"{name}_code", "SMALLINT DEFAULT 0") for name in pending])
+    # Unknown or missing values become pending, as the old string default was
+    cases = ", ".join(
+        f"{name}_code = CASE {name} "
+        + " ".join(f"WHEN '{status.value}' THEN {code}" for status, code in APPROVAL_STATUS_CODES.items())
+        + " ELSE 0 END"
+        for name in pending
+    )
+    conn.execute(text(f"UPDATE episodes SET {cases}"))
+    # DROP and RENAME cannot share one ALTER TABLE with each other on PostgreSQL, nor at all on SQLite
+    for name in pending:
+        conn.execute(text(f"ALTER TABLE episodes DROP COLUMN {name}"))
+        conn.execute(text(f"ALTER TABLE episodes RENAME COLUMN {name}_code TO {name}"))
+    return pending
+
+def migrate():
+    with engine.begin() as conn:
+        converted = convert_approval_columns(conn)
+    if converted:
+        print(f"Converted {', '.join(converted)} to SMALLINT approval codes.")
+    else:
+        print("Approval columns already use SMALLINT codes.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,50 @@
+"""
+Migration script to add composite indexes for the episode and task list filters, calendar sync and podcast name lookups, and drop the
+single-column indexes they make redundant (each is the leading column of a composite).
+Run once for existing databases: DATABASE_URL="..." .venv/bin/python migrate_composite_indexes.py
+
+On PostgreSQL indexes are built and dropped CONCURRENTLY so the tables stay writable; that
+cannot run inside a transaction, so each statement autocommits.
+"""
+from sqlalchemy import text
+from database import engine
+
+CREATE = [
+    ("ix_episodes_podcast_status", "episodes (podcast_id, status)"),
+    ("ix_tasks_assigned_status_due", "tasks (assigned_to, status, due_date)"),
+    # Calendar sync episode lookup by podcast, number and recording day
+    ("ix_episodes_podcast_number_date", "episodes (podcast_id, episode_number, recording_date)"),
+    # Case-insensitive podcast name / alias lookup
+    ("ix_podcasts_name_lower", "podcasts (lower(name))"),
+    ("ix_podcast_aliases_alias_lower", "podcast_aliases (lower(alias))"),
+    # Also created by migrate_db.py; ensured here because the engineer indexes below rely on them
+    ("ix_episodes_recording_engineer_date", "episodes (recording_engineer_id, recording_date)"),
+    ("ix_episodes_editing_engineer_date", "episodes (editing_engineer_id, recording_date)"),
+    ("ix_episodes_reels_engineer_date", "episodes (reels_engineer_id, recording_date)"),
+]
+
+# Each is the leading column of one of the composites above
+DROP = [
+    "ix_episodes_podcast_id",
+    "ix_episodes_recording_engineer_id",
+    "ix_episodes_editing_engineer_id",
+    "ix_episodes_reels_engineer_id",
+    "idx_episodes_recording_engineer",
+    "idx_episodes_editing_engineer",
+    "idx_episodes_reels_engineer",
+    "ix_tasks_assigned_to",
+]
+
+def migrate():
+    concurrently = "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Create first, so lookups are never left without an index
+        for name, target in CREATE:
+            conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {target}"))
+            print(f"Created index {name}")
+        for name in DROP:
+            conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {name}"))
+        print(f"Dropped redundant indexes: {', '.join(DROP)}")
+
+if __name__ == "__main__":
+    migrate()
@@ -2,84 +2,101 @@
 Database migration script to add new fields to existing database.
 Run this after updating models to add new columns.
 """
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from database import engine
+from models import OPEN_TASK_PREDICATE
+from _migration_utils import add_columns_if_missing, columns_by_table
+
+ENGINEER_DATE_INDEXES = [
+    ("ix_episodes_recording_engineer_date", "episodes(recording_engineer_id, recording_date)"),
+    ("ix_episodes_editing_engineer_date", "episodes(editing_engineer_id, recording_date)"),
+    ("ix_episodes_reels_engineer_date", "episodes(reels_engineer_id, recording_date)"),
+]
+
+# Rows copied per transaction by the owner_id -> assigned_to back-fill
+BACKFILL_BATCH_SIZE = 5000
+
+_NEXT_OWNED_TASKS = text(
+    "SELECT id FROM tasks WHERE owner_id IS NOT NULL AND assigned_to IS NULL AND id > :after "
+    "ORDER BY id LIMIT :batch_size"
+)
+_COPY_OWNER = text("UPDATE tasks SET assigned_to = owner_id WHERE id IN :ids").bindparams(
+    bindparam("ids", expanding=True)
+)
+
+
+def backfill_assigned_to(bind, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Copy tasks.owner_id into unset assigned_to, committing every batch_size rows. Returns rows copied.
+    
+    Batches walk the primary key, so each transaction holds its row locks only briefly and
+    user transactions can interleave with a long back-fill. Only rows still missing
+    assigned_to are touched, so an interrupted back-fill resumes where it stopped on rerun.
+    """
+    copied, after = 0, ""
+    while True:
+        with bind.begin() as conn:
+            ids = conn.execute(_NEXT_OWNED_TASKS, {"after": after, "batch_size": batch_size}).scalars().all()
+            if not ids:
+                return copied
+            conn.execute(_COPY_OWNER, {"ids": ids})
+        copied += len(ids)
+        after = ids[-1]
+
+
+def add_columns(conn) -> bool:
+    """Add missing episode/task columns. Returns whether tasks has an owner_id to copy into assigned_to."""
+    schema = columns_by_table(conn, ["episodes", "tasks"])
+    add_columns_if_missing(conn, "episodes", [
+        ("card_name", "VARCHAR"),
+        ("recording_engineer_id", "VARCHAR"),
+        ("editing_engineer_id", "VARCHAR"),
+        ("reels_engineer_id", "VARCHAR"),
+        ("reels_notes", "TEXT"),
+    ], existing=schema["episodes"])
+    
+    # Update tasks table - rename owner_id to assigned_to if needed
+    task_columns = schema["tasks"]
+    if 'assigned_to' not in task_columns:
+        conn.execute(text("ALTER TABLE tasks ADD COLUMN assigned_to VARCHAR"))
+        print("Added assigned_to column to tasks")
+    # Older schemas used owner_id; copy it over rather than rebuilding the table. Checked on
+    # every run, not just the one adding the column, so an interrupted back-fill is finished.
+    return 'owner_id' in task_columns
+
+
+def create_indexes():
+    """
+    Create the engineer/date and open-task indexes.
+    
+    Run after the column changes commit. On PostgreSQL they are built CONCURRENTLY so
+    episodes/tasks stay writable; that cannot run in a transaction block.
+    """
+    concurrently = "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Composite indexes for engineer + recording_date range queries (also serve plain engineer lookups)
+        for name, target in ENGINEER_DATE_INDEXES:
+            conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {target}"))
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS ix_episodes_recording_date_desc ON episodes(recording_date DESC NULLS LAST)"))
+        print("Created composite indexes for engineer/recording_date queries")
+        
+        # Partial indexes over open tasks for due/overdue queries
+        conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS ix_tasks_live_due_date ON tasks(due_date) WHERE {OPEN_TASK_PREDICATE}"))
+        conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS ix_tasks_live_type_due_date ON tasks(type, due_date) WHERE {OPEN_TASK_PREDICATE}"))
+        print("Created partial indexes for open task due dates")
+
 
 def migrate_database():
     """Add new columns to existing tables if they don't exist."""
-    with engine.connect() as conn:
-        # Check and add episode columns
-        try:
-            # Add card_name if it doesn't exist
-            conn.execute(text("ALTER TABLE episodes ADD COLUMN card_name VARCHAR"))
-            print("Added card_name column to episodes")
-        except Exception as e:
-            if "duplicate column" not in str(e).lower():
-                print(f"Error adding card_name: {e}")
-        
-        try:
-            # Add recording_engineer_id if it doesn't exist
-            conn.execute(text("ALTER TABLE episodes ADD COLUMN recording_engineer_id VARCHAR"))
-            print("Added recording_engineer_id column to episodes")
-        except Exception as e:
-            if "duplicate column" not in str(e).lower():
-                print(f"Error adding recording_engineer_id: {e}")
-        
-        try:
-            # Add editing_engineer_id if it doesn't exist
-            conn.execute(text("ALTER TABLE episodes ADD COLUMN editing_engineer_id VARCHAR"))
-            print("Added editing_engineer_id column to episodes")
-        except Exception as e:
-            if "duplicate column" not in str(e).lower():
-                print(f"Error adding editing_engineer_id: {e}")
-        
-        try:
-            # Add reels_engineer_id if it doesn't exist
-            conn.execute(text("ALTER TABLE episodes ADD COLUMN reels_engineer_id VARCHAR"))
-            print("Added reels_engineer_id column to episodes")
-        except Exception as e:
-            if "duplicate column" not in str(e).lower():
-                print(f"Error adding reels_engineer_id: {e}")
-        
-        try:
-            # Add reels_notes if it doesn't exist
-            conn.execute(text("ALTER TABLE episodes ADD COLUMN reels_notes TEXT"))
-            print("Added reels_notes column to episodes")
-        except Exception as e:
-            if "duplicate column" not in str(e).lower():
-                print(f"Error adding reels_notes: {e}")
-        
-        # Update tasks table - rename owner_id to assigned_to if needed
-        try:
-            # Check if owner_id exists and assigned_to doesn't
-            result = conn.execute(text("PRAGMA table_info(tasks)"))
-            columns = [row[1] for row in result]
-            
-            if 'owner_id' in columns and 'assigned_to' not in columns:
-                # SQLite doesn't support RENAME COLUMN directly, so we need to recreate
-                # For now, just add assigned_to and we'll migrate data
-                conn.execute(text("ALTER TABLE tasks ADD COLUMN assigned_to VARCHAR"))
-                # Copy data from owner_id to assigned_to
-                conn.execute(text("UPDATE tasks SET assigned_to = owner_id WHERE owner_id IS NOT NULL"))
-                print("Added assigned_to column and migrated data from owner_id")
-            elif 'assigned_to' not in columns:
-                conn.execute(text("ALTER TABLE tasks ADD COLUMN assigned_to VARCHAR"))
-                print("Added assigned_to column to tasks")
-        except Exception as e:
-            if "duplicate column" not in str(e).lower():
-                print(f"Error updating tasks table: {e}")
-        
-        # Add foreign key constraints if they don't exist (SQLite has limited FK support)
-        try:
-            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_episodes_recording_engineer ON episodes(recording_engineer_id)"))
-            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_episodes_editing_engineer ON episodes(editing_engineer_id)"))
-            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_episodes_reels_engineer ON episodes(reels_engineer_id)"))
-            print("Created indexes for engineer fields")
-        except Exception as e:
-            print(f"Error creating indexes: {e}")
-        
-        conn.commit()
-        print("\n✅ Database migration completed!")
+    # One transaction for the column changes: if any step fails, nothing is left half-applied
+    with engine.begin() as conn:
+        copy_owner = add_columns(conn)
+    if copy_owner:
+        # After the ALTERs commit, in short batches instead of one table-wide UPDATE
+        print(f"Migrated {backfill_assigned_to(engine)} tasks from owner_id to assigned_to")
+    create_indexes()
+    print("\n✅ Database migration completed!")
 
 if __name__ == "__main__":
     migrate_database()
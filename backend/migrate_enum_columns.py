@@ -0,0 +1,100 @@
+"""
+Migration script to store episode status, task type and task status as VARCHAR(32) with a
+CHECK constraint instead of PostgreSQL native enum types, holding the enum values
+('sent_to_client') instead of the member names ('SENT_TO_CLIENT') SQLAlchemy used to store.
+Run once for existing databases: DATABASE_URL="..." .venv/bin/python migrate_enum_columns.py
+
+Safe to re-run: on PostgreSQL it also replaces the CHECK constraints, so run it after adding an
+enum member (this replaces the old ALTER TYPE ... ADD VALUE migrations). SQLite already stores
+these columns as VARCHAR, so only the stored labels are rewritten there.
+"""
+from sqlalchemy import bindparam, text
+from database import engine
+from models import Episode, Task, TaskStatus
+
+# table -> enum columns, as declared in models.py
+ENUM_COLUMNS = {
+    "episodes": [Episode.__table__.c.status],
+    "tasks": [Task.__table__.c.type, Task.__table__.c.status],
+}
+
+# Partial indexes whose predicates compare status to stored labels
+PREDICATE_INDEXES = ("ix_tasks_live_due_date", "ix_tasks_live_type_due_date")
+
+def _native_enum_columns(conn, table: str) -> set:
+    rows = conn.execute(
+        text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND data_type = 'USER-DEFINED'"
+        ),
+        {"table": table},
+    )
+    return {row[0] for row in rows}
+
+def _stale_predicate_indexes(conn) -> list:
+    """Predicate indexes built against member names rather than the stored values."""
+    if conn.dialect.name == "postgresql":
+        query = "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND indexname IN :names"
+    else:
+        query = "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name IN :names"
+    rows = conn.execute(
+        text(query).bindparams(bindparam("names", expanding=True)), {"names": list(PREDICATE_INDEXES)}
+    )
+    return [name for name, definition in rows if f"'{TaskStatus.DONE.value}'" not in definition]
+
+def rewrite_labels(conn, table: str, column) -> int:
+    """Replace stored member names with the enum values. Returns rows changed."""
+    renames = {m.name: m.value for m in column.type.enum_class if m.name != m.value}
+    cases = " ".join(f"WHEN '{name}' THEN '{value}'" for name, value in renames.items())
+    names = ", ".join(f"'{name}'" for name in renames)
+    return conn.execute(text(
+        f"UPDATE {table} SET {column.name} = CASE {column.name} {cases} END WHERE {column.name} IN ({names})"
+    )).rowcount
+
+def convert_enum_columns(conn) -> list:
+    """Convert enum columns to VARCHAR holding enum values, refreshing CHECKs. Returns the columns changed."""
+    postgresql = conn.dialect.name == "postgresql"
+    # Rebuilt below once the stored labels match their predicates
+    for name in _stale_predicate_indexes(conn):
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    converted = []
+    for table, columns in ENUM_COLUMNS.items():
+        native = _native_enum_columns(conn, table) if postgresql else set()
+        to_convert = [c for c in columns if c.name in native]
+        if to_convert:
+            if table == "tasks":
+                for name in PREDICATE_INDEXES:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            # One ALTER TABLE: a single rewrite for all of the table's columns
+            conn.execute(text(
+                f"ALTER TABLE {table} "
+                + ", ".join(f"ALTER COLUMN {c.name} TYPE VARCHAR({c.type.length}) USING {c.name}::text" for c in to_convert)
+            ))
+        for column in columns:
+            # SQLite cannot alter constraints; its existing tables were created without them
+            if postgresql:
+                conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {column.type.name}"))
+            if rewrite_labels(conn, table, column) or column.name in native:
+                converted.append(f"{table}.{column.name}")
+            if postgresql:
+                labels = ", ".join(f"'{label}'" for label in column.type.enums)
+                conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {column.type.name} CHECK ({column.name} IN ({labels}))"))
+    for index in Task.__table__.indexes:
+        if index.name in PREDICATE_INDEXES:
+            index.create(conn, checkfirst=True)
+    if postgresql:
+        for columns in ENUM_COLUMNS.values():
+            for column in columns:
+                conn.execute(text(f"DROP TYPE IF EXISTS {column.type.name}"))
+    return converted
+
+def migrate():
+    with engine.begin() as conn:
+        converted = convert_enum_columns(conn)
+    if converted:
+        print(f"Converted {', '.join(converted)} to VARCHAR enum values.")
+    else:
+        print("Enum columns already store VARCHAR enum values.")
+
+if __name__ == "__main__":
+    migrate()
@@ -2,21 +2,16 @@
 Migration script to add tasks_time_allowance_days column to podcasts.
 Run once for existing databases: DATABASE_URL="..." .venv/bin/python migrate_podcast_tasks_allowance.py
 """
-from sqlalchemy import text
 from database import engine
+from _migration_utils import add_columns_if_missing
+
+def add_tasks_allowance_column(conn):
+    if not add_columns_if_missing(conn, "podcasts", [("tasks_time_allowance_days", "VARCHAR")]):
+        print("Column tasks_time_allowance_days already exists.")
 
 def migrate():
-    with engine.connect() as conn:
-        try:
-            conn.execute(text("ALTER TABLE podcasts ADD COLUMN tasks_time_allowance_days VARCHAR"))
-            conn.commit()
-            print("Added tasks_time_allowance_days column to podcasts table.")
-        except Exception as e:
-            err = str(e).lower()
-            if "duplicate column" in err or "already exists" in err or "duplicate column name" in err:
-                print("Column tasks_time_allowance_days already exists.")
-            else:
-                raise
+    with engine.begin() as conn:
+        add_tasks_allowance_column(conn)
 
 if __name__ == "__main__":
     migrate()
@@ -0,0 +1,26 @@
+"""
+Migration script to give every id column a server-side gen_random_uuid() default on PostgreSQL
+(new databases get it from models.py on create). No-op on SQLite.
+Run once for existing databases: DATABASE_URL="..." .venv/bin/python migrate_uuid_server_defaults.py
+"""
+from sqlalchemy import text
+from database import engine
+from models import UUID_PK_TABLES
+
+def set_uuid_defaults(conn):
+    # gen_random_uuid() is built in from PostgreSQL 13; older servers need pgcrypto
+    if int(conn.execute(text("SHOW server_version_num")).scalar()) < 130000:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
+    for table in UUID_PK_TABLES:
+        conn.execute(text(f"ALTER TABLE {table.name} ALTER COLUMN id SET DEFAULT gen_random_uuid()::text"))
+
+def migrate():
+    if engine.dialect.name != "postgresql":
+        print("Not PostgreSQL; ids are generated by the application.")
+        return
+    with engine.begin() as conn:
+        set_uuid_defaults(conn)
+    print(f"Set gen_random_uuid() id defaults on {', '.join(t.name for t in UUID_PK_TABLES)}.")
+
+if __name__ == "__main__":
+    migrate()
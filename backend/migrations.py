@@ -0,0 +1,48 @@
+"""
+Run every migration from one process.
+Each step is idempotent, so this is safe on every deploy (e.g. as Render's Release Command):
+  DATABASE_URL="..." .venv/bin/python migrations.py
+
+The schema steps share one connection and one transaction: the whole upgrade applies or none of
+it does, and importing SQLAlchemy and the models once is much cheaper than one Python process
+per script. Set RUN_MIGRATIONS_ON_STARTUP=true to run them from the app's startup event instead.
+"""
+import migrate_approval_status_codes
+import migrate_composite_indexes
+import migrate_db
+import migrate_enum_columns
+import migrate_memory_card
+import migrate_podcast_aliases
+import migrate_podcast_tasks_allowance
+import migrate_uuid_server_defaults
+import migrate_workflow_fields
+from database import engine, init_db
+
+# Transactional steps taking a connection. Order matters: later steps convert columns added by earlier ones.
+SCHEMA_STEPS = [
+    migrate_podcast_aliases.create_aliases_table,
+    migrate_workflow_fields.add_workflow_columns,
+    migrate_memory_card.add_memory_card_column,
+    migrate_podcast_tasks_allowance.add_tasks_allowance_column,
+    migrate_approval_status_codes.convert_approval_columns,
+    migrate_enum_columns.convert_enum_columns,
+]
+
+def run_all():
+    """Apply all migrations: schema changes in one transaction, then back-fills and index builds."""
+    with engine.begin() as conn:
+        copy_owner = migrate_db.add_columns(conn)
+        for step in SCHEMA_STEPS:
+            step(conn)
+        if conn.dialect.name == "postgresql":
+            migrate_uuid_server_defaults.set_uuid_defaults(conn)
+    # Batched and CONCURRENTLY steps commit on their own, so they run after the schema commits
+    if copy_owner:
+        print(f"Migrated {migrate_db.backfill_assigned_to(engine)} tasks from owner_id to assigned_to")
+    migrate_db.create_indexes()
+    migrate_composite_indexes.migrate()
+
+if __name__ == "__main__":
+    # Fresh databases need the tables before columns can be checked or converted
+    init_db()
+    run_all()
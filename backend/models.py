@@ -1,8 +1,9 @@
 """
 Database models for Podcast Task Manager.
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, DDL, String, DateTime, ForeignKey, Text, Index, SmallInteger, TypeDecorator, and_, event, func, literal, text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import get_history
 from datetime import datetime, timezone
 import uuid
 from enum import Enum
@@ -43,6 +44,42 @@ class TaskStatus(str, Enum):
     SKIPPED = "skipped"
 
 
+def _enum_column(enum_cls):
+    """
+    Enum stored as VARCHAR with a CHECK constraint, so new members need no ALTER TYPE migration.
+    Rows hold the member values ('sent_to_client'), not the Python names, on every dialect.
+    Older databases hold the names and cannot be read until migrations.py has run.
+    """
+    return SQLEnum(
+        enum_cls, native_enum=False, length=32, validate_strings=True, create_constraint=True,
+        values_callable=lambda members: [m.value for m in members],
+    )
+
+
+class ApprovalStatus(str, Enum):
+    """Client approval of an episode's editing or reels."""
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
+
+# Stored SMALLINT codes; never renumber, existing rows depend on them
+APPROVAL_STATUS_CODES = {ApprovalStatus.PENDING: 0, ApprovalStatus.APPROVED: 1, ApprovalStatus.REJECTED: 2}
+_APPROVAL_STATUS_BY_CODE = {code: status for status, code in APPROVAL_STATUS_CODES.items()}
+
+
+class ApprovalStatusType(TypeDecorator):
+    """ApprovalStatus stored as a SMALLINT code instead of a string."""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else APPROVAL_STATUS_CODES[ApprovalStatus(value)]
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else _APPROVAL_STATUS_BY_CODE[value]
+
+
 class PodcastAlias(Base):
     """Alternative name for a podcast (e.g. for matching Google Calendar event titles)."""
     __tablename__ = "podcast_aliases"
@@ -53,6 +90,9 @@ class PodcastAlias(Base):
 
     podcast = relationship("Podcast", back_populates="aliases")
 
+    # Case-insensitive alias lookup (find_podcast_by_name_or_alias)
+    __table_args__ = (Index("ix_podcast_aliases_alias_lower", func.lower(alias)),)
+
 
 class Podcast(Base):
     """Podcast model."""
@@ -67,7 +107,11 @@ class Podcast(Base):
     updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
     episodes = relationship("Episode", back_populates="podcast", cascade="all, delete-orphan")
-    aliases = relationship("PodcastAlias", back_populates="podcast", cascade="all, delete-orphan")
+    # Aliases are serialized with nearly every podcast; selectin loads them for all podcasts in one IN query
+    aliases = relationship("PodcastAlias", back_populates="podcast", cascade="all, delete-orphan", lazy="selectin")
+
+    # Case-insensitive name lookup (find_podcast_by_name_or_alias)
+    __table_args__ = (Index("ix_podcasts_name_lower", func.lower(name)),)
 
 
 class Episode(Base):
@@ -75,24 +119,24 @@ class Episode(Base):
     __tablename__ = "episodes"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    podcast_id = Column(String, ForeignKey("podcasts.id"), nullable=False, index=True)
+    podcast_id = Column(String, ForeignKey("podcasts.id"), nullable=False)
     episode_number = Column(String, nullable=True)
     recording_date = Column(DateTime, nullable=True, index=True)
     studio = Column(String, nullable=True)
     guest_names = Column(Text, nullable=True)
-    status = Column(SQLEnum(EpisodeStatus), default=EpisodeStatus.NOT_STARTED, index=True)
+    status = Column(_enum_column(EpisodeStatus), default=EpisodeStatus.NOT_STARTED, index=True)
     episode_notes = Column(Text, nullable=True)
     drive_link = Column(String, nullable=True)
     backup_deletion_date = Column(DateTime, nullable=True)
     card_name = Column(String, nullable=True, index=True)
     memory_card = Column(String, nullable=True)  # Which memory card stores recordings (e.g. "kingstone 1", "WD 500G")
-    recording_engineer_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
-    editing_engineer_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
-    reels_engineer_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
+    recording_engineer_id = Column(String, ForeignKey("users.id"), nullable=True)
+    editing_engineer_id = Column(String, ForeignKey("users.id"), nullable=True)
+    reels_engineer_id = Column(String, ForeignKey("users.id"), nullable=True)
     reels_notes = Column(Text, nullable=True)
     studio_settings_override = Column(Text, nullable=True)  # Override default studio settings for this episode
-    client_approved_editing = Column(String, default="pending")  # "pending", "approved", "rejected"
-    client_approved_reels = Column(String, default="pending")  # "pending", "approved", "rejected"
+    client_approved_editing = Column(ApprovalStatusType, default=ApprovalStatus.PENDING)
+    client_approved_reels = Column(ApprovalStatusType, default=ApprovalStatus.PENDING)
     created_at = Column(DateTime, default=utcnow)
     updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
@@ -102,6 +146,20 @@ class Episode(Base):
     reels_engineer = relationship("User", foreign_keys=[reels_engineer_id], backref="episodes_as_reels_engineer")
     tasks = relationship("Task", back_populates="episode", cascade="all, delete-orphan")
 
+    # podcast_id and the engineer FKs are indexed through the composites below (leading column)
+    __table_args__ = (
+        # Episode list filtered by podcast and status
+        Index("ix_episodes_podcast_status", "podcast_id", "status"),
+        # Calendar sync: existing episode by podcast, number and recording day
+        Index("ix_episodes_podcast_number_date", "podcast_id", "episode_number", "recording_date"),
+        # Engineer + date range lookups (upcoming recordings per engineer)
+        Index("ix_episodes_recording_engineer_date", "recording_engineer_id", "recording_date"),
+        Index("ix_episodes_editing_engineer_date", "editing_engineer_id", "recording_date"),
+        Index("ix_episodes_reels_engineer_date", "reels_engineer_id", "recording_date"),
+        # Matches the episode list ordering; SQLite does not accept NULLS LAST in index definitions
+        Index("ix_episodes_recording_date_desc", text("recording_date DESC NULLS LAST")).ddl_if(dialect="postgresql"),
+    )
+
 
 class User(Base):
     """User model."""
@@ -117,15 +175,19 @@ class User(Base):
     # Relationships are defined via foreign_keys in Episode and Task models
 
 
+# Enum columns store member values; matches the status filters used for open tasks
+OPEN_TASK_PREDICATE = "status <> 'done' AND status <> 'skipped'"
+
+
 class Task(Base):
     """Task model."""
     __tablename__ = "tasks"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     episode_id = Column(String, ForeignKey("episodes.id"), nullable=False, index=True)
-    type = Column(SQLEnum(TaskType), nullable=False, index=True)
-    status = Column(SQLEnum(TaskStatus), default=TaskStatus.NOT_STARTED, index=True)
-    assigned_to = Column(String, ForeignKey("users.id"), nullable=True, index=True)
+    type = Column(_enum_column(TaskType), nullable=False, index=True)
+    status = Column(_enum_column(TaskStatus), default=TaskStatus.NOT_STARTED, index=True)
+    assigned_to = Column(String, ForeignKey("users.id"), nullable=True)
     due_date = Column(DateTime, nullable=True, index=True)
     completed_at = Column(DateTime, nullable=True)
     notes = Column(Text, nullable=True)
@@ -134,3 +196,49 @@ class Task(Base):
 
     episode = relationship("Episode", back_populates="tasks")
     assigned_user = relationship("User", foreign_keys=[assigned_to], backref="assigned_tasks")
+
+    __table_args__ = (
+        # Tasks per assignee filtered by status and ordered by due date (also serves assigned_to lookups)
+        Index("ix_tasks_assigned_status_due", "assigned_to", "status", "due_date"),
+        # Partial indexes over open tasks only, for the due/overdue notification queries
+        # (status != DONE AND status != SKIPPED plus a due_date range) and the studio-prep filter
+        Index("ix_tasks_live_due_date", "due_date",
+              postgresql_where=text(OPEN_TASK_PREDICATE), sqlite_where=text(OPEN_TASK_PREDICATE)),
+        Index("ix_tasks_live_type_due_date", "type", "due_date",
+              postgresql_where=text(OPEN_TASK_PREDICATE), sqlite_where=text(OPEN_TASK_PREDICATE)),
+    )
+
+
+# Open-task filter for queries. Statuses render as inline literals so the query predicate
+# matches OPEN_TASK_PREDICATE and the planner can use the partial indexes above.
+OPEN_TASK_FILTER = and_(
+    Task.status != literal(TaskStatus.DONE, Task.status.type, literal_execute=True),
+    Task.status != literal(TaskStatus.SKIPPED, Task.status.type, literal_execute=True),
+)
+
+
+@event.listens_for(Task, "before_update")
+def _set_completed_at(mapper, connection, target):
+    """Stamp completed_at when a task moves to DONE and clear it when it leaves DONE."""
+    history = get_history(target, "status")
+    if not history.has_changes():
+        return
+    old_status = history.deleted[0] if history.deleted else None
+    if target.status == TaskStatus.DONE and old_status != TaskStatus.DONE:
+        target.completed_at = utcnow()
+    elif target.status != TaskStatus.DONE and old_status == TaskStatus.DONE:
+        target.completed_at = None
+
+
+# PostgreSQL also generates ids itself, so rows inserted outside the ORM (SQL scripts, Core
+# inserts that omit id) get one. The Python default stays: SQLite has no UUID function and
+# ORM objects need their id before flush.
+UUID_PK_TABLES = (PodcastAlias.__table__, Podcast.__table__, Episode.__table__, User.__table__, Task.__table__)
+_PG_UUID_DEFAULT = DDL("ALTER TABLE %(table)s ALTER COLUMN id SET DEFAULT gen_random_uuid()::text").execute_if(dialect="postgresql")
+# gen_random_uuid() is built in from PostgreSQL 13; older servers need pgcrypto
+_PGCRYPTO = DDL("CREATE EXTENSION IF NOT EXISTS pgcrypto").execute_if(
+    dialect="postgresql", callable_=lambda ddl, target, bind, dialect, **kw: dialect.server_version_info < (13,)
+)
+for _table in UUID_PK_TABLES:
+    event.listen(_table, "before_create", _PGCRYPTO)
+    event.listen(_table, "after_create", _PG_UUID_DEFAULT)
@@ -1,10 +1,10 @@
 """
 Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, Field, field_serializer
-from typing import Optional, List, Any
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List
 from datetime import datetime
-from models import EpisodeStatus, TaskType, TaskStatus
+from models import ApprovalStatus, EpisodeStatus, TaskType, TaskStatus
 
 
 class PodcastBase(BaseModel):
@@ -29,16 +29,19 @@ class Podcast(PodcastBase):
     id: str
     created_at: datetime
     updated_at: datetime
-    aliases: Optional[List[Any]] = None  # From relationship: list of PodcastAlias or list of str
+    aliases: List[str] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
-    @field_serializer("aliases")
-    def serialize_aliases(self, v):
-        if v is None:
+    @field_validator("aliases", mode="before")
+    @classmethod
+    def alias_names(cls, v):
+        """PodcastAlias rows from the relationship become their alias strings once, on load."""
+        if not v:
             return []
-        return [a.alias if hasattr(a, "alias") else a for a in v]
+        if isinstance(v[0], str):
+            return v
+        return [a.alias for a in v]
 
 
 class PodcastAliasCreate(BaseModel):
@@ -50,8 +53,7 @@ class PodcastAliasOut(BaseModel):
     podcast_id: str
     alias: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EpisodeBase(BaseModel):
@@ -71,8 +73,8 @@ class EpisodeBase(BaseModel):
     reels_engineer_id: Optional[str] = None
     reels_notes: Optional[str] = None
     studio_settings_override: Optional[str] = None
-    client_approved_editing: Optional[str] = "pending"
-    client_approved_reels: Optional[str] = "pending"
+    client_approved_editing: Optional[ApprovalStatus] = ApprovalStatus.PENDING
+    client_approved_reels: Optional[ApprovalStatus] = ApprovalStatus.PENDING
 
 
 class EpisodeCreate(EpisodeBase):
@@ -96,8 +98,8 @@ class EpisodeUpdate(BaseModel):
     reels_engineer_id: Optional[str] = None
     reels_notes: Optional[str] = None
     studio_settings_override: Optional[str] = None
-    client_approved_editing: Optional[str] = None
-    client_approved_reels: Optional[str] = None
+    client_approved_editing: Optional[ApprovalStatus] = None
+    client_approved_reels: Optional[ApprovalStatus] = None
 
 
 class Episode(EpisodeBase):
@@ -105,8 +107,7 @@ class Episode(EpisodeBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserBase(BaseModel):
@@ -130,8 +131,7 @@ class User(UserBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EpisodeWithPodcast(Episode):
@@ -140,8 +140,7 @@ class EpisodeWithPodcast(Episode):
     editing_engineer: Optional[User] = None
     reels_engineer: Optional[User] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TaskBase(BaseModel):
@@ -173,16 +172,25 @@ class Task(TaskBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TaskWithEpisode(Task):
     episode: Optional[EpisodeWithPodcast] = None
     assigned_user: Optional[User] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskCursor(BaseModel):
+    """Keyset position after the last task of a page; pass back as query params."""
+    after_due_date: Optional[datetime] = None
+    after_id: str
+
+
+class TaskPage(BaseModel):
+    items: List[TaskWithEpisode]
+    next_cursor: Optional[TaskCursor] = None
 
 
 class NotificationItem(BaseModel):
@@ -195,5 +203,4 @@ class NotificationItem(BaseModel):
     task_id: Optional[str] = None
     priority: str = "normal"  # "low", "normal", "high", "urgent"
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
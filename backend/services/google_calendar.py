@@ -1,35 +1,54 @@
 """
 Google Calendar integration service.
 """
+import importlib.util
 import json
 import logging
 import re
-from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any
+import threading
+from datetime import date, datetime, time, timezone, timedelta
+from itertools import chain
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import and_, case, func, or_, select, tuple_, union_all
 
 from models import Episode, Podcast, PodcastAlias, EpisodeStatus
 from config import settings
+from cache import invalidate
 
 logger = logging.getLogger(__name__)
 
-# Try to import Google Calendar API, but handle gracefully if not available
+# Check the Google Calendar API libraries are installed, but handle gracefully if not available.
+# They are imported where used: loading them costs ~100ms of startup even with the calendar disabled.
 try:
-    from google.oauth2 import service_account
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
-    GOOGLE_API_AVAILABLE = True
+    GOOGLE_API_AVAILABLE = all(importlib.util.find_spec(name) for name in ("google.oauth2", "googleapiclient"))
 except ImportError:
     GOOGLE_API_AVAILABLE = False
+if not GOOGLE_API_AVAILABLE:
     logger.warning("Google Calendar API libraries not installed. Calendar integration disabled.")
 
 
+# Thread -> (cache key, built service). Sync endpoints run in the threadpool and the
+# service's httplib2 connection is not thread-safe, so each worker thread keeps its own.
+_service_cache = threading.local()
+# Part of the cache key; bumped by invalidate_calendar_service to drop every thread's entry
+_service_generation = 0
+
+
+def invalidate_calendar_service():
+    """Rebuild the Calendar service on next use in every thread (e.g. after rotating the key file)."""
+    global _service_generation
+    _service_generation += 1
+
+
 def get_calendar_service():
     """
     Authenticate and return Google Calendar service object.
     
+    The service is built once per thread and reused until the credentials settings change
+    or invalidate_calendar_service is called.
+    
     Returns:
         Google Calendar API service object or None if unavailable
     """
@@ -40,6 +59,22 @@ def get_calendar_service():
     if not settings.GOOGLE_CALENDAR_ENABLED:
         logger.debug("Google Calendar integration is disabled")
         return None
+    
+    key = (_service_generation, settings.GOOGLE_CREDENTIALS_JSON, settings.GOOGLE_CREDENTIALS_PATH)
+    entry = getattr(_service_cache, "entry", None)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    service = _build_calendar_service()
+    # Failures are not cached: the next call retries
+    if service is not None:
+        _service_cache.entry = (key, service)
+    return service
+
+
+def _build_calendar_service():
+    """Load service-account credentials and build the Calendar API client, or None on failure."""
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
 
     credentials = None
     if settings.GOOGLE_CREDENTIALS_JSON:
@@ -70,7 +105,7 @@ def get_calendar_service():
         return None
 
     try:
-        service = build('calendar', 'v3', credentials=credentials)
+        service = build('calendar', 'v3', credentials=credentials, cache_discovery=False)
         logger.info("Google Calendar service initialized successfully")
         return service
     except Exception as e:
@@ -78,6 +113,58 @@ def get_calendar_service():
         return None
 
 
+# Episode-number forms for parse_event_title (see the comments there) in one pattern, so the
+# title is scanned once. The lookahead tests every position, as separate per-form scans would:
+# "פרק 33" and "33 ו-34" overlap but both count. The forms cannot match at the same position,
+# and number forms only start at the first digit of a number, as a leftmost scan would.
+# The leading character class skips positions where no form can start without trying them.
+_EPISODE_NUMBER_RE = re.compile(
+    r'(?=[\dפ#e])(?=(?<!\d)(?:'
+    r'(?P<multi>\d+)\s*(?:&|and|,|/)\s*(?P<multi_2>\d+)'
+    r'|(?P<range>\d+)\s*-\s*(?P<range_2>\d+)'
+    r'|(?P<heb_and>\d+)\s*ו-?\s*(?P<heb_and_2>\d+)'
+    r')|(?P<label_prefix>(?:פרק|#|episode|ep)\s*)(?P<label>\d+))',
+    re.IGNORECASE,
+)
+# Every episode-number form needs a digit (same \d as the forms); titles without one skip them
+_DIGIT_RE = re.compile(r'\d')
+# Episode-number suffixes stripped from the title to get the podcast name
+_STRIP_SUFFIXES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\s*[-–]\s*\d+(\s*[&,/\-]\s*\d+)*\s*$',
+    r'\s+פרק\s+\d+(\s*ו-?\s*\d+)*\s*$',
+    r'\s*#\d+(\s*#\d+)*\s*$',
+    r'\s+episode\s+\d+.*$',
+    r'\s+ep\s+\d+.*$',
+    r'\s+\d+(\s*[&,/\-]\s*\d+)*\s*$',
+))
+# Guest-name lines in an event description, in priority order: the first pattern that
+# matches anywhere wins, not the leftmost match
+_GUEST_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'אורח[ים]?[:\s]+([^\n]+)',
+    r'guest[s]?[:\s]+([^\n]+)',
+    r'with\s+([^\n]+)',
+))
+
+
+def _tail_episode_number(title: str) -> Optional[str]:
+    """
+    Trailing number after a dash or whitespace (" - 33", "-33", " 33"), else None.
+    
+    Walks back from the end of the title instead of searching regexes anchored at $,
+    which retry from every position. isdecimal() matches the same digits as \\d.
+    """
+    stripped = title.rstrip()
+    start = len(stripped)
+    while start and stripped[start - 1].isdecimal():
+        start -= 1
+    if start == len(stripped):
+        return None
+    before = stripped[:start]
+    if before[-1:].isspace() or before.rstrip()[-1:] in ('-', '–'):
+        return stripped[start:]
+    return None
+
+
 def parse_event_title(title: str) -> Dict[str, Any]:
     """
     Parse calendar event title to extract podcast name and episode number(s).
@@ -97,20 +184,35 @@ def parse_event_title(title: str) -> Dict[str, Any]:
     
     if not title:
         return result
+    if not _DIGIT_RE.search(title):
+        result['podcast_name'] = title.strip() or None
+        return result
     
     # Collect all episode numbers (order preserved, unique)
     seen: set = set()
     episode_numbers: List[str] = []
     
+    # One scan collects each form's matches as (first group, number) pairs. Like separate
+    # finditer calls, a form's matches do not overlap each other; forms are then applied in
+    # their precedence order. Each form's second group closes last, so lastindex identifies it.
+    multi, ranges, heb_and, labels = by_form = ([], [], [], [])
+    form_ends = [0, 0, 0, 0]
+    for m in _EPISODE_NUMBER_RE.finditer(title):
+        last = m.lastindex
+        form = last // 2 - 1
+        if m.start(last - 1) >= form_ends[form]:
+            form_ends[form] = m.end(last)
+            by_form[form].append(m.group(last - 1, last))
+    
     # Multi: "33 & 34", "33 and 34", "33, 34", "33 / 34"
-    for m in re.finditer(r'(\d+)\s*(?:&|and|,|/)\s*(\d+)', title, re.IGNORECASE):
-        for g in (m.group(1), m.group(2)):
+    for numbers in multi:
+        for g in numbers:
             if g not in seen:
                 seen.add(g)
                 episode_numbers.append(g)
     # Range: "33-34" (two episodes)
-    for m in re.finditer(r'(\d+)\s*-\s*(\d+)', title):
-        low, high = int(m.group(1)), int(m.group(2))
+    for first, second in ranges:
+        low, high = int(first), int(second)
         if low <= high and (high - low) <= 10:  # sane range
             for n in range(low, high + 1):
                 g = str(n)
@@ -118,46 +220,33 @@ def parse_event_title(title: str) -> Dict[str, Any]:
                     seen.add(g)
                     episode_numbers.append(g)
         elif low == high or (high - low) == 1:
-            for g in (m.group(1), m.group(2)):
+            for g in (first, second):
                 if g not in seen:
                     seen.add(g)
                     episode_numbers.append(g)
     # Hebrew "and": "פרק 33 ו-34" or "33 ו-34"
-    for m in re.finditer(r'(\d+)\s*ו-?\s*(\d+)', title):
-        for g in (m.group(1), m.group(2)):
+    for numbers in heb_and:
+        for g in numbers:
             if g not in seen:
                 seen.add(g)
                 episode_numbers.append(g)
     # Explicit labels: "פרק 33", "#33", "episode 33", "ep 33"
-    for m in re.finditer(r'(?:פרק|#|episode|ep)\s*(\d+)', title, re.IGNORECASE):
-        g = m.group(1)
+    for _, g in labels:
         if g not in seen:
             seen.add(g)
             episode_numbers.append(g)
     # Single at end: " - 33" or " 33"
     if not episode_numbers:
-        for pattern in [r'[-–]\s*(\d+)\s*$', r'\s+(\d+)\s*$']:
-            match = re.search(pattern, title)
-            if match:
-                g = match.group(1)
-                if g not in seen:
-                    seen.add(g)
-                    episode_numbers.append(g)
-                break
+        g = _tail_episode_number(title)
+        if g:
+            episode_numbers.append(g)
     
     # Podcast name: strip episode-number parts from title
     if episode_numbers:
         # Remove common episode-number suffixes (last occurrence and everything after)
         name = title
-        for suf in [
-            r'\s*[-–]\s*\d+(\s*[&,/\-]\s*\d+)*\s*$',
-            r'\s+פרק\s+\d+(\s*ו-?\s*\d+)*\s*$',
-            r'\s*#\d+(\s*#\d+)*\s*$',
-            r'\s+episode\s+\d+.*$',
-            r'\s+ep\s+\d+.*$',
-            r'\s+\d+(\s*[&,/\-]\s*\d+)*\s*$',
-        ]:
-            name = re.sub(suf, '', name, flags=re.IGNORECASE)
+        for suffix in _STRIP_SUFFIXES:
+            name = suffix.sub('', name)
         podcast_name = name.strip()
     else:
         podcast_name = title.strip()
@@ -200,15 +289,11 @@ def extract_episode_data_from_event(event: Dict[str, Any]) -> Dict[str, Any]:
     # Extract recording date/time
     start = event.get('start', {})
     if 'dateTime' in start:
-        # Full datetime
-        data['recording_date'] = datetime.fromisoformat(
-            start['dateTime'].replace('Z', '+00:00')
-        )
+        # Full RFC 3339 datetime; fromisoformat only accepts the 'Z' suffix from Python 3.11
+        data['recording_date'] = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00'))
     elif 'date' in start:
-        # All-day event
-        data['recording_date'] = datetime.fromisoformat(
-            start['date'] + 'T00:00:00+00:00'
-        )
+        # All-day event: midnight UTC
+        data['recording_date'] = datetime.combine(date.fromisoformat(start['date']), time.min, tzinfo=timezone.utc)
     
     # Extract location (studio)
     data['studio'] = event.get('location')
@@ -218,13 +303,8 @@ def extract_episode_data_from_event(event: Dict[str, Any]) -> Dict[str, Any]:
     data['notes'] = description
     
     # Try to extract guest names from description
-    guest_patterns = [
-        r'אורח[ים]?[:\s]+([^\n]+)',
-        r'guest[s]?[:\s]+([^\n]+)',
-        r'with\s+([^\n]+)',
-    ]
-    for pattern in guest_patterns:
-        match = re.search(pattern, description, re.IGNORECASE)
+    for pattern in _GUEST_RES:
+        match = pattern.search(description)
         if match:
             data['guest_names'] = match.group(1).strip()
             break
@@ -247,56 +327,64 @@ def extract_episode_data_from_event(event: Dict[str, Any]) -> Dict[str, Any]:
 
 def find_podcast_by_name_or_alias(db: Session, podcast_name: str) -> Optional[Podcast]:
     """
-    Find a podcast by exact name or by alias (e.g. calendar event title).
+    Find a podcast by name or by alias (e.g. calendar event title), ignoring case.
+    
+    One query; when several match, an exact name beats a case-insensitive name, which
+    beats an exact alias, then a case-insensitive alias.
     """
     if not podcast_name:
         return None
     name = podcast_name.strip()
-    # Exact name match
-    podcast = db.query(Podcast).filter(Podcast.name == name).first()
-    if podcast:
-        return podcast
-    # Case-insensitive name match
-    podcast = db.query(Podcast).filter(Podcast.name.ilike(name)).first()
-    if podcast:
-        return podcast
-    # Alias match (exact then case-insensitive)
-    alias_row = db.query(PodcastAlias).filter(PodcastAlias.alias == name).first()
-    if alias_row:
-        return db.query(Podcast).filter(Podcast.id == alias_row.podcast_id).first()
-    alias_row = db.query(PodcastAlias).filter(PodcastAlias.alias.ilike(name)).first()
-    if alias_row:
-        return db.query(Podcast).filter(Podcast.id == alias_row.podcast_id).first()
-    return None
+    # Each branch can use its lower() index; rank orders the matches as described above
+    matches = union_all(
+        select(Podcast.id.label("podcast_id"), case((Podcast.name == name, 0), else_=1).label("rank"))
+        .where(func.lower(Podcast.name) == func.lower(name)),
+        select(PodcastAlias.podcast_id, case((PodcastAlias.alias == name, 2), else_=3))
+        .where(func.lower(PodcastAlias.alias) == func.lower(name)),
+    ).subquery()
+    return db.query(Podcast).join(matches, matches.c.podcast_id == Podcast.id).order_by(matches.c.rank).first()
+
+
+def load_podcast_index(db: Session) -> List[Tuple[str, int, str]]:
+    """
+    (lowercased name or alias, its length, podcast_id) for matching event titles.
+    
+    Syncs load this once and pass it to find_podcast_from_event_title for every event,
+    instead of reading both tables per event. Longest first; on equal length podcast
+    names come before aliases.
+    """
+    # Plain column tuples, streamed: no ORM instances or identity-map entries for the scan
+    names = db.query(Podcast.name, Podcast.id).filter(Podcast.name.isnot(None)).yield_per(500)
+    aliases = db.query(PodcastAlias.alias, PodcastAlias.podcast_id).filter(PodcastAlias.alias.isnot(None)).yield_per(500)
+    index = [(text.strip().lower(), len(text.strip()), podcast_id) for text, podcast_id in chain(names, aliases) if text.strip()]
+    # Stable sort keeps names ahead of aliases of the same length
+    index.sort(key=lambda entry: -entry[1])
+    return index
 
 
-def find_podcast_from_event_title(db: Session, event_title: str) -> Optional[Podcast]:
+def find_podcast_from_event_title(
+    db: Session,
+    event_title: str,
+    podcast_index: Optional[List[Tuple[str, int, str]]] = None,
+) -> Optional[Podcast]:
     """
     Find a podcast from a calendar event title (e.g. "Some Podcast - Givon Room").
-    Tries exact name/alias match first, then finds a podcast whose name or alias
-    appears in the title (longest match wins so "Some Podcast" beats "Some").
+    Finds a podcast whose name or alias appears in the title, case-insensitively (longest
+    match wins so "Some Podcast" beats "Some"; a name or alias equal to the whole title is
+    always the longest). Pass podcast_index from load_podcast_index when matching many titles.
     """
     if not event_title:
         return None
-    title = event_title.strip()
-    # 1. Try exact match with full title
-    podcast = find_podcast_by_name_or_alias(db, title)
-    if podcast:
-        return podcast
-    # 2. Find podcasts/aliases that appear as a substring in the title (case-insensitive)
-    title_lower = title.lower()
-    candidates = []  # (podcast_id, match_length)
-    for p in db.query(Podcast).all():
-        if p.name and p.name.strip().lower() in title_lower:
-            candidates.append((p.id, len(p.name.strip())))
-    for a in db.query(PodcastAlias).all():
-        if a.alias and a.alias.strip().lower() in title_lower:
-            candidates.append((a.podcast_id, len(a.alias.strip())))
-    if not candidates:
-        return None
-    # Longest match wins (avoids "The" matching instead of "The Show")
-    best_podcast_id = max(candidates, key=lambda x: x[1])[0]
-    return db.query(Podcast).filter(Podcast.id == best_podcast_id).first()
+    title_lower = event_title.strip().lower()
+    if podcast_index is None:
+        podcast_index = load_podcast_index(db)
+    # The index is sorted longest first, so the first hit is the longest match
+    for needle, _, podcast_id in podcast_index:
+        if needle in title_lower:
+            # Identity-map lookup: events of the same podcast reuse the loaded object.
+            # The sync only reads its columns; relationship access raises instead of lazy-loading.
+            return db.get(Podcast, podcast_id, options=[raiseload('*')])
+    return None
 
 
 def find_or_create_podcast(db: Session, podcast_name: str) -> Optional[Podcast]:
@@ -325,6 +413,7 @@ def find_or_create_podcast(db: Session, podcast_name: str) -> Optional[Podcast]:
     try:
         db.commit()
         db.refresh(podcast)
+        invalidate("podcasts")
         logger.info(f"Created podcast {podcast.id}: {podcast_name}")
         return podcast
     except Exception as e:
@@ -333,6 +422,123 @@ def find_or_create_podcast(db: Session, podcast_name: str) -> Optional[Podcast]:
         return None
 
 
+def plan_episode_change(
+    existing: Optional[Episode],
+    event_data: Dict[str, Any],
+    podcast: Podcast,
+    episode_number: Optional[str]
+) -> Episode:
+    """
+    Apply calendar event data to an existing episode, or build a new one (not added to a session).
+    Studio, guests and notes are only filled in when the episode has none yet. The episode
+    number is passed separately: one event can hold several back-to-back episodes.
+    """
+    if existing is None:
+        logger.info(f"Creating new episode for podcast {podcast.name}")
+        return Episode(
+            podcast_id=podcast.id,
+            episode_number=episode_number,
+            recording_date=event_data.get('recording_date'),
+            studio=event_data.get('studio'),
+            guest_names=event_data.get('guest_names'),
+            episode_notes=event_data.get('notes'),
+            status=EpisodeStatus.NOT_STARTED
+        )
+    logger.info(f"Updating existing episode {existing.id} from calendar event")
+    if event_data.get('recording_date'):
+        existing.recording_date = event_data['recording_date']
+    if event_data.get('studio') and not existing.studio:
+        existing.studio = event_data['studio']
+    if event_data.get('guest_names') and not existing.guest_names:
+        existing.guest_names = event_data['guest_names']
+    if event_data.get('notes') and not existing.episode_notes:
+        existing.episode_notes = event_data['notes']
+    return existing
+
+
+def _as_stored(value: datetime, dialect: str) -> datetime:
+    """
+    Naive datetime as a DateTime column compares it: PostgreSQL converts aware values to
+    the (UTC) session time zone, SQLite drops the offset.
+    """
+    if value.tzinfo is None:
+        return value
+    if dialect == 'postgresql':
+        value = value.astimezone(timezone.utc)
+    return value.replace(tzinfo=None)
+
+
+def apply_episode_changes(
+    db: Session,
+    changes: List[Tuple[Dict[str, Any], Podcast, Optional[str]]]
+) -> List[Episode]:
+    """
+    Create or update one episode per (event_data, podcast, episode_number) change.
+    
+    An existing episode matches on podcast, episode number and recording day. All candidates
+    are fetched with one query and everything is saved in one commit.
+    
+    Returns:
+        Saved episodes in the order of changes, or [] if saving fails (the session is rolled back)
+    """
+    dialect = db.get_bind().dialect.name
+    # (podcast_id, episode_number) -> [(stored day start, stored day end)] per change
+    days = {}
+    for event_data, podcast, episode_number in changes:
+        if episode_number and event_data.get('recording_date'):
+            day_start = event_data['recording_date'].replace(hour=0, minute=0, second=0, microsecond=0)
+            days.setdefault((podcast.id, episode_number), []).append(
+                (_as_stored(day_start, dialect), _as_stored(day_start + timedelta(days=1), dialect))
+            )
+
+    # (podcast_id, episode_number) -> [(stored recording date, episode)]
+    candidates = {}
+    if days:
+        ranges = [r for key_ranges in days.values() for r in key_ranges]
+        rows = db.query(Episode).filter(
+            # Row-value IN: only the wanted pairs, not every podcast x number combination
+            tuple_(Episode.podcast_id, Episode.episode_number).in_(list(days)),
+            Episode.recording_date >= min(start for start, _ in ranges),
+            Episode.recording_date < max(end for _, end in ranges),
+        ).options(raiseload('*')).all()
+        for episode in rows:
+            candidates.setdefault((episode.podcast_id, episode.episode_number), []).append((episode.recording_date, episode))
+
+    episodes = []
+    for event_data, podcast, episode_number in changes:
+        existing = None
+        key = (podcast.id, episode_number)
+        # Only changes that contributed a day range above may consume one
+        dated = bool(episode_number and event_data.get('recording_date'))
+        if dated:
+            day_start, day_end = days[key].pop(0)
+            existing = next((e for stored, e in candidates.get(key, []) if day_start <= stored < day_end), None)
+        episode = plan_episode_change(existing, event_data, podcast, episode_number)
+        if existing is None:
+            db.add(episode)
+            if dated:
+                # Later events for the same episode and day update this one
+                candidates.setdefault(key, []).append((_as_stored(episode.recording_date, dialect), episode))
+        episodes.append(episode)
+
+    try:
+        db.flush()
+        ids = [e.id for e in episodes]
+        db.commit()
+        invalidate("notifications")
+    except Exception as e:
+        logger.error(f"Failed to create/update episodes: {e}", exc_info=True)
+        db.rollback()
+        return []
+    if ids:
+        # Reload the expired episodes with one SELECT instead of a refresh each, with the
+        # podcast the daily workflow reads (this also replaces the raiseload options above)
+        db.query(Episode).filter(Episode.id.in_(set(ids))).options(
+            selectinload(Episode.podcast).lazyload(Podcast.aliases)
+        ).all()
+    return episodes
+
+
 def create_or_update_episode_from_event(
     db: Session,
     event_data: Dict[str, Any],
@@ -349,56 +555,60 @@ def create_or_update_episode_from_event(
     Returns:
         Episode object or None if creation fails
     """
-    # Check if episode already exists
-    # Match by podcast_id, episode_number, and recording_date (within same day)
-    episode = None
-    if event_data.get('episode_number') and event_data.get('recording_date'):
-        recording_date = event_data['recording_date']
-        day_start = recording_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        day_end = day_start + timedelta(days=1)
-        
-        episode = db.query(Episode).filter(
-            and_(
-                Episode.podcast_id == podcast.id,
-                Episode.episode_number == event_data['episode_number'],
-                Episode.recording_date >= day_start,
-                Episode.recording_date < day_end
-            )
-        ).first()
-    
-    if episode:
-        # Update existing episode
-        logger.info(f"Updating existing episode {episode.id} from calendar event")
-        if event_data.get('recording_date'):
-            episode.recording_date = event_data['recording_date']
-        if event_data.get('studio') and not episode.studio:
-            episode.studio = event_data['studio']
-        if event_data.get('guest_names') and not episode.guest_names:
-            episode.guest_names = event_data['guest_names']
-        if event_data.get('notes') and not episode.episode_notes:
-            episode.episode_notes = event_data['notes']
-    else:
-        # Create new episode
-        logger.info(f"Creating new episode for podcast {podcast.name}")
-        episode = Episode(
-            podcast_id=podcast.id,
-            episode_number=event_data.get('episode_number'),
-            recording_date=event_data.get('recording_date'),
-            studio=event_data.get('studio'),
-            guest_names=event_data.get('guest_names'),
-            episode_notes=event_data.get('notes'),
-            status=EpisodeStatus.NOT_STARTED
-        )
-        db.add(episode)
+    saved = apply_episode_changes(db, [(event_data, podcast, event_data.get('episode_number'))])
+    return saved[0] if saved else None
+
+
+# Largest page the Calendar API allows; a typical sync window fits in one request
+EVENTS_PAGE_SIZE = 2500
+# Only the event fields extract_episode_data_from_event and the sync loops read
+_EVENT_FIELDS = "nextPageToken,items(id,summary,description,location,start,extendedProperties)"
+
+
+def list_calendar_events(service, time_min: str, time_max: str) -> List[Dict[str, Any]]:
+    """
+    All events between time_min and time_max (RFC 3339), following nextPageToken.
     
-    try:
-        db.commit()
-        db.refresh(episode)
-        return episode
-    except Exception as e:
-        logger.error(f"Failed to create/update episode: {e}", exc_info=True)
-        db.rollback()
-        return None
+    Each page's token comes from the previous response, so pages cannot be requested
+    concurrently; large pages and a trimmed field list keep the round trips few and small.
+    """
+    events = []
+    page_token = None
+    while True:
+        result = service.events().list(
+            calendarId=settings.GOOGLE_CALENDAR_ID,
+            timeMin=time_min,
+            timeMax=time_max,
+            singleEvents=True,
+            orderBy='startTime',
+            maxResults=EVENTS_PAGE_SIZE,
+            pageToken=page_token,
+            fields=_EVENT_FIELDS,
+        ).execute()
+        events.extend(result.get('items', []))
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            return events
+
+
+def _utc_midnight() -> datetime:
+    """Start of the current UTC day."""
+    return datetime.combine(datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc)
+
+
+def _to_rfc3339_utc(dt: datetime) -> str:
+    """UTC datetime as the RFC 3339 string the Calendar API expects (no double offset)."""
+    return dt.replace(tzinfo=None, microsecond=0).isoformat() + 'Z'
+
+
+def _episodes_recorded_between(db: Session, start: datetime, end: datetime) -> List[Episode]:
+    """Database fallback: episodes with a recording date in [start, end)."""
+    return db.query(Episode).filter(
+        and_(
+            Episode.recording_date >= start,
+            Episode.recording_date < end
+        )
+    ).all()
 
 
 def get_todays_episodes_from_calendar(db: Session) -> List[Episode]:
@@ -414,19 +624,13 @@ def get_todays_episodes_from_calendar(db: Session) -> List[Episode]:
     Returns:
         List of Episode objects scheduled for today
     """
+    today_start = _utc_midnight()
+    today_end = today_start + timedelta(days=1)
+    
     # If Google Calendar is not enabled, fall back to database query
     if not settings.GOOGLE_CALENDAR_ENABLED or not GOOGLE_API_AVAILABLE:
         logger.debug("Google Calendar disabled, querying database")
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-        
-        episodes = db.query(Episode).filter(
-            and_(
-                Episode.recording_date >= today_start,
-                Episode.recording_date < today_end
-            )
-        ).all()
-        
+        episodes = _episodes_recorded_between(db, today_start, today_end)
         logger.info(f"Found {len(episodes)} episodes scheduled for today in database")
         return episodes
     
@@ -434,44 +638,22 @@ def get_todays_episodes_from_calendar(db: Session) -> List[Episode]:
     service = get_calendar_service()
     if not service:
         logger.warning("Could not initialize Google Calendar service, falling back to database")
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-        
-        episodes = db.query(Episode).filter(
-            and_(
-                Episode.recording_date >= today_start,
-                Episode.recording_date < today_end
-            )
-        ).all()
-        return episodes
+        return _episodes_recorded_between(db, today_start, today_end)
+    
+    from googleapiclient.errors import HttpError
     
     # Query calendar for today's events
     try:
-        # UTC date range for today (RFC 3339 format; avoid double timezone suffix)
-        now = datetime.now(timezone.utc)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-
-        def to_rfc3339_utc(dt):
-            return dt.strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
-
-        time_min = to_rfc3339_utc(today_start)
-        time_max = to_rfc3339_utc(today_end)
+        time_min = _to_rfc3339_utc(today_start)
+        time_max = _to_rfc3339_utc(today_end)
         
         logger.info(f"Fetching calendar events from {time_min} to {time_max}")
         
-        events_result = service.events().list(
-            calendarId=settings.GOOGLE_CALENDAR_ID,
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy='startTime',
-        ).execute()
-        
-        events = events_result.get('items', [])
+        events = list_calendar_events(service, time_min, time_max)
         logger.info(f"Found {len(events)} calendar events for today")
         
-        episodes = []
+        podcast_index = load_podcast_index(db)
+        changes = []
         for event in events:
             try:
                 # Extract episode data from event
@@ -483,7 +665,7 @@ def get_todays_episodes_from_calendar(db: Session) -> List[Episode]:
                     continue
                 
                 # Only import if podcast is recognized (name or alias in title); do not create new podcasts
-                podcast = find_podcast_from_event_title(db, raw_title)
+                podcast = find_podcast_from_event_title(db, raw_title, podcast_index)
                 if not podcast:
                     logger.info(f"Skipping event '{raw_title}' - no recognized podcast name or alias in title")
                     continue
@@ -493,45 +675,22 @@ def get_todays_episodes_from_calendar(db: Session) -> List[Episode]:
                 if not ep_nums:
                     ep_nums = [None]  # no number: create/update one episode with no episode_number
                 for ep_num in ep_nums:
-                    ev = {**event_data, 'episode_number': ep_num}
-                    episode = create_or_update_episode_from_event(db, ev, podcast)
-                    if episode:
-                        episodes.append(episode)
-                        logger.info(f"Processed episode: {podcast.name} - {ep_num or 'N/A'}")
+                    changes.append((event_data, podcast, ep_num))
                 
             except Exception as e:
                 logger.error(f"Error processing calendar event {event.get('id')}: {e}", exc_info=True)
                 continue
         
+        episodes = apply_episode_changes(db, changes)
         logger.info(f"Successfully processed {len(episodes)} episodes from Google Calendar")
         return episodes
         
     except HttpError as e:
         logger.error(f"Google Calendar API error: {e}", exc_info=True)
-        # Fall back to database query
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-        
-        episodes = db.query(Episode).filter(
-            and_(
-                Episode.recording_date >= today_start,
-                Episode.recording_date < today_end
-            )
-        ).all()
-        return episodes
+        return _episodes_recorded_between(db, today_start, today_end)
     except Exception as e:
         logger.error(f"Unexpected error fetching calendar events: {e}", exc_info=True)
-        # Fall back to database query
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-        
-        episodes = db.query(Episode).filter(
-            and_(
-                Episode.recording_date >= today_start,
-                Episode.recording_date < today_end
-            )
-        ).all()
-        return episodes
+        return _episodes_recorded_between(db, today_start, today_end)
 
 
 def sync_calendar_to_database(db: Session, days_ahead: Optional[int] = None) -> int:
@@ -554,33 +713,22 @@ def sync_calendar_to_database(db: Session, days_ahead: Optional[int] = None) ->
         logger.warning("Could not initialize Google Calendar service")
         return 0
     
+    from googleapiclient.errors import HttpError
+    
     days_ahead = days_ahead or settings.GOOGLE_CALENDAR_LOOKAHEAD_DAYS
     
     try:
-        # UTC date range, RFC 3339 format (avoid double timezone suffix)
         now = datetime.now(timezone.utc)
-        end = now + timedelta(days=days_ahead)
-
-        def to_rfc3339_utc(dt):
-            return dt.strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
-
-        time_min = to_rfc3339_utc(now)
-        time_max = to_rfc3339_utc(end)
+        time_min = _to_rfc3339_utc(now)
+        time_max = _to_rfc3339_utc(now + timedelta(days=days_ahead))
         
         logger.info(f"Syncing calendar events from {time_min} to {time_max}")
         
-        events_result = service.events().list(
-            calendarId=settings.GOOGLE_CALENDAR_ID,
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy='startTime',
-        ).execute()
-        
-        events = events_result.get('items', [])
+        events = list_calendar_events(service, time_min, time_max)
         logger.info(f"Found {len(events)} calendar events to sync")
         
-        synced_count = 0
+        podcast_index = load_podcast_index(db)
+        changes = []
         for event in events:
             try:
                 # Extract episode data from event
@@ -591,7 +739,7 @@ def sync_calendar_to_database(db: Session, days_ahead: Optional[int] = None) ->
                     continue
                 
                 # Only import if podcast is recognized (name or alias in title); do not create new podcasts
-                podcast = find_podcast_from_event_title(db, raw_title)
+                podcast = find_podcast_from_event_title(db, raw_title, podcast_index)
                 if not podcast:
                     logger.debug(f"Skipping event - no recognized podcast in title: {raw_title}")
                     continue
@@ -601,15 +749,13 @@ def sync_calendar_to_database(db: Session, days_ahead: Optional[int] = None) ->
                 if not ep_nums:
                     ep_nums = [None]
                 for ep_num in ep_nums:
-                    ev = {**event_data, 'episode_number': ep_num}
-                    episode = create_or_update_episode_from_event(db, ev, podcast)
-                    if episode:
-                        synced_count += 1
+                    changes.append((event_data, podcast, ep_num))
             
             except Exception as e:
                 logger.error(f"Error syncing calendar event {event.get('id')}: {e}", exc_info=True)
                 continue
         
+        synced_count = len(apply_episode_changes(db, changes))
         logger.info(f"Successfully synced {synced_count} episodes from Google Calendar")
         return synced_count
         
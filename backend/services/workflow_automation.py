@@ -3,11 +3,13 @@ Workflow automation service for automatic task creation and management.
 """
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import List, Optional, Union
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
-from models import Episode, Task, Podcast, EpisodeStatus, TaskType, TaskStatus
+from cache import invalidate
+from models import ApprovalStatus, Episode, Task, Podcast, EpisodeStatus, TaskType, TaskStatus
 from services.google_calendar import get_todays_episodes_from_calendar
 
 logger = logging.getLogger(__name__)
@@ -179,7 +181,7 @@ def create_publishing_task(db: Session, episode: Episode) -> Optional[Task]:
         return existing
     
     # Only create if both are approved
-    if episode.client_approved_editing == "approved" and episode.client_approved_reels == "approved":
+    if episode.client_approved_editing == ApprovalStatus.APPROVED and episode.client_approved_reels == ApprovalStatus.APPROVED:
         base_notes = "Publish episode. Both editing and reels have been approved by client."
         task = Task(
             episode_id=episode.id,
@@ -211,7 +213,6 @@ def auto_complete_studio_preparation(db: Session, episode: Episode):
     
     if task:
         task.status = TaskStatus.DONE
-        task.completed_at = datetime.now(timezone.utc)
         db.commit()
         logger.info(f"Auto-completed studio preparation task {task.id} for episode {episode.id}")
 
@@ -226,17 +227,15 @@ def sync_editing_task_status(db: Session, episode: Episode):
     ).first()
     
     if task:
-        if episode.client_approved_editing == "approved":
+        if episode.client_approved_editing == ApprovalStatus.APPROVED:
             if task.status != TaskStatus.DONE:
                 task.status = TaskStatus.DONE
-                task.completed_at = datetime.now(timezone.utc)
                 db.commit()
                 logger.info(f"Marked editing task {task.id} as done (client approved)")
-        elif episode.client_approved_editing == "rejected":
+        elif episode.client_approved_editing == ApprovalStatus.REJECTED:
             # Reset to in_progress if client rejected (was done or sent to client)
             if task.status in (TaskStatus.DONE, TaskStatus.SENT_TO_CLIENT):
                 task.status = TaskStatus.IN_PROGRESS
-                task.completed_at = None
                 db.commit()
                 logger.info(f"Reset editing task {task.id} to in_progress (client rejected)")
 
@@ -251,17 +250,15 @@ def sync_reels_task_status(db: Session, episode: Episode):
     ).first()
     
     if task:
-        if episode.client_approved_reels == "approved":
+        if episode.client_approved_reels == ApprovalStatus.APPROVED:
             if task.status != TaskStatus.DONE:
                 task.status = TaskStatus.DONE
-                task.completed_at = datetime.now(timezone.utc)
                 db.commit()
                 logger.info(f"Marked reels task {task.id} as done (client approved)")
-        elif episode.client_approved_reels == "rejected":
+        elif episode.client_approved_reels == ApprovalStatus.REJECTED:
             # Reset to in_progress if client rejected (was done or sent to client)
             if task.status in (TaskStatus.DONE, TaskStatus.SENT_TO_CLIENT):
                 task.status = TaskStatus.IN_PROGRESS
-                task.completed_at = None
                 db.commit()
                 logger.info(f"Reset reels task {task.id} to in_progress (client rejected)")
 
@@ -301,7 +298,8 @@ def process_daily_workflow(db: Session):
         for episode in today_episodes:
             # Create studio preparation task
             create_studio_preparation_task(db, episode)
-            
+        invalidate("notifications")
+        
         logger.info("Daily workflow processing completed")
         return len(today_episodes)
     except Exception as e:
@@ -322,6 +320,7 @@ def process_task_status_change(db: Session, task: Task, old_status: TaskStatus):
 
     if task.type == TaskType.STUDIO_PREPARATION:
         create_recording_task(db, episode)
+        invalidate("notifications")
         logger.info(f"Studio preparation task {task.id} marked done -> created recording task for episode {episode.id}")
     elif task.type == TaskType.RECORDING:
         old_episode_status = episode.status
@@ -350,3 +349,28 @@ def process_episode_status_change(db: Session, episode: Episode, old_status: Epi
     
     # Create publishing task if both are approved
     create_publishing_task(db, episode)
+    # Runs after the response for episode updates, so the request's own invalidate is too early
+    invalidate("notifications")
+
+
+def process_episode_status_change_in_background(
+    bind: Union[Engine, Connection], episode_id: str, old_status: EpisodeStatus
+):
+    """
+    Run process_episode_status_change after the response has been sent (FastAPI BackgroundTasks).
+    
+    Opens its own session on the request session's bind, since the request session is closed by then.
+    Errors are logged and never propagate to the client.
+    """
+    db = Session(bind=bind)
+    try:
+        episode = db.query(Episode).filter(Episode.id == episode_id).first()
+        if not episode:
+            logger.warning(f"Episode {episode_id} no longer exists; skipping workflow automation")
+            return
+        process_episode_status_change(db, episode, old_status)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in workflow automation for episode {episode_id}: {e}", exc_info=True)
+    finally:
+        db.close()
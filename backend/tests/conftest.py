@@ -12,12 +12,16 @@ sys.path.insert(0, str(backend_dir))
 os.chdir(backend_dir)
 
 import pytest
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 # Import after path is set
 from database import Base, get_db
+from cache import invalidate
 from models import Podcast, PodcastAlias, Episode, User, Task, EpisodeStatus, TaskType, TaskStatus
 from main import app
 from fastapi.testclient import TestClient
@@ -27,6 +31,14 @@ from fastapi.testclient import TestClient
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Each test gets its own DB, so cached responses must not leak between tests."""
+    invalidate()
+    yield
+    invalidate()
+
+
 @pytest.fixture(scope="function")
 def db_engine():
     """Create a fresh in-memory engine per test."""
@@ -40,6 +52,25 @@ def db_engine():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def count_queries(db_engine):
+    """Context manager factory collecting the SQL statements executed inside the block."""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine, "before_cursor_execute", record)
+
+    return counter
+
+
 @pytest.fixture
 def db_session(db_engine):
     """Provide a DB session that rolls back after each test."""
@@ -66,7 +97,8 @@ def client(db_engine):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as c:
+    # Tables already exist on the test engine; skip startup init against the configured database
+    with patch("main.init_db"), TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
 
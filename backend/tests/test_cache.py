@@ -0,0 +1,106 @@
+"""
+Tests for the in-process response cache.
+"""
+import sys
+from pathlib import Path
+from typing import List
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import cache
+from cache import cached, freshness_lifetime, invalidate
+
+
+def make_handler(results):
+    """Cached handler returning successive items of results (raising exceptions as-is)."""
+    calls = []
+
+    @cached("test", List[int])
+    async def handler(limit: int = 10, db=None):
+        calls.append(limit)
+        result = results[len(calls) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return handler, calls
+
+
+def expire_all():
+    for key, (_, *rest) in list(cache._entries.items()):
+        cache._entries[key] = (0.0, *rest)
+
+
+@pytest.mark.asyncio
+class TestCached:
+    async def test_hit_skips_handler_and_ignores_db(self):
+        handler, calls = make_handler([[1, 2]])
+        assert await handler(10, db="session-a") == [1, 2]
+        assert await handler(limit=10, db="session-b") == [1, 2]
+        assert calls == [10]
+
+    async def test_arguments_are_part_of_key(self):
+        handler, calls = make_handler([[1], [2]])
+        assert await handler(1) == [1]
+        assert await handler(2) == [2]
+        assert calls == [1, 2]
+
+    async def test_invalidate_and_expiry(self):
+        handler, calls = make_handler([[1], [2], [3]])
+        await handler()
+        invalidate("test")
+        assert await handler() == [2]
+        expire_all()
+        assert await handler() == [3]
+        assert len(calls) == 3
+
+    async def test_serves_stale_entry_on_database_error(self):
+        handler, _ = make_handler([[1], OperationalError("SELECT", {}, Exception("down"))])
+        await handler()
+        expire_all()
+        assert await handler() == [1]
+
+    async def test_database_error_without_entry_raises(self):
+        handler, _ = make_handler([OperationalError("SELECT", {}, Exception("down"))])
+        with pytest.raises(OperationalError):
+            await handler()
+
+    async def test_refresh_started_before_invalidate_is_not_stored(self):
+        calls = []
+
+        @cached("test", List[int])
+        async def handler(db=None):
+            calls.append(None)
+            if len(calls) == 1:
+                # A write commits and invalidates while this refresh is still running
+                invalidate("test")
+            return [len(calls)]
+
+        assert await handler() == [1]
+        assert await handler() == [2]
+        assert await handler() == [2]
+        invalidate()
+        assert await handler() == [3]
+        assert len(calls) == 3
+
+    async def test_evicts_least_recently_used(self, monkeypatch):
+        monkeypatch.setattr(cache, "MAX_ENTRIES", 2)
+        handler, calls = make_handler([[1], [2], [3], [4]])
+        await handler(1)
+        await handler(2)
+        await handler(1)
+        await handler(3)
+        assert len(cache._entries) == 2
+        assert await handler(1) == [1]
+        assert await handler(2) == [4]
+        assert calls == [1, 2, 3, 2]
+
+
+def test_freshness_lifetime_is_clamped():
+    assert freshness_lifetime(0.0, "short") == 2.0
+    assert freshness_lifetime(0.0001, "long") == pytest.approx(30.0001)
+    assert freshness_lifetime(50.0, "short") == 10.0
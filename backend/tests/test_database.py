@@ -0,0 +1,44 @@
+"""
+Tests for database setup helpers.
+"""
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from sqlalchemy import create_engine, create_mock_engine, inspect
+
+import database
+from database import Base, init_db
+
+
+def test_init_db_creates_missing_tables():
+    engine = create_engine("sqlite://")
+    with patch.object(database, "engine", engine):
+        init_db()
+    assert set(inspect(engine).get_table_names()) == set(Base.metadata.tables)
+
+
+def test_init_db_skips_ddl_when_schema_exists(db_engine, count_queries):
+    with patch.object(database, "engine", db_engine), count_queries() as statements:
+        init_db()
+    assert len(statements) == 1
+    assert "sqlite_master" in statements[0]
+
+
+@pytest.mark.parametrize("version, pgcrypto", [((12, 5), True), ((13, 0), False)])
+def test_create_all_enables_pgcrypto_before_postgresql_13(version, pgcrypto):
+    statements = []
+    engine = create_mock_engine(
+        "postgresql://", lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=engine.dialect)))
+    )
+    engine.dialect.server_version_info = version
+    Base.metadata.create_all(engine, checkfirst=False)
+    created = [s for s in statements if "pgcrypto" in s]
+    defaults = [i for i, s in enumerate(statements) if "gen_random_uuid" in s]
+    assert bool(created) is pgcrypto
+    if pgcrypto:
+        assert statements.index(created[0]) < defaults[0]
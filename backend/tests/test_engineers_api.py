@@ -0,0 +1,89 @@
+"""
+Tests for engineer endpoints. Handlers are called directly with the test DB session.
+"""
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from models import Episode, Task, User, TaskType
+from api.engineers import get_all_engineers_summary, get_engineer_tasks
+
+
+class TestEngineersSummary:
+    def test_counts_per_role(self, db_session, sample_podcast):
+        alice = User(name="Alice")
+        bob = User(name="Bob")
+        db_session.add_all([alice, bob])
+        db_session.commit()
+        e1 = Episode(podcast_id=sample_podcast.id, recording_engineer_id=alice.id, editing_engineer_id=alice.id)
+        e2 = Episode(podcast_id=sample_podcast.id, recording_engineer_id=alice.id, reels_engineer_id=bob.id)
+        db_session.add_all([e1, e2])
+        db_session.commit()
+        db_session.add(Task(episode_id=e1.id, type=TaskType.EDITING, assigned_to=bob.id))
+        db_session.commit()
+
+        result = get_all_engineers_summary(0, 100, db_session)
+        by_name = {r["name"]: r["assignments"] for r in result}
+        assert by_name["Alice"] == {
+            "recording_episodes": 2,
+            "editing_episodes": 1,
+            "reels_episodes": 0,
+            "additional_tasks": 0,
+            "total": 3,
+        }
+        assert by_name["Bob"]["reels_episodes"] == 1
+        assert by_name["Bob"]["additional_tasks"] == 1
+        assert by_name["Bob"]["total"] == 2
+
+    def test_user_without_assignments(self, db_session):
+        db_session.add(User(name="Idle"))
+        db_session.commit()
+        result = get_all_engineers_summary(0, 100, db_session)
+        assert result[0]["assignments"]["total"] == 0
+
+
+class TestEngineerTasks:
+    def test_tasks_and_episode_assignments(self, db_session, sample_podcast):
+        eng = User(name="Eng")
+        db_session.add(eng)
+        db_session.commit()
+        ep = Episode(podcast_id=sample_podcast.id, episode_number="7",
+                     recording_engineer_id=eng.id, reels_engineer_id=eng.id)
+        other = Episode(podcast_id=sample_podcast.id, episode_number="8")
+        db_session.add_all([ep, other])
+        db_session.commit()
+        db_session.add(Task(episode_id=other.id, type=TaskType.EDITING, assigned_to=eng.id))
+        db_session.commit()
+
+        result = get_engineer_tasks(eng.id, None, 0, 100, db_session)
+        tasks = [r for r in result if r["type"] == "task"]
+        assignments = sorted(r["id"] for r in result if r["type"] == "episode_assignment")
+        assert len(tasks) == 1
+        assert tasks[0]["episode"]["episode_number"] == "8"
+        assert tasks[0]["episode"]["podcast"] == sample_podcast.name
+        assert assignments == [f"{ep.id}_recording", f"{ep.id}_reels"]
+
+    def test_limit_caps_tasks_and_episodes(self, db_session, sample_podcast):
+        eng = User(name="Busy")
+        db_session.add(eng)
+        db_session.commit()
+        episodes = [Episode(podcast_id=sample_podcast.id, episode_number=str(n), editing_engineer_id=eng.id) for n in range(3)]
+        db_session.add_all(episodes)
+        db_session.commit()
+        db_session.add_all([Task(episode_id=ep.id, type=TaskType.REELS, assigned_to=eng.id) for ep in episodes])
+        db_session.commit()
+
+        result = get_engineer_tasks(eng.id, None, 1, 1, db_session)
+        assert len([r for r in result if r["type"] == "task"]) == 1
+        assert len([r for r in result if r["type"] == "episode_assignment"]) == 1
+
+
+class TestEngineersSummaryPagination:
+    def test_pages_by_name(self, db_session):
+        db_session.add_all([User(name=n) for n in ("Carol", "Alice", "Bob")])
+        db_session.commit()
+        page = get_all_engineers_summary(1, 1, db_session)
+        assert [r["name"] for r in page] == ["Bob"]
+        assert get_all_engineers_summary(5, 10, db_session) == []
@@ -0,0 +1,147 @@
+"""
+Tests for episode list endpoints. Handlers are called directly with the test DB session.
+"""
+import json
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from models import Podcast, Episode, User, EpisodeStatus
+from fastapi import BackgroundTasks, HTTPException
+from schemas import EpisodeCreate, EpisodeUpdate, EpisodeWithPodcast
+from api.episodes import get_episodes, get_episodes_count, create_episode, update_episode, get_upcoming_recordings
+from api.engineers import get_engineer_episodes
+
+
+@pytest.fixture
+def two_podcasts(db_session):
+    """Two podcasts with three episodes and one engineer."""
+    eng = User(name="Engineer")
+    p1 = Podcast(name="First")
+    p2 = Podcast(name="Second")
+    db_session.add_all([eng, p1, p2])
+    db_session.commit()
+    base = datetime(2025, 3, 1, 10, 0, 0)
+    db_session.add_all([
+        Episode(podcast_id=p1.id, episode_number="1", recording_date=base,
+                status=EpisodeStatus.RECORDED, recording_engineer_id=eng.id),
+        Episode(podcast_id=p1.id, episode_number="2", recording_date=base + timedelta(days=7),
+                status=EpisodeStatus.NOT_STARTED, editing_engineer_id=eng.id),
+        Episode(podcast_id=p2.id, episode_number="1", recording_date=None,
+                status=EpisodeStatus.NOT_STARTED),
+    ])
+    db_session.commit()
+    return p1, p2, eng
+
+
+def list_episodes(db, **overrides):
+    """Call get_episodes with default query values and decode its JSON response."""
+    kwargs = dict(skip=0, limit=50, podcast_id=None, status=None, date_from=None, date_to=None, include_total=False)
+    kwargs.update(overrides)
+    response = get_episodes(db=db, **kwargs)
+    return json.loads(response.body)
+
+
+class TestGetEpisodes:
+    def test_filters_use_request_values(self, db_session, two_podcasts):
+        p1, p2, _ = two_podcasts
+        first = list_episodes(db_session, podcast_id=p1.id)
+        second = list_episodes(db_session, podcast_id=p2.id)
+        assert len(first) == 2
+        assert len(second) == 1
+
+    def test_orders_by_recording_date_desc_nulls_last(self, db_session, two_podcasts):
+        episodes = list_episodes(db_session)
+        assert [e["episode_number"] for e in episodes][:2] == ["2", "1"]
+        assert episodes[-1]["recording_date"] is None
+
+    def test_status_date_and_pagination(self, db_session, two_podcasts):
+        recorded = list_episodes(db_session, status=EpisodeStatus.RECORDED)
+        assert len(recorded) == 1
+        ranged = list_episodes(db_session, date_from=datetime(2025, 3, 5))
+        assert [e["episode_number"] for e in ranged] == ["2"]
+        page = list_episodes(db_session, skip=1, limit=1)
+        assert len(page) == 1
+
+    def test_include_total_returns_page_and_filtered_count(self, db_session, two_podcasts):
+        p1, _, _ = two_podcasts
+        result = list_episodes(db_session, podcast_id=p1.id, limit=1, include_total=True)
+        assert result["total"] == 2
+        assert len(result["items"]) == 1
+        assert "total" not in result["items"][0]
+        count = get_episodes_count(podcast_id=p1.id, status=None, date_from=None, date_to=None, db=db_session)
+        assert count == {"total": 2}
+
+    def test_include_total_past_last_page(self, db_session, two_podcasts):
+        result = list_episodes(db_session, skip=10, include_total=True)
+        assert result == {"items": [], "total": 3}
+
+
+class TestGetUpcomingRecordings:
+    def test_matches_schema_output_in_two_statements(self, db_session, sample_podcast_with_alias, count_queries):
+        eng = User(name="Engineer")
+        db_session.add(eng)
+        db_session.commit()
+        soon = datetime.utcnow() + timedelta(days=1)
+        db_session.add_all([
+            Episode(podcast_id=sample_podcast_with_alias.id, episode_number="2", recording_date=soon + timedelta(hours=1),
+                    recording_engineer_id=eng.id),
+            Episode(podcast_id=sample_podcast_with_alias.id, episode_number="1", recording_date=soon),
+            Episode(podcast_id=sample_podcast_with_alias.id, episode_number="9", recording_date=soon + timedelta(days=30)),
+        ])
+        db_session.commit()
+        db_session.expunge_all()
+        with count_queries() as statements:
+            upcoming = json.loads(get_upcoming_recordings(days_ahead=7, db=db_session).body)
+        # Flat episode rows, then podcast aliases
+        assert len(statements) == 2
+        assert [e["episode_number"] for e in upcoming] == ["1", "2"]
+        assert upcoming[0]["podcast"]["aliases"] == ["The Show - Givon Room"]
+        assert upcoming[1]["recording_engineer"]["name"] == "Engineer"
+        expected = [
+            EpisodeWithPodcast.model_validate(e).model_dump(mode="json")
+            for e in db_session.query(Episode).filter(Episode.episode_number.in_(["1", "2"])).order_by(Episode.recording_date)
+        ]
+        assert upcoming == expected
+
+
+class TestGetEngineerEpisodes:
+    def test_role_filters(self, db_session, two_podcasts):
+        _, _, eng = two_podcasts
+        kwargs = dict(status=None, upcoming_only=False, days_ahead=30)
+        assert len(get_engineer_episodes(eng.id, role=None, db=db_session, **kwargs)) == 2
+        assert len(get_engineer_episodes(eng.id, role="recording", db=db_session, **kwargs)) == 1
+        assert len(get_engineer_episodes(eng.id, role="reels", db=db_session, **kwargs)) == 0
+        assert len(get_engineer_episodes("someone-else", role=None, db=db_session, **kwargs)) == 0
+
+    def test_serializes_without_lazy_loads(self, db_session, two_podcasts, count_queries):
+        engineer_id = two_podcasts[2].id
+        db_session.expunge_all()
+        with count_queries() as statements:
+            episodes = get_engineer_episodes(engineer_id, role=None, status=None, upcoming_only=False, days_ahead=30, db=db_session)
+            dumped = [EpisodeWithPodcast.model_validate(e).model_dump() for e in episodes]
+        assert {d["podcast"]["name"] for d in dumped} == {"First"}
+        # episodes with joined podcast/engineers, then podcast aliases
+        assert len(statements) == 2
+
+
+class TestEngineerValidation:
+    def test_create_checks_all_engineers(self, db_session, two_podcasts):
+        p1, _, eng = two_podcasts
+        ep = create_episode(EpisodeCreate(podcast_id=p1.id, recording_engineer_id=eng.id, editing_engineer_id=eng.id), db_session)
+        assert ep.editing_engineer_id == eng.id
+        with pytest.raises(HTTPException) as exc_info:
+            create_episode(EpisodeCreate(podcast_id=p1.id, recording_engineer_id=eng.id, reels_engineer_id="nope"), db_session)
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "Reels engineer with id nope not found"
+
+    def test_update_rejects_unknown_engineer(self, db_session, two_podcasts):
+        p1, _, _ = two_podcasts
+        ep = db_session.query(Episode).filter(Episode.podcast_id == p1.id).first()
+        with pytest.raises(HTTPException) as exc_info:
+            update_episode(ep.id, EpisodeUpdate(editing_engineer_id="nope"), BackgroundTasks(), db_session)
+        assert exc_info.value.status_code == 400
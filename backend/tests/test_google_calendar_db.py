@@ -9,13 +9,19 @@ backend_dir = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(backend_dir))
 
 import pytest
+from sqlalchemy.exc import InvalidRequestError
 from models import Podcast, PodcastAlias, Episode, EpisodeStatus
 from services.google_calendar import (
     find_podcast_by_name_or_alias,
     find_podcast_from_event_title,
     find_or_create_podcast,
+    load_podcast_index,
     create_or_update_episode_from_event,
+    apply_episode_changes,
+    get_todays_episodes_from_calendar,
 )
+from unittest.mock import patch
+from datetime import timedelta
 
 
 class TestFindPodcastByNameOrAlias:
@@ -34,6 +40,24 @@ class TestFindPodcastByNameOrAlias:
         assert found is not None
         assert found.name == "The Show"
 
+    def test_single_query_prefers_name_over_alias(self, db_session, count_queries):
+        named = Podcast(name="Studio Talk")
+        aliased = Podcast(name="Other", aliases=[PodcastAlias(alias="studio talk")])
+        db_session.add_all([aliased, named])
+        db_session.commit()
+        named_id, aliased_id = named.id, aliased.id
+        db_session.expunge_all()
+        with count_queries() as statements:
+            found = find_podcast_by_name_or_alias(db_session, "STUDIO TALK ")
+        assert found.id == named_id
+        # Matching podcast, then its selectin-loaded aliases
+        assert len(statements) == 2
+        # Even an exact alias ranks below a case-insensitive name
+        assert find_podcast_by_name_or_alias(db_session, "studio talk").id == named_id
+        assert find_podcast_by_name_or_alias(db_session, "OTHER").id == aliased_id
+        # Wildcards are literal characters, not ILIKE patterns
+        assert find_podcast_by_name_or_alias(db_session, "studio_talk") is None
+
     def test_no_match_returns_none(self, db_session, sample_podcast):
         found = find_podcast_by_name_or_alias(db_session, "Unknown Podcast")
         assert found is None
@@ -58,10 +82,31 @@ class TestFindPodcastFromEventTitle:
         assert found is not None
         assert found.name == "The Show"
 
+    def test_name_beats_alias_of_same_length(self, db_session):
+        by_alias = Podcast(name="Other", aliases=[PodcastAlias(alias="Alpha")])
+        by_name = Podcast(name="ALPHA")
+        db_session.add_all([by_alias, by_name])
+        db_session.commit()
+        index = load_podcast_index(db_session)
+        assert [length for _, length, _ in index] == sorted((length for _, length, _ in index), reverse=True)
+        assert find_podcast_from_event_title(db_session, "alpha #3", index).id == by_name.id
+
     def test_empty_title_returns_none(self, db_session):
         assert find_podcast_from_event_title(db_session, "") is None
         assert find_podcast_from_event_title(db_session, None) is None
 
+    def test_shared_index_loads_each_podcast_once(self, db_session, sample_podcast_with_alias, count_queries):
+        index = load_podcast_index(db_session)
+        db_session.expunge_all()
+        titles = ["The Show - Givon Room", "the show #12", "Other event", "THE SHOW 13 & 14"]
+        with count_queries() as statements:
+            found = [find_podcast_from_event_title(db_session, t, index) for t in titles]
+        assert [p.name if p else None for p in found] == ["The Show", "The Show", None, "The Show"]
+        # Only the first match loads its podcast (not its aliases); no per-event scans
+        assert len(statements) == 1
+        with pytest.raises(InvalidRequestError):
+            found[0].episodes
+
 
 class TestFindOrCreatePodcast:
     def test_returns_existing(self, db_session, sample_podcast):
@@ -77,6 +122,13 @@ class TestFindOrCreatePodcast:
         assert found.name == "New Podcast"
         assert db_session.query(Podcast).filter(Podcast.name == "New Podcast").first() is not None
 
+    def test_creating_invalidates_cached_podcast_list(self, db_session, sample_podcast):
+        with patch("services.google_calendar.invalidate") as invalidate:
+            find_or_create_podcast(db_session, "רוני וברק")
+            invalidate.assert_not_called()
+            find_or_create_podcast(db_session, "New Podcast")
+        invalidate.assert_called_once_with("podcasts")
+
     def test_empty_name_returns_none(self, db_session):
         assert find_or_create_podcast(db_session, "") is None
         assert find_or_create_podcast(db_session, None) is None
@@ -163,3 +215,90 @@ class TestCreateOrUpdateEpisodeFromEvent:
         assert ep1.id != ep2.id
         assert ep1.episode_number == "33"
         assert ep2.episode_number == "34"
+
+
+class TestApplyEpisodeChanges:
+    def test_matches_by_day_with_one_lookup_and_commit(self, db_session, sample_podcast, count_queries):
+        rec_date = datetime(2025, 2, 11, 10, 0, 0, tzinfo=timezone.utc)
+        existing = Episode(podcast_id=sample_podcast.id, episode_number="33", recording_date=rec_date)
+        older = Episode(podcast_id=sample_podcast.id, episode_number="34", recording_date=rec_date - timedelta(days=3))
+        db_session.add_all([existing, older])
+        db_session.commit()
+        existing_id, older_id, _ = existing.id, older.id, sample_podcast.id
+
+        changes = [
+            ({"recording_date": rec_date + timedelta(hours=2), "studio": "Room A"}, sample_podcast, "33"),
+            ({"recording_date": rec_date, "studio": "Room B"}, sample_podcast, "34"),
+            ({"recording_date": rec_date, "notes": "Same event twice"}, sample_podcast, "34"),
+        ] + [
+            ({"recording_date": rec_date}, sample_podcast, str(n)) for n in range(40, 60)
+        ]
+        with count_queries() as statements:
+            saved = apply_episode_changes(db_session, changes)
+        assert len(saved) == len(changes)
+        assert saved[0].id == existing_id
+        assert saved[0].studio == "Room A"
+        # A different day creates a new episode, which the repeated event then updates
+        assert saved[1].id != older_id
+        assert saved[2] is saved[1]
+        assert saved[1].episode_notes == "Same event twice"
+        # Lookup, batched INSERT, UPDATE, reload; never one statement per event
+        assert len(statements) <= 5
+        assert db_session.query(Episode).count() == 2 + 1 + 20
+        with count_queries() as statements:
+            assert {e.podcast.name for e in saved} == {sample_podcast.name}
+        assert statements == []
+
+    def test_undated_change_does_not_take_day_of_dated_one(self, db_session, sample_podcast):
+        rec_date = datetime(2025, 2, 11, 10, 0, 0, tzinfo=timezone.utc)
+        existing = Episode(podcast_id=sample_podcast.id, episode_number="33", recording_date=rec_date)
+        db_session.add(existing)
+        db_session.commit()
+        existing_id = existing.id
+        changes = [
+            ({"studio": "Room A"}, sample_podcast, "33"),
+            ({"recording_date": rec_date + timedelta(hours=1), "notes": "Dated"}, sample_podcast, "33"),
+        ]
+        saved = apply_episode_changes(db_session, changes)
+        assert len(saved) == 2
+        assert saved[0].id != existing_id
+        assert saved[0].recording_date is None
+        assert saved[1].id == existing_id
+        assert saved[1].episode_notes == "Dated"
+
+    def test_prefetch_loads_only_wanted_pairs(self, db_session, count_queries):
+        first, second = Podcast(name="First"), Podcast(name="Second")
+        db_session.add_all([first, second])
+        db_session.commit()
+        rec_date = datetime(2025, 2, 11, 10, 0, 0, tzinfo=timezone.utc)
+        # Same numbers on the other podcast: matched by neither change
+        db_session.add_all([
+            Episode(podcast_id=first.id, episode_number="2", recording_date=rec_date),
+            Episode(podcast_id=second.id, episode_number="1", recording_date=rec_date),
+        ])
+        db_session.commit()
+        db_session.refresh(first)
+        db_session.refresh(second)
+        changes = [({"recording_date": rec_date}, first, "1"), ({"recording_date": rec_date}, second, "2")]
+        with count_queries() as statements:
+            saved = apply_episode_changes(db_session, changes)
+        assert statements[0].startswith("SELECT")
+        assert "(episodes.podcast_id, episodes.episode_number) IN" in statements[0]
+        assert len({e.id for e in saved}) == 2
+        assert db_session.query(Episode).count() == 4
+
+
+class TestGetTodaysEpisodesFromCalendar:
+    def test_falls_back_to_todays_database_episodes(self, db_session, sample_podcast):
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            Episode(podcast_id=sample_podcast.id, episode_number="1", recording_date=now),
+            Episode(podcast_id=sample_podcast.id, episode_number="2", recording_date=now + timedelta(days=2)),
+        ])
+        db_session.commit()
+        with patch("services.google_calendar.settings.GOOGLE_CALENDAR_ENABLED", True), \
+                patch("services.google_calendar.GOOGLE_API_AVAILABLE", True), \
+                patch("services.google_calendar.get_calendar_service", return_value=None):
+            episodes = get_todays_episodes_from_calendar(db_session)
+        assert [e.episode_number for e in episodes] == ["1"]
+
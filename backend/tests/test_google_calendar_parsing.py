@@ -1,14 +1,18 @@
 """
-Unit tests for Google Calendar event parsing (no DB).
+Unit tests for Google Calendar event parsing and service setup (no DB).
 """
 import sys
 from pathlib import Path
+import threading
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
 import pytest
 
 backend_dir = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from services.google_calendar import parse_event_title, extract_episode_data_from_event
+import services.google_calendar as google_calendar
+from services.google_calendar import parse_event_title, extract_episode_data_from_event, get_calendar_service, list_calendar_events, _to_rfc3339_utc
 
 
 class TestParseEventTitle:
@@ -60,11 +64,19 @@ class TestParseEventTitle:
         assert result["episode_numbers"] == ["33"]
         assert result["podcast_name"] == "Some Podcast"
 
+    def test_trailing_number_needs_dash_or_space(self):
+        assert parse_event_title("Show -7 ")["episode_numbers"] == ["7"]
+        assert parse_event_title("Show\t12")["episode_numbers"] == ["12"]
+        assert parse_event_title("Show7")["episode_numbers"] == []
+
     def test_no_episode_number_podcast_name_is_title(self):
         result = parse_event_title("Just a Meeting")
         assert result["episode_numbers"] == []
         assert result["episode_number"] is None
         assert result["podcast_name"] == "Just a Meeting"
+        assert parse_event_title("   ")["podcast_name"] is None
+        # Non-ASCII digits count as numbers, as in the episode-number patterns
+        assert parse_event_title("Show #٣")["episode_numbers"] == ["٣"]
 
     def test_episode_keyword_english(self):
         result = parse_event_title("My Show episode 5")
@@ -87,6 +99,14 @@ class TestParseEventTitle:
         assert len(result["episode_numbers"]) >= 1
         assert "100" in result["episode_numbers"] or "1" in result["episode_numbers"]
 
+    def test_overlapping_forms_all_count(self):
+        # "33 & 34" and "34-35" share 34; "פרק 33" and "33 ו-34" share 33
+        assert parse_event_title("Show 33 & 34-35")["episode_numbers"] == ["33", "34", "35"]
+        assert parse_event_title("Show פרק 33 ו-34")["episode_numbers"] == ["33", "34"]
+        # Multi matches are applied before ranges; numbers inside a longer number never start a match
+        assert parse_event_title("Show 40-41 & 39")["episode_numbers"] == ["41", "39", "40"]
+        assert parse_event_title("Show 133, 34")["episode_numbers"] == ["133", "34"]
+
 
 class TestExtractEpisodeDataFromEvent:
     """extract_episode_data_from_event with mock event dicts."""
@@ -110,7 +130,7 @@ class TestExtractEpisodeDataFromEvent:
             "start": {"dateTime": "2025-02-11T12:00:00Z"},
         }
         data = extract_episode_data_from_event(event)
-        assert data["recording_date"] is not None
+        assert data["recording_date"] == datetime(2025, 2, 11, 12, 0, tzinfo=timezone.utc)
 
     def test_all_day_event(self):
         event = {
@@ -118,7 +138,7 @@ class TestExtractEpisodeDataFromEvent:
             "start": {"date": "2025-02-11"},
         }
         data = extract_episode_data_from_event(event)
-        assert data["recording_date"] is not None
+        assert data["recording_date"] == datetime(2025, 2, 11, tzinfo=timezone.utc)
         assert data["episode_number"] == "2"
 
     def test_location_and_description(self):
@@ -133,6 +153,14 @@ class TestExtractEpisodeDataFromEvent:
         assert data["guest_names"] == "John Doe"
         assert data["notes"] == "אורח: John Doe"
 
+    def test_guest_label_beats_earlier_with(self):
+        event = {
+            "summary": "Show #1",
+            "start": {"dateTime": "2025-02-11T10:00:00Z"},
+            "description": "Session with the usual crew\nGuests: Dana Cohen",
+        }
+        assert extract_episode_data_from_event(event)["guest_names"] == "Dana Cohen"
+
     def test_extended_properties_override_empty(self):
         event = {
             "summary": "Show",
@@ -168,3 +196,61 @@ class TestExtractEpisodeDataFromEvent:
         assert data["podcast_name"] is None
         assert data["episode_numbers"] == []
         assert data["recording_date"] is not None
+
+
+class TestGetCalendarService:
+    @pytest.fixture
+    def calendar_settings(self, monkeypatch):
+        monkeypatch.setattr(google_calendar, "GOOGLE_API_AVAILABLE", True)
+        monkeypatch.setattr(google_calendar.settings, "GOOGLE_CALENDAR_ENABLED", True)
+        monkeypatch.setattr(google_calendar.settings, "GOOGLE_CREDENTIALS_JSON", '{"key": 1}')
+        monkeypatch.setattr(google_calendar, "_service_cache", threading.local())
+        return google_calendar.settings
+
+    def test_builds_once_per_thread_until_credentials_change(self, calendar_settings, monkeypatch):
+        with patch("google.oauth2.service_account.Credentials.from_service_account_info"), \
+                patch("googleapiclient.discovery.build", side_effect=lambda *a, **kw: object()) as build:
+            first = get_calendar_service()
+            assert get_calendar_service() is first
+            assert build.call_count == 1
+            assert build.call_args.kwargs["cache_discovery"] is False
+
+            other_thread = []
+            worker = threading.Thread(target=lambda: other_thread.append(get_calendar_service()))
+            worker.start()
+            worker.join()
+            assert other_thread[0] is not first
+
+            monkeypatch.setattr(calendar_settings, "GOOGLE_CREDENTIALS_JSON", '{"key": 2}')
+            second = get_calendar_service()
+            assert second is not first
+            assert build.call_count == 3
+
+            # Same settings, but e.g. the key file behind GOOGLE_CREDENTIALS_PATH was rotated
+            google_calendar.invalidate_calendar_service()
+            assert get_calendar_service() is not second
+            assert build.call_count == 4
+
+    def test_failed_build_is_retried(self, calendar_settings):
+        with patch("google.oauth2.service_account.Credentials.from_service_account_info"), \
+                patch("googleapiclient.discovery.build", side_effect=[RuntimeError("discovery down"), "service"]):
+            assert get_calendar_service() is None
+            assert get_calendar_service() == "service"
+
+
+class TestListCalendarEvents:
+    def test_follows_page_tokens(self):
+        service = MagicMock()
+        service.events().list().execute.side_effect = [
+            {"items": [{"id": "a"}, {"id": "b"}], "nextPageToken": "page-2"},
+            {"items": [{"id": "c"}]},
+        ]
+        service.events().list.reset_mock()
+        events = list_calendar_events(service, "2025-02-11T00:00:00Z", "2025-02-12T00:00:00Z")
+        assert [e["id"] for e in events] == ["a", "b", "c"]
+        tokens = [c.kwargs["pageToken"] for c in service.events().list.call_args_list]
+        assert tokens == [None, "page-2"]
+
+    def test_rfc3339_bounds_have_single_utc_suffix(self):
+        assert _to_rfc3339_utc(datetime(2025, 2, 11, 9, 5, 3, 250, tzinfo=timezone.utc)) == "2025-02-11T09:05:03Z"
+
@@ -0,0 +1,122 @@
+"""
+Tests for CSV import. The handler is called directly with an in-memory UploadFile.
+"""
+import io
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from fastapi import UploadFile
+
+from models import Podcast, Episode, User, EpisodeStatus
+from api.import_csv import import_csv_file
+
+HEADER = " ,שם הפודקאסט,תאריך הקלטה,אולפן,פרק מספר,שם אורחים,סטטוס,הערות לפרק,על איזה כרטיס,הקלטה ,עריכה,reels,הערות לרילס,לינק לדרייב ,ת. מחיקה מגיבוי\n"
+
+
+def make_upload(body: str, filename: str = "import.csv", encoding: str = "utf-8") -> UploadFile:
+    return UploadFile(file=io.BytesIO((HEADER + body).encode(encoding)), filename=filename)
+
+
+class TestImportCsv:
+    def test_creates_podcasts_users_and_episodes(self, db_session):
+        body = (
+            "Host A,רוני וברק ,15.1.25,,33,,בעריכה,,card1,אורי,אלי ,,,,\n"
+            "Host A,רוני וברק ,16.1.25,,34,,הוקלט,,card1,אורי,,,,,\n"
+            ",נטע פיזיותרפיה ,30.1.25,,1,,הופץ,,,אלי ,אלי ,,,,\n"
+            ",,,,,,,,,,,,,,\n"
+        )
+        result = import_csv_file(make_upload(body), db_session)
+        assert result["imported_count"] == 3
+        assert result["errors"] is None
+        assert db_session.query(Podcast).count() == 2
+        assert {u.name for u in db_session.query(User).all()} == {"אורי", "אלי"}
+        podcast = db_session.query(Podcast).filter(Podcast.name == "רוני וברק").one()
+        assert podcast.host == "Host A"
+        ep = db_session.query(Episode).filter(Episode.episode_number == "33").one()
+        assert ep.status == EpisodeStatus.IN_EDITING
+        assert ep.recording_engineer.name == "אורי"
+        assert ep.editing_engineer.name == "אלי"
+
+    def test_reimport_updates_existing_rows(self, db_session):
+        body = ",רוני וברק ,15.1.25,,33,,בעריכה,,,אורי,,,,,\n"
+        import_csv_file(make_upload(body), db_session)
+        body = ",רוני וברק ,15.1.25,Studio B,33,,הופץ,,,אורי,,,,,\n"
+        result = import_csv_file(make_upload(body), db_session)
+        assert result["imported_count"] == 1
+        assert db_session.query(Podcast).count() == 1
+        assert db_session.query(User).count() == 1
+        ep = db_session.query(Episode).one()
+        assert ep.studio == "Studio B"
+        assert ep.status == EpisodeStatus.PUBLISHED
+
+    def test_rejects_non_csv_filename(self, db_session):
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException) as exc_info:
+            import_csv_file(make_upload("", filename="data.txt"), db_session)
+        assert exc_info.value.status_code == 400
+
+    def test_handles_utf8_bom(self, db_session):
+        body = ",רוני וברק ,15.1.25,,33,,,,,,,,,,\n"
+        result = import_csv_file(make_upload(body, encoding="utf-8-sig"), db_session)
+        assert result["imported_count"] == 1
+        assert db_session.query(Podcast).one().name == "רוני וברק"
+
+    def test_rejects_oversized_file(self, db_session):
+        from fastapi import HTTPException
+        with patch("api.import_csv.MAX_CSV_FILE_SIZE", 10):
+            with pytest.raises(HTTPException) as exc_info:
+                import_csv_file(make_upload(",x,,,,,,,,,,,,,\n"), db_session)
+        assert exc_info.value.status_code == 400
+        assert db_session.query(Podcast).count() == 0
+
+    def test_duplicate_rows_in_file_update_one_episode(self, db_session):
+        body = (
+            ",רוני וברק ,15.1.25,,33,,בעריכה,,,,,,,,\n"
+            ",רוני וברק ,,Studio C,33,,הופץ,,,,,,,,\n"
+        )
+        result = import_csv_file(make_upload(body), db_session)
+        assert result["imported_count"] == 2
+        ep = db_session.query(Episode).one()
+        assert ep.studio == "Studio C"
+        assert ep.status == EpisodeStatus.PUBLISHED
+        assert ep.recording_date is None
+
+    def test_bad_row_keeps_other_rows_in_transaction(self, db_session):
+        import_csv_file(make_upload(",רוני וברק ,15.1.25,,33,,בעריכה,,,,,,,,\n"), db_session)
+        body = (
+            ",רוני וברק ,15.1.25,Studio B,33,,הופץ,,,,,,,,\n"
+            ",רוני וברק ,bad,,34,,,,,,,,,,\n"
+        )
+        from utils import parse_date
+
+        def failing_parse(value):
+            if value == "bad":
+                raise ValueError("unparseable")
+            return parse_date(value)
+
+        with patch("api.import_csv.parse_date", failing_parse):
+            result = import_csv_file(make_upload(body), db_session)
+        assert result["imported_count"] == 1
+        assert result["errors"] == ["Row 3: unparseable"]
+        ep = db_session.query(Episode).one()
+        assert ep.studio == "Studio B"
+        assert ep.status == EpisodeStatus.PUBLISHED
+
+    def test_statement_count_does_not_grow_with_rows(self, db_session, count_queries):
+        def import_rows(count, studio=""):
+            body = "".join(f",Show {n % 3},{n % 28 + 1}.1.25,{studio},{n},,בעריכה,,,Eng {n % 4},,,,,\n" for n in range(count))
+            with count_queries() as statements:
+                assert import_csv_file(make_upload(body), db_session)["imported_count"] == count
+            return [s.split()[0] for s in statements]
+
+        # Lookups, then one INSERT each for users, podcasts and episodes
+        assert import_rows(5) == ["SELECT", "INSERT", "SELECT", "INSERT", "SELECT", "INSERT"]
+        # 55 new episodes in one INSERT; 60 changed episodes in one executemany UPDATE
+        assert import_rows(60).count("INSERT") == 1
+        assert import_rows(60, studio="B").count("UPDATE") == 1
+
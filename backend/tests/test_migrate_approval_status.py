@@ -0,0 +1,43 @@
+"""
+Tests for converting the text approval columns to SMALLINT codes.
+"""
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, text
+
+from models import ApprovalStatus, Episode
+from migrate_approval_status_codes import convert_approval_columns
+
+
+def test_converts_strings_to_codes():
+    # Separate engine: the shared test engine already has the current episodes schema
+    with create_engine("sqlite://").begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE episodes (id VARCHAR PRIMARY KEY, client_approved_editing TEXT DEFAULT 'pending', "
+            "client_approved_reels TEXT DEFAULT 'pending')"
+        ))
+        conn.execute(text(
+            "INSERT INTO episodes VALUES ('a', 'approved', 'rejected'), ('b', 'pending', NULL), ('c', 'bogus', 'approved')"
+        ))
+        assert convert_approval_columns(conn) == ["client_approved_editing", "client_approved_reels"]
+        rows = conn.execute(text(
+            "SELECT id, client_approved_editing, client_approved_reels FROM episodes ORDER BY id"
+        )).all()
+        assert [tuple(r) for r in rows] == [("a", 1, 2), ("b", 0, 0), ("c", 0, 1)]
+        assert convert_approval_columns(conn) == []
+
+
+def test_orm_round_trip_uses_codes(db_session, sample_podcast):
+    episode = Episode(podcast_id=sample_podcast.id, client_approved_reels=ApprovalStatus.APPROVED)
+    db_session.add(episode)
+    db_session.commit()
+    raw = db_session.execute(
+        text("SELECT client_approved_editing, client_approved_reels FROM episodes WHERE id = :id"), {"id": episode.id}
+    ).one()
+    assert tuple(raw) == (0, 1)
+    db_session.expire_all()
+    assert db_session.get(Episode, episode.id).client_approved_reels == "approved"
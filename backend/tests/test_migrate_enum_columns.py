@@ -0,0 +1,50 @@
+"""
+Tests for enum columns stored as VARCHAR enum values with CHECK constraints.
+"""
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError, StatementError
+
+from models import Episode, Task, TaskStatus, TaskType
+from migrate_enum_columns import convert_enum_columns
+
+
+def test_check_constraint_rejects_unknown_labels(db_session, sample_podcast):
+    episode = Episode(podcast_id=sample_podcast.id)
+    db_session.add(episode)
+    db_session.commit()
+    db_session.add(Task(episode_id=episode.id, type=TaskType.EDITING, status=TaskStatus.SENT_TO_CLIENT))
+    db_session.commit()
+    assert db_session.execute(text("SELECT type, status FROM tasks")).one() == ("editing", "sent_to_client")
+    with pytest.raises(IntegrityError):
+        db_session.execute(text("UPDATE tasks SET status = 'SENT_TO_CLIENT'"))
+    db_session.rollback()
+
+
+def test_unknown_string_fails_before_the_database(db_session):
+    with pytest.raises(StatementError):
+        db_session.query(Task).filter(Task.status == "archived").all()
+
+
+def test_rewrites_member_names_to_values():
+    # Separate engine: tables as created before, storing names and indexed on name predicates
+    with create_engine("sqlite://").begin() as conn:
+        conn.execute(text("CREATE TABLE episodes (id VARCHAR PRIMARY KEY, status VARCHAR(14))"))
+        conn.execute(text("CREATE TABLE tasks (id VARCHAR PRIMARY KEY, type VARCHAR(18), status VARCHAR(14), due_date DATETIME)"))
+        conn.execute(text("CREATE INDEX ix_tasks_live_due_date ON tasks(due_date) WHERE status <> 'DONE' AND status <> 'SKIPPED'"))
+        conn.execute(text("INSERT INTO episodes VALUES ('e', 'IN_EDITING')"))
+        conn.execute(text("INSERT INTO tasks VALUES ('a', 'REELS', 'DONE', NULL), ('b', 'EDITING', 'SENT_TO_CLIENT', NULL)"))
+
+        assert convert_enum_columns(conn) == ["episodes.status", "tasks.type", "tasks.status"]
+        assert conn.execute(text("SELECT status FROM episodes")).scalar() == "in_editing"
+        rows = conn.execute(text("SELECT id, type, status FROM tasks ORDER BY id")).all()
+        assert [tuple(r) for r in rows] == [("a", "reels", "done"), ("b", "editing", "sent_to_client")]
+        predicates = conn.execute(text("SELECT sql FROM sqlite_master WHERE name LIKE 'ix_tasks_live%'")).scalars().all()
+        assert len(predicates) == 2 and all("'done'" in sql for sql in predicates)
+        assert convert_enum_columns(conn) == []
@@ -0,0 +1,76 @@
+"""
+Tests for the migration schema helpers.
+"""
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, inspect, text
+
+from _migration_utils import add_columns_if_missing, column_exists, columns_by_table, columns_of
+
+
+def test_adds_only_missing_columns(db_engine):
+    with db_engine.connect() as conn:
+        conn.execute(text("CREATE TABLE legacy (id VARCHAR PRIMARY KEY, card_name VARCHAR)"))
+        added = add_columns_if_missing(conn, "legacy", [
+            ("card_name", "VARCHAR"),
+            ("reels_notes", "TEXT"),
+            ("client_approved_reels", "TEXT DEFAULT 'pending'"),
+        ])
+        assert added == ["reels_notes", "client_approved_reels"]
+        assert add_columns_if_missing(conn, "legacy", [("reels_notes", "TEXT")]) == []
+
+        conn.execute(text("INSERT INTO legacy (id) VALUES ('a')"))
+        assert conn.execute(text("SELECT client_approved_reels FROM legacy")).scalar() == "pending"
+        assert [c["name"] for c in inspect(conn).get_columns("legacy")] == [
+            "id", "card_name", "reels_notes", "client_approved_reels"
+        ]
+        assert columns_of(conn, "legacy") == {"id", "card_name", "reels_notes", "client_approved_reels"}
+        assert column_exists(conn, "legacy", "card_name")
+        assert not column_exists(conn, "legacy", "memory_card")
+
+
+def test_backfill_assigned_to_in_batches():
+    from migrate_db import backfill_assigned_to
+
+    # Separate engine: the shared test engine already has the current tasks schema
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE tasks (id VARCHAR PRIMARY KEY, owner_id VARCHAR, assigned_to VARCHAR)"))
+        conn.execute(text("INSERT INTO tasks (id, owner_id) VALUES " + ", ".join(
+            f"('t{n}', {'NULL' if n == 3 else repr(f'u{n}')})" for n in range(7)
+        )))
+        # Left by an interrupted earlier run
+        conn.execute(text("UPDATE tasks SET assigned_to = owner_id WHERE id IN ('t0', 't1')"))
+    assert backfill_assigned_to(engine, batch_size=2) == 4
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, assigned_to FROM tasks ORDER BY id")).all()
+    assert [tuple(r) for r in rows] == [("t0", "u0"), ("t1", "u1"), ("t2", "u2"), ("t3", None),
+                                        ("t4", "u4"), ("t5", "u5"), ("t6", "u6")]
+    assert backfill_assigned_to(engine, batch_size=2) == 0
+
+
+def test_add_columns_reports_owner_id_on_every_run():
+    from migrate_db import add_columns
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE episodes (id VARCHAR PRIMARY KEY)"))
+        conn.execute(text("CREATE TABLE tasks (id VARCHAR PRIMARY KEY, owner_id VARCHAR)"))
+    with engine.begin() as conn:
+        assert add_columns(conn)
+    # Already has assigned_to, but a back-fill may not have finished
+    with engine.begin() as conn:
+        assert add_columns(conn)
+
+
+def test_columns_by_table_reads_all_tables_at_once(db_engine, count_queries):
+    with db_engine.connect() as conn, count_queries() as statements:
+        schema = columns_by_table(conn, ["podcasts", "tasks", "missing"])
+    assert len(statements) == 1
+    assert {"id", "name", "tasks_time_allowance_days"} <= schema["podcasts"]
+    assert {"assigned_to", "due_date"} <= schema["tasks"]
+    assert schema["missing"] == set()
@@ -0,0 +1,83 @@
+"""
+Tests for the notifications endpoint. The handler is called directly with the test DB session.
+"""
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from fastapi import BackgroundTasks
+from models import Episode, Task, TaskType, TaskStatus
+from schemas import EpisodeUpdate, TaskUpdate
+from api.episodes import delete_episode, update_episode
+from api.notifications import get_notifications
+from api.tasks import update_task
+
+
+@pytest.mark.asyncio
+class TestGetNotifications:
+    async def test_merges_recordings_due_and_overdue_tasks_by_date(self, db_session, sample_podcast):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        upcoming = Episode(podcast_id=sample_podcast.id, episode_number="5", recording_date=now + timedelta(days=3))
+        past = Episode(podcast_id=sample_podcast.id, episode_number="4", recording_date=now - timedelta(days=2))
+        db_session.add_all([upcoming, past])
+        db_session.commit()
+        due = Task(episode_id=upcoming.id, type=TaskType.EDITING, due_date=now + timedelta(days=5))
+        overdue = Task(episode_id=past.id, type=TaskType.REELS, due_date=now - timedelta(days=1))
+        done = Task(episode_id=past.id, type=TaskType.PUBLISHING, due_date=now + timedelta(days=1), status=TaskStatus.DONE)
+        later = Task(episode_id=past.id, type=TaskType.EDITING, due_date=now + timedelta(days=30))
+        db_session.add_all([due, overdue, done, later])
+        db_session.commit()
+
+        result = await get_notifications(days_ahead=7, db=db_session)
+        assert [n["id"] for n in result] == [f"overdue_task_{overdue.id}", f"recording_{upcoming.id}", f"task_{due.id}"]
+        overdue_item, recording_item, due_item = result
+        assert overdue_item["title"] == "OVERDUE: Reels Task"
+        assert overdue_item["priority"] == "urgent"
+        assert overdue_item["message"] == f"Reels for {sample_podcast.name} - Episode 4"
+        assert recording_item["type"] == "recording_session"
+        assert recording_item["title"] == f"Recording Session: {sample_podcast.name}"
+        assert recording_item["priority"] == "high"
+        assert recording_item["due_date"].endswith("Z") or recording_item["due_date"].endswith("+00:00")
+        assert due_item["title"] == "Editing Task Due"
+        assert due_item["task_id"] == due.id
+        assert due_item["episode_id"] == upcoming.id
+        assert due_item["priority"] == "normal"
+
+    async def test_missing_labels_fall_back(self, db_session, sample_podcast):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        episode = Episode(podcast_id=sample_podcast.id, episode_number="", recording_date=now + timedelta(days=2))
+        db_session.add(episode)
+        db_session.commit()
+        orphan = Task(episode_id="missing-episode", type=TaskType.EDITING, due_date=now + timedelta(days=4))
+        db_session.add(orphan)
+        db_session.commit()
+
+        recording_item, task_item = await get_notifications(days_ahead=7, db=db_session)
+        assert recording_item["message"].startswith("Episode N/A scheduled for ")
+        assert task_item["message"].startswith("Editing for Unknown - Episode ")
+
+    async def test_empty(self, db_session):
+        assert await get_notifications(days_ahead=7, db=db_session) == []
+
+    async def test_task_and_episode_writes_refresh_cached_notifications(self, db_session, sample_podcast):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        episode = Episode(podcast_id=sample_podcast.id, episode_number="5", recording_date=now + timedelta(days=3))
+        db_session.add(episode)
+        db_session.commit()
+        task = Task(episode_id=episode.id, type=TaskType.EDITING, due_date=now + timedelta(days=5))
+        db_session.add(task)
+        db_session.commit()
+        assert len(await get_notifications(days_ahead=7, db=db_session)) == 2
+
+        update_task(task.id, TaskUpdate(status=TaskStatus.DONE), db_session)
+        assert [n["id"] for n in await get_notifications(days_ahead=7, db=db_session)] == [f"recording_{episode.id}"]
+        update_episode(episode.id, EpisodeUpdate(recording_date=now + timedelta(days=4)), BackgroundTasks(), db_session)
+        assert (await get_notifications(days_ahead=7, db=db_session))[0]["due_date"].startswith(
+            (now + timedelta(days=4)).date().isoformat()
+        )
+        delete_episode(episode.id, db_session)
+        assert await get_notifications(days_ahead=7, db=db_session) == []
@@ -0,0 +1,91 @@
+"""
+Tests for podcast endpoints. Handlers are called directly with the test DB session.
+"""
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from datetime import datetime
+from models import Podcast
+from schemas import PodcastCreate, Podcast as PodcastSchema
+from fastapi import HTTPException
+from schemas import PodcastAliasCreate
+from api.podcasts import create_podcast, get_podcasts, get_podcast, add_podcast_alias, get_podcast_aliases
+
+
+class TestPodcastAliases:
+    @pytest.mark.asyncio
+    async def test_aliases_returned_from_create_list_and_get(self, db_session):
+        created = create_podcast(PodcastCreate(name="Show", aliases=["Show - Room A", " "]), db_session)
+        assert PodcastSchema.model_validate(created).model_dump()["aliases"] == ["Show - Room A"]
+
+        db_session.expunge_all()
+        listed = await get_podcasts(0, 100, db_session)
+        assert listed[0]["aliases"] == ["Show - Room A"]
+        fetched = get_podcast(created.id, db_session)
+        assert [a.alias for a in fetched.aliases] == ["Show - Room A"]
+
+    def test_schema_accepts_alias_rows_strings_or_none(self, db_session, sample_podcast):
+        assert PodcastSchema.model_validate(sample_podcast).aliases == []
+        data = {"id": "p1", "name": "Show", "created_at": datetime(2025, 1, 1), "updated_at": datetime(2025, 1, 1)}
+        assert PodcastSchema.model_validate({**data, "aliases": None}).aliases == []
+        assert PodcastSchema.model_validate({**data, "aliases": ["A", "B"]}).aliases == ["A", "B"]
+
+    def test_create_skips_taken_and_duplicate_aliases(self, db_session):
+        create_podcast(PodcastCreate(name="First", aliases=["Shared"]), db_session)
+        created = create_podcast(PodcastCreate(name="Second", aliases=["Shared", "Own", "Own "]), db_session)
+        assert [a.alias for a in created.aliases] == ["Own"]
+
+    @pytest.mark.asyncio
+    async def test_add_alias(self, db_session):
+        first = create_podcast(PodcastCreate(name="First"), db_session)
+        second = create_podcast(PodcastCreate(name="Second"), db_session)
+        added = add_podcast_alias(first.id, PodcastAliasCreate(alias=" Room B "), db_session)
+        assert added["alias"] == "Room B"
+        assert added["podcast_id"] == first.id
+        again = add_podcast_alias(first.id, PodcastAliasCreate(alias="Room B"), db_session)
+        assert again.id == added["id"]
+        assert [a["alias"] for a in await get_podcast_aliases(first.id, db_session)] == ["Room B"]
+
+        with pytest.raises(HTTPException) as exc_info:
+            add_podcast_alias(second.id, PodcastAliasCreate(alias="Room B"), db_session)
+        assert exc_info.value.status_code == 400
+        with pytest.raises(HTTPException) as exc_info:
+            add_podcast_alias("missing", PodcastAliasCreate(alias="Room C"), db_session)
+        assert exc_info.value.status_code == 404
+
+
+class TestPodcastListETag:
+    def test_unchanged_list_returns_304(self, client, sample_podcast):
+        first = client.get("/api/podcasts/")
+        assert first.status_code == 200
+        assert [p["name"] for p in first.json()] == [sample_podcast.name]
+        etag = first.headers["etag"]
+
+        again = client.get("/api/podcasts/", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+    def test_write_changes_etag(self, client, sample_podcast):
+        etag = client.get("/api/podcasts/").headers["etag"]
+        assert client.post("/api/podcasts/", json={"name": "Another"}).status_code == 200
+        after = client.get("/api/podcasts/", headers={"If-None-Match": etag})
+        assert after.status_code == 200
+        assert after.headers["etag"] != etag
+        assert len(after.json()) == 2
+
+
+class TestResponseCompression:
+    def test_large_lists_are_gzipped(self, client, db_session):
+        db_session.add_all([Podcast(name=f"Podcast {n}", host="Host") for n in range(40)])
+        db_session.commit()
+        response = client.get("/api/podcasts/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) == 40
+        # Under minimum_size: not worth compressing
+        small = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
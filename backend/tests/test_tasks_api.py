@@ -0,0 +1,192 @@
+"""
+Tests for task endpoints. Handlers are called directly with the test DB session.
+"""
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from models import Podcast, PodcastAlias, Episode, Task, User, TaskType, TaskStatus
+from schemas import TaskWithEpisode
+from api.tasks import get_tasks, get_due_tasks, get_overdue_tasks
+
+
+def list_tasks(db, now=None, **overrides):
+    """Call get_tasks with default query values."""
+    kwargs = dict(skip=0, limit=100, episode_id=None, assigned_to=None, status=None, task_type=None,
+                  after_due_date=None, after_id=None, include_cursor=False)
+    kwargs.update(overrides)
+    return get_tasks(db=db, now=now or datetime.now(timezone.utc), **kwargs)
+
+
+class TestGetTasks:
+    def test_serializing_list_uses_fixed_number_of_queries(self, db_session, count_queries):
+        eng = User(name="Eng")
+        db_session.add(eng)
+        db_session.commit()
+        for n in range(5):
+            podcast = Podcast(name=f"Show {n}")
+            recorder = User(name=f"Recorder {n}")
+            db_session.add_all([podcast, recorder])
+            db_session.commit()
+            db_session.add(PodcastAlias(podcast_id=podcast.id, alias=f"Show {n} - Room"))
+            episode = Episode(podcast_id=podcast.id, episode_number=str(n), recording_engineer_id=recorder.id)
+            db_session.add(episode)
+            db_session.commit()
+            db_session.add(Task(episode_id=episode.id, type=TaskType.EDITING, assigned_to=eng.id))
+        db_session.commit()
+        db_session.expunge_all()
+
+        with count_queries() as statements:
+            tasks = list_tasks(db_session)
+            dumped = [TaskWithEpisode.model_validate(t).model_dump() for t in tasks]
+        assert len(dumped) == 5
+        assert {d["episode"]["podcast"]["name"] for d in dumped} == {f"Show {n}" for n in range(5)}
+        assert {d["episode"]["recording_engineer"]["name"] for d in dumped} == {f"Recorder {n}" for n in range(5)}
+        assert all(d["episode"]["podcast"]["aliases"] for d in dumped)
+        # One query per relationship level, not per task
+        assert len(statements) <= 8
+
+    def test_overdue_excludes_finished_tasks(self, db_session, sample_podcast):
+        episode = Episode(podcast_id=sample_podcast.id)
+        db_session.add(episode)
+        db_session.commit()
+        yesterday = datetime.utcnow() - timedelta(hours=12)
+        open_task = Task(episode_id=episode.id, type=TaskType.EDITING, due_date=yesterday)
+        db_session.add_all([
+            open_task,
+            Task(episode_id=episode.id, type=TaskType.REELS, due_date=yesterday, status=TaskStatus.DONE),
+            Task(episode_id=episode.id, type=TaskType.PUBLISHING, due_date=yesterday, status=TaskStatus.SKIPPED),
+        ])
+        db_session.commit()
+        assert [t.id for t in get_overdue_tasks(db_session, datetime.now(timezone.utc))] == [open_task.id]
+
+    def test_stale_studio_prep_excluded_relative_to_request_now(self, db_session, sample_podcast):
+        episode = Episode(podcast_id=sample_podcast.id)
+        db_session.add(episode)
+        db_session.commit()
+        due = datetime(2025, 3, 1, 9, 0)
+        prep = Task(episode_id=episode.id, type=TaskType.STUDIO_PREPARATION, due_date=due)
+        db_session.add(prep)
+        db_session.commit()
+        within_a_day = datetime(2025, 3, 2, 8, 0, tzinfo=timezone.utc)
+        two_days_later = datetime(2025, 3, 3, 9, 0, tzinfo=timezone.utc)
+        assert [t.id for t in get_overdue_tasks(db_session, within_a_day)] == [prep.id]
+        assert get_overdue_tasks(db_session, two_days_later) == []
+
+    def test_due_tasks_include_upcoming_studio_prep(self, db_session, sample_podcast):
+        episode = Episode(podcast_id=sample_podcast.id)
+        db_session.add(episode)
+        db_session.commit()
+        now = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+        prep = Task(episode_id=episode.id, type=TaskType.STUDIO_PREPARATION, due_date=datetime(2025, 3, 2, 9, 0))
+        stale = Task(episode_id=episode.id, type=TaskType.STUDIO_PREPARATION, due_date=datetime(2025, 2, 20, 9, 0))
+        db_session.add_all([prep, stale])
+        db_session.commit()
+        assert [t.id for t in get_due_tasks(7, db_session, now)] == [prep.id]
+        assert get_overdue_tasks(db_session, now) == []
+
+    def test_filters_bind_per_call_values(self, db_session, sample_podcast):
+        first, second = Episode(podcast_id=sample_podcast.id), Episode(podcast_id=sample_podcast.id)
+        db_session.add_all([first, second])
+        db_session.commit()
+        db_session.add_all([
+            Task(episode_id=first.id, type=TaskType.EDITING),
+            Task(episode_id=second.id, type=TaskType.REELS, status=TaskStatus.DONE),
+        ])
+        db_session.commit()
+        now = datetime.now(timezone.utc)
+        for episode, task_type in ((first, TaskType.EDITING), (second, TaskType.REELS)):
+            tasks = list_tasks(db_session, now, episode_id=episode.id)
+            assert [t.type for t in tasks] == [task_type]
+        done = list_tasks(db_session, now, status=TaskStatus.DONE)
+        assert [t.episode_id for t in done] == [second.id]
+        assert list_tasks(db_session, now, skip=1) != []
+        assert len(list_tasks(db_session, now, limit=1)) == 1
+
+
+class TestTaskCursor:
+    def test_walks_all_pages_with_nulls_last(self, db_session, sample_podcast):
+        episode = Episode(podcast_id=sample_podcast.id)
+        db_session.add(episode)
+        db_session.commit()
+        base = datetime.utcnow() + timedelta(days=1)
+        tasks = [Task(episode_id=episode.id, type=TaskType.EDITING, due_date=base + timedelta(days=n // 2)) for n in range(5)]
+        tasks += [Task(episode_id=episode.id, type=TaskType.REELS) for _ in range(3)]
+        db_session.add_all(tasks)
+        db_session.commit()
+        now = datetime.now(timezone.utc)
+
+        seen, cursor = [], {}
+        while True:
+            page = list_tasks(db_session, now, limit=3, include_cursor=True, **cursor)
+            seen += [t.id for t in page["items"]]
+            if page["next_cursor"] is None:
+                break
+            cursor = page["next_cursor"].model_dump()
+        ordered = list_tasks(db_session, now)
+        assert seen == [t.id for t in ordered]
+        assert len(seen) == 8
+        assert [t.due_date is None for t in ordered] == [False] * 5 + [True] * 3
+
+
+class TestUpdateTask:
+    def test_completed_at_follows_status(self, db_session, sample_podcast):
+        from api.tasks import update_task
+        from schemas import TaskUpdate
+        episode = Episode(podcast_id=sample_podcast.id)
+        db_session.add(episode)
+        db_session.commit()
+        task = Task(episode_id=episode.id, type=TaskType.EDITING)
+        db_session.add(task)
+        db_session.commit()
+
+        task = update_task(task.id, TaskUpdate(status=TaskStatus.DONE), db_session)
+        completed_at = task.completed_at
+        assert completed_at is not None
+        task = update_task(task.id, TaskUpdate(notes="delivered"), db_session)
+        assert task.completed_at == completed_at
+        task = update_task(task.id, TaskUpdate(status=TaskStatus.IN_PROGRESS), db_session)
+        assert task.completed_at is None
+
+    def test_no_op_update_skips_write(self, db_session, sample_podcast, count_queries):
+        from api.tasks import update_task
+        from schemas import TaskUpdate
+        episode = Episode(podcast_id=sample_podcast.id)
+        db_session.add(episode)
+        db_session.commit()
+        task = Task(episode_id=episode.id, type=TaskType.EDITING, notes="same")
+        db_session.add(task)
+        db_session.commit()
+        db_session.refresh(task)
+
+        with count_queries() as statements:
+            update_task(task.id, TaskUpdate(notes="same"), db_session)
+        # Identity-map hit and nothing changed: no UPDATE, commit or refresh SELECT
+        assert statements == []
+
+
+class TestTaskLookups:
+    def test_get_and_delete(self, db_session, sample_podcast):
+        from fastapi import HTTPException
+        from api.tasks import get_task, delete_task
+        episode = Episode(podcast_id=sample_podcast.id)
+        db_session.add(episode)
+        db_session.commit()
+        task = Task(episode_id=episode.id, type=TaskType.EDITING)
+        db_session.add(task)
+        db_session.commit()
+        task_id, podcast_name = task.id, sample_podcast.name
+        db_session.expunge_all()
+
+        fetched = get_task(task_id, db_session)
+        assert TaskWithEpisode.model_validate(fetched).episode.podcast.name == podcast_name
+        assert delete_task(task_id, db_session) == {"message": "Task deleted successfully"}
+        assert db_session.query(Task).count() == 0
+        for handler in (get_task, delete_task):
+            with pytest.raises(HTTPException) as exc_info:
+                handler(task_id, db_session)
+            assert exc_info.value.status_code == 404
@@ -0,0 +1,59 @@
+"""
+Tests for user endpoints. Handlers are called directly with the test DB session.
+"""
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from fastapi import HTTPException
+from models import Episode, Task, User, TaskType
+from schemas import UserCreate, UserUpdate
+from api.users import create_user, delete_user, update_user
+
+
+class TestDeleteUser:
+    def test_unassigns_tasks_and_only_matching_engineer_columns(self, db_session, sample_podcast):
+        gone = User(name="Gone")
+        stays = User(name="Stays")
+        db_session.add_all([gone, stays])
+        db_session.commit()
+        both = Episode(podcast_id=sample_podcast.id, recording_engineer_id=gone.id,
+                       editing_engineer_id=stays.id, reels_engineer_id=gone.id)
+        other = Episode(podcast_id=sample_podcast.id, recording_engineer_id=stays.id)
+        db_session.add_all([both, other])
+        db_session.commit()
+        db_session.add(Task(episode_id=other.id, type=TaskType.EDITING, assigned_to=gone.id))
+        db_session.commit()
+
+        result = delete_user(gone.id, db_session)
+        assert result["tasks_unassigned"] == 1
+        assert result["episodes_unassigned"] == 1
+        assert db_session.query(User).filter(User.id == gone.id).first() is None
+        db_session.refresh(both)
+        assert (both.recording_engineer_id, both.editing_engineer_id, both.reels_engineer_id) == (None, stays.id, None)
+        db_session.refresh(other)
+        assert other.recording_engineer_id == stays.id
+        assert db_session.query(Task).one().assigned_to is None
+
+    def test_missing_user(self, db_session):
+        with pytest.raises(HTTPException) as exc_info:
+            delete_user("nope", db_session)
+        assert exc_info.value.status_code == 404
+
+
+class TestUserNameUniqueness:
+    def test_create_and_update_reject_duplicate_names(self, db_session):
+        alice = create_user(UserCreate(name="Alice"), db_session)
+        bob = create_user(UserCreate(name="Bob"), db_session)
+        with pytest.raises(HTTPException) as exc_info:
+            create_user(UserCreate(name="Alice"), db_session)
+        assert exc_info.value.status_code == 400
+        with pytest.raises(HTTPException) as exc_info:
+            update_user(bob.id, UserUpdate(name="Alice"), db_session)
+        assert exc_info.value.status_code == 400
+
+        assert (update_user(alice.id, UserUpdate(name="Alice", role="editor"), db_session)).role == "editor"
+        assert sorted(u.name for u in db_session.query(User).all()) == ["Alice", "Bob"]
@@ -0,0 +1,41 @@
+"""
+Tests for utils.parse_date.
+"""
+import sys
+from pathlib import Path
+from datetime import datetime
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils import parse_date
+
+
+class TestParseDate:
+    def test_day_first_formats(self):
+        assert parse_date("15.1.25") == datetime(2025, 1, 15)
+        assert parse_date("1/2/2024") == datetime(2024, 2, 1)
+        assert parse_date("15.1.99") == datetime(1999, 1, 15)
+        assert parse_date("30.12") == datetime(datetime.now().year, 12, 30)
+
+    def test_spaces_around_separators(self):
+        assert parse_date("15 .1.25") == datetime(2025, 1, 15)
+        assert parse_date("15. 1. 25") == datetime(2025, 1, 15)
+        assert parse_date("1 / 2 / 2024") == datetime(2024, 2, 1)
+
+    def test_trailing_separator_after_year(self):
+        assert parse_date("15.1.25.") == datetime(2025, 1, 15)
+        assert parse_date("1.4.16.") == datetime(2016, 4, 1)
+
+    def test_two_digit_year_26_typo(self):
+        assert parse_date("5.1.26") == datetime(2026, 1, 5)
+        assert parse_date("5.3.26") == datetime(2025, 3, 5)
+
+    def test_iso_and_fallback(self):
+        assert parse_date("2025-03-01") == datetime(2025, 3, 1)
+        assert parse_date("2025-03-01T10:00:00") == datetime(2025, 3, 1, 10, 0)
+        assert parse_date("March 5 2025") == datetime(2025, 3, 5)
+
+    def test_invalid_values(self):
+        for value in ("", "?", "TBD", "abc", "31.2.25", "1.2/25"):
+            assert parse_date(value) is None
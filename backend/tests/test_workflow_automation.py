@@ -15,6 +15,7 @@ from services.workflow_automation import (
     create_studio_preparation_task,
     delete_stale_studio_preparation_tasks,
     process_daily_workflow,
+    process_episode_status_change_in_background,
 )
 
 
@@ -105,3 +106,20 @@ class TestProcessDailyWorkflow:
             m.return_value = []
             count = process_daily_workflow(db_session)
         assert count == 0
+
+
+class TestProcessEpisodeStatusChangeInBackground:
+    def test_creates_follow_up_tasks_with_own_session(self, db_engine, db_session, sample_episode):
+        sample_episode.status = EpisodeStatus.RECORDED
+        db_session.commit()
+        process_episode_status_change_in_background(db_engine, sample_episode.id, EpisodeStatus.NOT_STARTED)
+        types = {t.type for t in db_session.query(Task).filter(Task.episode_id == sample_episode.id).all()}
+        assert types == {TaskType.EDITING, TaskType.REELS}
+
+    def test_missing_episode_is_ignored(self, db_engine):
+        process_episode_status_change_in_background(db_engine, "missing", EpisodeStatus.NOT_STARTED)
+
+    def test_errors_are_logged_not_raised(self, db_engine, sample_episode):
+        with patch("services.workflow_automation.process_episode_status_change") as m:
+            m.side_effect = RuntimeError("boom")
+            process_episode_status_change_in_background(db_engine, sample_episode.id, EpisodeStatus.NOT_STARTED)
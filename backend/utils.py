@@ -1,13 +1,36 @@
 """
 Utility functions for the podcast task manager.
 """
+import re
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from dateutil import parser
 
 from constants import DEFAULT_NOTIFICATION_DAYS, FAR_FUTURE_DAYS, TASK_TYPE_LABELS
 
 
+# DD.MM, DD.MM.YY, DD/MM/YYYY ... with the same separator throughout; a stray separator
+# after the year ("15.1.25.") still parses, as it did before this regex
+_DAY_FIRST_DATE_RE = re.compile(r"(\d+)\s*([./])\s*(\d+)(?:\s*\2\s*(\d+)\s*[./]?)?$")
+
+
+def request_now() -> datetime:
+    """Current UTC time, taken once per request (use as Depends(request_now))."""
+    return datetime.now(timezone.utc)
+
+
+def _expand_two_digit_year(date_str: str, year_int: int, month: int) -> str:
+    """Map a 2-digit year to 4 digits: 00-25 -> 20XX, 26 -> 2026 (or 2025 for a likely typo), else 19XX."""
+    if year_int == 26 and month > 1:
+        print(f"Warning: Corrected likely typo '{date_str}' -> year 2025 (was 2026)")
+        return "2025"
+    if year_int <= 25:
+        return f"20{year_int:02d}"
+    if year_int == 26:
+        return "2026"
+    return f"19{year_int:02d}"
+
+
 def parse_date(date_str: str) -> Optional[datetime]:
     """
     Parse date string in various formats.
@@ -30,57 +53,27 @@ def parse_date(date_str: str) -> Optional[datetime]:
         return None
     
     try:
-        # Try parsing common formats: DD.MM.YY, DD.MM, DD/MM/YY, etc. (day first)
-        if "." in date_str:
-            parts = date_str.split(".")
-            if len(parts) == 2:
+        # Common formats DD.MM.YY, DD.MM, DD/MM/YYYY etc. (day first) via one precompiled regex
+        match = _DAY_FIRST_DATE_RE.match(date_str)
+        if match:
+            day, month, year = match.group(1), match.group(3), match.group(4)
+            if year is None:
                 # DD.MM (no year) — assume current year
-                day, month = parts
-                year = str(datetime.now().year)
-                parsed_date = datetime(int(year), int(month), int(day))
-                return parsed_date
-            if len(parts) == 3:
-                day, month, year = parts
-                # Handle 2-digit year: assume 20XX for years 00-99
-                if len(year) == 2:
-                    year_int = int(year)
-                    if year_int == 26 and int(month) > 1:
-                        year = "2025"
-                        print(f"Warning: Corrected likely typo '{date_str}' -> year 2025 (was 2026)")
-                    elif year_int <= 25:
-                        year = "20" + year
-                    elif year_int == 26:
-                        year = "2026"
-                    else:
-                        year = "19" + year
-                parsed_date = datetime(int(year), int(month), int(day))
-                if parsed_date.year > 2026:
-                    print(f"Warning: Parsed date '{date_str}' as year {parsed_date.year}")
-                return parsed_date
-        elif "/" in date_str:
-            parts = date_str.split("/")
-            if len(parts) == 2:
-                day, month = parts
-                year = str(datetime.now().year)
-                parsed_date = datetime(int(year), int(month), int(day))
-                return parsed_date
-            if len(parts) == 3:
-                day, month, year = parts
-                if len(year) == 2:
-                    year_int = int(year)
-                    if year_int == 26 and int(month) > 1:
-                        year = "2025"
-                        print(f"Warning: Corrected likely typo '{date_str}' -> year 2025 (was 2026)")
-                    elif year_int <= 25:
-                        year = "20" + year
-                    elif year_int == 26:
-                        year = "2026"
-                    else:
-                        year = "19" + year
-                parsed_date = datetime(int(year), int(month), int(day))
-                if parsed_date.year > 2026:
-                    print(f"Warning: Parsed date '{date_str}' as year {parsed_date.year}")
-                return parsed_date
+                return datetime(datetime.now().year, int(month), int(day))
+            if len(year) == 2:
+                year = _expand_two_digit_year(date_str, int(year), int(month))
+            parsed_date = datetime(int(year), int(month), int(day))
+            if parsed_date.year > 2026:
+                print(f"Warning: Parsed date '{date_str}' as year {parsed_date.year}")
+            return parsed_date
+        if "." in date_str or "/" in date_str:
+            raise ValueError("unrecognized day-first date")
+
+        # ISO dates are by far the most common remaining input; avoid dateutil for them
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
 
         # Fallback to dateutil (handles ISO etc.). DD.MM already handled above.
         parsed_date = parser.parse(date_str)
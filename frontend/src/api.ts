@@ -116,6 +116,16 @@ export const getEpisodes = (params?: {
   date_to?: string;
 }) => 
   api.get<Episode[]>('/episodes', { params });
+// One request for a page of episodes plus the filtered total
+export const getEpisodesPage = (params?: { 
+  podcast_id?: string; 
+  status?: string; 
+  limit?: number; 
+  skip?: number;
+  date_from?: string;
+  date_to?: string;
+}) => 
+  api.get<{ items: Episode[]; total: number }>('/episodes', { params: { ...params, include_total: true } });
 export const getEpisodesCount = (params?: { 
   podcast_id?: string; 
   status?: string;
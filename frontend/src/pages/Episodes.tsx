@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { Plus, Search, Edit2, ChevronLeft, ChevronRight, Calendar } from 'lucide-react';
-import { getEpisodes, getEpisodesCount, getPodcasts, Episode, Podcast } from '../api';
+import { getEpisodesPage, getPodcasts, Episode, Podcast } from '../api';
 import { format } from 'date-fns';
 import EpisodeModal from '../components/EpisodeModal';
 
@@ -49,19 +49,13 @@ export default function Episodes() {
         params.date_to = toDate.toISOString();
       }
 
-      const [episodesRes, countRes, podcastsRes] = await Promise.all([
-        getEpisodes(params),
-        getEpisodesCount({
-          podcast_id: selectedPodcast !== 'all' ? selectedPodcast : undefined,
-          status: selectedStatus !== 'all' ? selectedStatus : undefined,
-          date_from: dateFrom ? new Date(dateFrom).toISOString() : undefined,
-          date_to: dateTo ? new Date(dateTo).toISOString() : undefined,
-        }),
+      const [episodesRes, podcastsRes] = await Promise.all([
+        getEpisodesPage(params),
         getPodcasts(),
       ]);
 
-      setEpisodes(episodesRes.data);
-      setTotalCount(countRes.data.total);
+      setEpisodes(episodesRes.data.items);
+      setTotalCount(episodesRes.data.total);
       setPodcasts(podcastsRes.data);
     } catch (error) {
       console.error('Failed to load episodes:', error);